@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -5,7 +6,87 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     mysql_root_password: str = Field(..., env="MYSQL_ROOT_PASSWORD")
     mysql_database: str = Field(..., env="MYSQL_DATABASE")
+    database_url: Optional[str] = None
+    async_database_url: Optional[str] = None
     test_database_url: str = "sqlite:///./test.db"
+    async_db: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    # Menor que el wait_timeout de MySQL, para no reutilizar conexiones cerradas por el servidor
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Conexiones a MySQL que pueden abrir entre todos los workers (por debajo de su
+    # max_connections): cada worker limita pool_size + max_overflow a su parte
+    db_max_connections: Optional[int] = None
+    # Réplicas de lectura (JSON: ["mysql+pymysql://..."]): las lecturas de leads se
+    # reparten entre ellas por round-robin y las escrituras van a la base principal
+    replica_urls: list[str] = []
+    async_replica_urls: list[str] = []
+    # Segundos que una réplica que falló queda fuera de la rotación
+    replica_retry_interval: float = 30
+    # Segundos después de una escritura en que las lecturas del mismo cliente van a la
+    # base principal, con una cookie (0: deshabilitado)
+    replica_read_your_writes: int = 0
+    # Workers de python -m app.serve (por defecto, uno por CPU); uvicorn y gunicorn
+    # también leen WEB_CONCURRENCY
+    web_concurrency: Optional[int] = None
+    # Segundos que un worker espera a los requests en curso al recibir SIGTERM
+    graceful_shutdown_timeout: int = 30
+    bulk_batch_size: int = 1000
+    export_batch_size: int = 1000
+    catalog_cache_size: int = 10000
+    # "memory" (por proceso) o "redis" (compartido, requiere REDIS_URL y el paquete redis)
+    lead_cache_backend: str = "memory"
+    lead_cache_size: int = 10000
+    lead_cache_ttl: float = 60
+    redis_url: Optional[str] = None
+    # Búsqueda ?q= sobre nombre/apellido: "prefix" (LIKE con índice) o "fulltext"
+    # (MATCH ... AGAINST sobre el índice FULLTEXT, sólo MySQL)
+    lead_search_mode: Literal["prefix", "fulltext"] = "prefix"
+    # Lectura de páginas completas de GET /leads: "orm" (entidades DBLead) o "rows"
+    # (una consulta Core agrupada en LeadRow, sin entidades ORM)
+    lead_read_model: Literal["orm", "rows"] = "orm"
+    # Mantiene las tablas de resumen al crear leads y sirve /stats desde ellas
+    stats_summary: bool = False
+    # Segundos que se conserva la respuesta de un POST /leads con Idempotency-Key
+    idempotency_ttl: int = 86400
+    # Detección de leads duplicados al crear: "off", "email" o "email_tel" (email o tel)
+    lead_dedup: Literal["off", "email", "email_tel"] = "off"
+    # POST /leads encola el lead y responde 202 con un ticket; un thread lo inserta por
+    # lotes. Los leads encolados sin spool se pierden si el proceso termina.
+    ingest_queue: bool = False
+    ingest_queue_size: int = 10000
+    ingest_batch_size: int = 500
+    ingest_flush_interval: float = 0.5
+    # Archivo NDJSON donde se registran los leads encolados, para reencolarlos al reiniciar
+    ingest_spool_path: Optional[str] = None
+
+    # Agrega a cada respuesta un header Server-Timing con los tiempos total, db y serialize
+    server_timing: bool = False
+    # Sentencias por request a partir de las cuales se registra un warning (0: sin límite),
+    # y presupuestos por ruta ("GET /leads/{lead_id}") para las que dependen del volumen
+    query_budget: int = 20
+    query_budgets: dict[str, int] = {
+        "POST /leads/bulk": 0,
+        "GET /leads/export": 0,
+        "POST /stats/rebuild": 0,
+    }
+
+    # Registra las sentencias que tardan más de SLOW_QUERY_THRESHOLD segundos, con el
+    # método que las originó y su EXPLAIN (GET /metrics/slow-queries)
+    slow_query_log: bool = False
+    slow_query_threshold: float = 0.1
+    slow_query_explain: bool = True
+    slow_query_max_statements: int = 1000
+
+    # Nivel de los loggers de la aplicación y de las bibliotecas (SQLAlchemy, httpx...)
+    log_level: str = "INFO"
+    log_library_level: str = "WARNING"
+    # "text" o "json" (una línea JSON por registro, con el request id)
+    log_format: Literal["text", "json"] = "text"
+    # Fracción de los registros DEBUG que se escriben
+    log_debug_sample_rate: float = 1.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,69 @@
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import NullPool, create_engine
+from ..config import settings
+from .connection import database_url
+from .models import Base
+
+"""Comando explícito para crear el esquema, que la aplicación no crea al importarse ni al arrancar: python -m app.db.bootstrap [--url URL | --test] [--create-all] [--revision REV]. Por defecto aplica las migraciones de Alembic sobre la base de producción; con --create-all crea las tablas desde los modelos, para bases SQLite de desarrollo o de tests."""
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def upgrade(url: str, revision: str = "head") -> None:
+    """
+    Aplica las migraciones de Alembic hasta una revisión.
+
+    Args:
+        url (str): URL de la base a migrar.
+        revision (str): Revisión destino. Default "head"
+    """
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, revision)
+
+
+def create_all(url: str) -> None:
+    """
+    Crea las tablas que falten a partir de los modelos, sin registrar la revisión de
+    Alembic.
+
+    Args:
+        url (str): URL de la base.
+    """
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        Base.metadata.create_all(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Crea o migra el esquema de la base de datos."
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base a preparar (default: la de producción)")
+    target.add_argument(
+        "--test", action="store_true", help="Usa TEST_DATABASE_URL (test.db)"
+    )
+    parser.add_argument(
+        "--create-all",
+        action="store_true",
+        help="Crea las tablas desde los modelos en lugar de migrar",
+    )
+    parser.add_argument("--revision", default="head")
+    args = parser.parse_args(argv)
+
+    url = args.url or (settings.test_database_url if args.test else database_url())
+    if args.create_all:
+        create_all(url)
+    else:
+        upgrade(url, args.revision)
+
+
+if __name__ == "__main__":
+    main()
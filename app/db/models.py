@@ -1,11 +1,16 @@
+from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
     ForeignKey,
+    LargeBinary,
+    func,
+    Index,
     ForeignKeyConstraint,
     PrimaryKeyConstraint,
     UniqueConstraint,
     String,
 )
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 
@@ -19,26 +24,45 @@ class DBLead(Base):
 
     lead_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     nombre: Mapped[str] = mapped_column(String(50), nullable=False)
-    apellido: Mapped[str] = mapped_column(String(50), nullable=False)
-    email: Mapped[Optional[str]] = mapped_column(String(50))
+    apellido: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(50), index=True)
     direccion: Mapped[Optional[str]] = mapped_column(String(100))
-    tel: Mapped[Optional[int]] = mapped_column(String(50))
+    tel: Mapped[Optional[int]] = mapped_column(String(50), index=True)
 
     cursados: Mapped[List["DBCursado"]] = relationship(
         "DBCursado", back_populates="lead"
     )
 
+    __table_args__ = (
+        # Búsqueda por texto en nombre y apellido; sólo existe en MySQL
+        Index(
+            "ft_leads_nombre_apellido", "nombre", "apellido", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
+        # Búsqueda de duplicados por email normalizado (ver NORMALIZED_EMAIL)
+        Index("ix_leads_email_normalizado", func.lower(func.trim(email))),
+    )
+
+
+# Nombres de carreras y materias. La collation por defecto de MySQL ignora mayúsculas y
+# acentos, y sus constraints únicos unificarían nombres que para Python y el cache del
+# catálogo son distintos: se comparan byte a byte, sin ignorar espacios finales (NO PAD)
+CATALOG_NOMBRE = String(50).with_variant(
+    mysql.VARCHAR(50, charset="utf8mb4", collation="utf8mb4_0900_bin"), "mysql"
+)
+
 
 class DBCarrera(Base):
     __tablename__ = "carreras"
 
     carrera_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    nombre: Mapped[str] = mapped_column(String(50), nullable=False)
+    nombre: Mapped[str] = mapped_column(CATALOG_NOMBRE, nullable=False)
 
     materias: Mapped[List["DBMateria"]] = relationship(
         "DBMateria", back_populates="carrera"
     )
 
+    __table_args__ = (UniqueConstraint("nombre", name="uq_carreras_nombre"),)
+
     def __repr__(self) -> str:
         return f"<DBCarrera(carrera_id={self.carrera_id}, nombre={self.nombre})>"
 
@@ -47,7 +71,7 @@ class DBMateria(Base):
     __tablename__ = "materias"
 
     materia_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    nombre: Mapped[str] = mapped_column(String(50), nullable=False)
+    nombre: Mapped[str] = mapped_column(CATALOG_NOMBRE, nullable=False, index=True)
     carrera_id: Mapped[int] = mapped_column(ForeignKey("carreras.carrera_id"))
 
     carrera: Mapped[DBCarrera] = relationship("DBCarrera", back_populates="materias")
@@ -59,6 +83,11 @@ class DBMateria(Base):
         "inscripciones", "materia"
     )
 
+    # También sirve de índice para la FK a carreras y las búsquedas por (carrera_id, nombre)
+    __table_args__ = (
+        UniqueConstraint("carrera_id", "nombre", name="uq_materias_carrera_id_nombre"),
+    )
+
     def __repr__(self) -> str:
         return f"<DBMateria(materia_id={self.materia_id}, nombre={self.nombre}, carrera_id={self.carrera_id})>"
 
@@ -73,7 +102,7 @@ class DBCursado(Base):
     lead_id: Mapped[int] = mapped_column(
         ForeignKey("leads.lead_id"), primary_key=True, index=True
     )
-    universidad: Mapped[Optional[str]] = mapped_column(String(100))
+    universidad: Mapped[Optional[str]] = mapped_column(String(100), index=True)
 
     lead: Mapped["DBLead"] = relationship("DBLead", back_populates="cursados")
     carrera: Mapped["DBCarrera"] = relationship("DBCarrera")
@@ -121,3 +150,41 @@ class DBInscripcionMateria(Base):
 
     def __repr__(self) -> str:
         return f"<DBInscripcionMateria(lead_id={self.lead_id}, año_cursado={self.año_cursado}, carrera_id={self.carrera_id}, materia_id={self.materia_id}, veces_cursada={self.veces_cursada})>"
+
+
+# Cantidad de cursados por carrera y año, mantenida al crear leads con STATS_SUMMARY
+class DBResumenCursados(Base):
+    __tablename__ = "resumen_cursados"
+
+    carrera_id: Mapped[int] = mapped_column(
+        ForeignKey("carreras.carrera_id"), primary_key=True
+    )
+    año_cursado: Mapped[int] = mapped_column(primary_key=True)
+    cursados: Mapped[int] = mapped_column(nullable=False)
+
+
+# Cantidad de inscripciones y suma de veces_cursada por carrera, materia y año,
+# mantenida al crear leads con STATS_SUMMARY
+class DBResumenInscripciones(Base):
+    __tablename__ = "resumen_inscripciones"
+
+    carrera_id: Mapped[int] = mapped_column(
+        ForeignKey("carreras.carrera_id"), primary_key=True
+    )
+    materia_id: Mapped[int] = mapped_column(
+        ForeignKey("materias.materia_id"), primary_key=True
+    )
+    año_cursado: Mapped[int] = mapped_column(primary_key=True)
+    inscripciones: Mapped[int] = mapped_column(nullable=False)
+    veces_cursada_total: Mapped[int] = mapped_column(nullable=False)
+
+
+# Respuesta de un POST /leads con Idempotency-Key, para contestar los reintentos
+class DBIdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    idempotency_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(nullable=False)
+    response_body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
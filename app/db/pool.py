@@ -0,0 +1,192 @@
+import bisect
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from ..config import settings
+
+"""Pools de conexiones instrumentados: registran el tiempo de espera de cada checkout y, mediante los eventos del pool, las conexiones abiertas, prestadas, devueltas e invalidadas. Las métricas se consultan en GET /metrics/pool."""
+
+# Límites superiores, en segundos, del histograma de latencia de checkout
+CHECKOUT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        """
+        Inicializa los contadores y el histograma de latencia de checkout en cero.
+        """
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checkout_seconds_sum = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_buckets = [0] * (len(CHECKOUT_LATENCY_BUCKETS) + 1)
+
+    def observe_checkout(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        Registra el tiempo que un pedido de conexión esperó al pool.
+
+        Args:
+            seconds (float): Segundos desde el pedido hasta obtener la conexión o fallar.
+            timed_out (bool): Si el pedido terminó por superar pool_timeout. Default False
+        """
+        index = bisect.bisect_left(CHECKOUT_LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self.checkout_buckets[index] += 1
+            self.checkout_seconds_sum += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """
+        Devuelve el estado actual del pool y las métricas acumuladas.
+
+        Args:
+            pool (Pool): El pool al que pertenecen las métricas.
+
+        Returns:
+            dict: Tamaño, conexiones prestadas y overflow actuales, contadores y el
+                histograma acumulado de latencia de checkout.
+        """
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(
+                CHECKOUT_LATENCY_BUCKETS + ("+Inf",), self.checkout_buckets
+            ):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_latency_seconds": {
+                    "buckets": buckets,
+                    "count": cumulative,
+                    "sum": self.checkout_seconds_sum,
+                    "max": self.checkout_seconds_max,
+                },
+            }
+
+
+class InstrumentedPoolMixin:
+    """Agrega un PoolMetrics al pool y mide la espera de cada checkout."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        event.listen(self, "connect", lambda *_: self.metrics.count("connects"))
+        event.listen(self, "checkout", lambda *_: self.metrics.count("checkouts"))
+        event.listen(self, "checkin", lambda *_: self.metrics.count("checkins"))
+        event.listen(self, "invalidate", lambda *_: self.metrics.count("invalidations"))
+
+    def _do_get(self):
+        # Ningún evento del pool se dispara antes de esperar una conexión libre, por lo
+        # que la espera se mide alrededor de _do_get.
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def worker_pool_limits(
+    max_connections: int, workers: int, pool_size: int, max_overflow: int
+) -> tuple[int, int]:
+    """
+    Reparte un presupuesto de conexiones entre los workers: cada uno conserva su
+    pool_size y su max_overflow mientras entren en su parte, y si no se achica primero
+    el overflow.
+
+    Args:
+        max_connections (int): Conexiones que pueden abrir todos los workers juntos.
+        workers (int): Cantidad de workers.
+        pool_size (int): Conexiones persistentes configuradas por worker.
+        max_overflow (int): Conexiones adicionales configuradas por worker.
+
+    Returns:
+        tuple[int, int]: El pool_size y el max_overflow de cada worker, cuya suma por
+            la cantidad de workers no supera max_connections.
+
+    Raises:
+        ValueError: Si el presupuesto no alcanza para una conexión por worker.
+    """
+    per_worker = max_connections // workers
+    if per_worker < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections} is less than one connection "
+            f"per worker ({workers} workers)."
+        )
+    # En QueuePool, pool_size 0 y max_overflow -1 son sin límite
+    pool_size = min(pool_size or per_worker, per_worker)
+    overflow = per_worker - pool_size
+    return pool_size, overflow if max_overflow < 0 else min(max_overflow, overflow)
+
+
+def pool_options() -> dict:
+    """
+    Arma los argumentos de create_engine para el pool a partir de Settings. Con
+    DB_MAX_CONNECTIONS, el pool de cada worker se limita a su parte del presupuesto
+    según WEB_CONCURRENCY.
+
+    Returns:
+        dict: pool_size, max_overflow, pool_timeout, pool_recycle y pool_pre_ping.
+    """
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if settings.db_max_connections is not None:
+        pool_size, max_overflow = worker_pool_limits(
+            settings.db_max_connections,
+            settings.web_concurrency or 1,
+            pool_size,
+            max_overflow,
+        )
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
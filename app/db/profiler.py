@@ -0,0 +1,197 @@
+import logging
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Optional
+import greenlet
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+from ..config import settings
+
+"""Registro de consultas lentas: con los eventos before/after_cursor_execute del engine mide cada sentencia y, si supera SLOW_QUERY_THRESHOLD, la registra junto con el método que la originó (por ejemplo LeadRepository.read_all_db_leads) y su plan de ejecución (EXPLAIN). Las más costosas se consultan en GET /metrics/slow-queries."""
+
+logger = logging.getLogger(__name__)
+
+# Paquete de la aplicación: el primer frame de este paquete que ejecuta una sentencia
+# es el que la origina
+APP_PACKAGE = __name__.split(".")[0] + "."
+
+# Prefijo de EXPLAIN por dialecto; en SQLite EXPLAIN a secas devuelve el bytecode
+EXPLAIN_PREFIXES = {
+    "mysql": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+class SlowQuery:
+    def __init__(self, caller: str, statement: str) -> None:
+        self.caller = caller
+        self.statement = statement
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.explain: Optional[list[list[str]]] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "caller": self.caller,
+            "statement": self.statement,
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+            "explain": self.explain,
+        }
+
+
+class QueryProfiler:
+    def __init__(self, threshold: float, explain: bool, max_statements: int) -> None:
+        """
+        Inicializa el registro de consultas lentas vacío.
+
+        Args:
+            threshold (float): Segundos a partir de los cuales una sentencia es lenta.
+            explain (bool): Si se obtiene el plan de cada sentencia lenta nueva.
+            max_statements (int): Cantidad máxima de sentencias distintas registradas.
+        """
+        self.threshold = threshold
+        self.explain = explain
+        self.max_statements = max_statements
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queries: dict[tuple[str, str], SlowQuery] = {}
+
+    def install(self, engine: Engine) -> None:
+        """
+        Registra los eventos del profiler en el engine.
+
+        Args:
+            engine (Engine): El engine a medir (el sync_engine en el caso asíncrono).
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def top(self, limit: int) -> list[dict]:
+        """
+        Obtiene las sentencias lentas con mayor tiempo total.
+
+        Args:
+            limit (int): Cantidad de sentencias a devolver.
+
+        Returns:
+            list[dict]: Método de origen, sentencia, cantidad, tiempos total y máximo y
+                plan de cada sentencia, de mayor a menor tiempo total.
+        """
+        with self._lock:
+            queries = sorted(
+                self._queries.values(), key=lambda q: q.total_seconds, reverse=True
+            )
+            return [query.as_dict() for query in queries[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self.dropped = 0
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("profiler_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get("profiler_start")
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        if seconds < self.threshold:
+            return
+
+        key = (calling_method(), statement)
+        with self._lock:
+            query = self._queries.get(key)
+            if query is None:
+                if len(self._queries) >= self.max_statements:
+                    self.dropped += 1
+                    return
+                query = self._queries[key] = SlowQuery(*key)
+                new = True
+            else:
+                new = False
+            query.count += 1
+            query.total_seconds += seconds
+            query.max_seconds = max(query.max_seconds, seconds)
+        logger.warning("Slow query (%.3f s) from %s: %s", seconds, key[0], statement)
+
+        # El plan se obtiene una sola vez por sentencia, con los primeros parámetros
+        if new and self.explain and not executemany:
+            # Un cursor del lado del servidor todavía tiene filas sin leer
+            if context is not None and context.execution_options.get("stream_results"):
+                return
+            query.explain = self._explain(conn, statement, parameters)
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[list[list[str]]]:
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        # Con un cursor del DBAPI el EXPLAIN no vuelve a pasar por estos eventos
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [[str(value) for value in row] for row in cursor.fetchall()]
+        except Exception:
+            logger.warning("Could not explain a slow query.", exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+
+def calling_method() -> str:
+    """
+    Obtiene el método o función de la aplicación que ejecutó la sentencia en curso.
+
+    Con una AsyncSession la sentencia corre en un greenlet hijo cuya pila sólo tiene
+    frames de SQLAlchemy, por lo que se sigue buscando en la pila del greenlet que lo
+    lanzó (la corrutina que hizo el await).
+
+    Returns:
+        str: "Clase.método", "módulo.función" o "unknown".
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        caller = _app_frame(frame)
+        if caller is not None:
+            return caller
+        if current.parent is None:
+            return "unknown"
+        current = current.parent
+        frame = current.gr_frame
+
+
+def _app_frame(frame: Optional[FrameType]) -> Optional[str]:
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        instance = frame.f_locals.get("self")
+        # Las sesiones propias de la aplicación (RoutingSession) no son quien hizo la
+        # consulta: se sigue hacia el repositorio que las llamó
+        if (
+            module.startswith(APP_PACKAGE)
+            and module != __name__
+            and not isinstance(instance, Session)
+        ):
+            if instance is not None:
+                return f"{type(instance).__name__}.{frame.f_code.co_name}"
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+query_profiler = QueryProfiler(
+    settings.slow_query_threshold,
+    settings.slow_query_explain,
+    settings.slow_query_max_statements,
+)
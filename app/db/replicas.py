@@ -0,0 +1,165 @@
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator, Optional
+from sqlalchemy import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from ..config import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from .connection import Database
+
+"""Réplicas de lectura. Las sesiones de la aplicación son RoutingSession: dentro de replica_reads las consultas van a una réplica elegida por round-robin, y todo lo demás (escrituras, flush, lecturas fuera del bloque) a la base principal. Una réplica que falla queda fuera de la rotación REPLICA_RETRY_INTERVAL segundos y la lectura se repite en la principal."""
+
+logger = logging.getLogger(__name__)
+
+# Cookie con la que ReadYourWritesMiddleware fija las lecturas de un cliente a la
+# base principal después de una escritura
+PRIMARY_READS_COOKIE = "primary_reads"
+
+
+class ReplicaSet:
+    def __init__(self, replicas: list["Database"]) -> None:
+        """
+        Inicializa la rotación con todas las réplicas disponibles.
+
+        Args:
+            replicas (list[Database]): Las réplicas, con su engine todavía sin crear.
+        """
+        self.replicas = replicas
+        self._lock = threading.Lock()
+        self._next = itertools.cycle(range(len(replicas)))
+        self._down_until = [0.0] * len(replicas)
+        self.reads = [0] * len(replicas)
+        self.failures = [0] * len(replicas)
+        self.fallbacks = 0
+
+    def choose(self) -> Optional["Database"]:
+        """
+        Elige la siguiente réplica disponible. Una réplica caída vuelve a la rotación
+        cuando vence su intervalo de reintento: la lectura siguiente es su chequeo.
+
+        Returns:
+            Database | None: La réplica, o None si todas están fuera de la rotación.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                index = next(self._next)
+                if self._down_until[index] <= now:
+                    self.reads[index] += 1
+                    return self.replicas[index]
+            self.fallbacks += 1
+        return None
+
+    def mark_down(self, replica: "Database") -> None:
+        """
+        Saca una réplica de la rotación por REPLICA_RETRY_INTERVAL segundos.
+
+        Args:
+            replica (Database): La réplica que falló.
+        """
+        index = self.replicas.index(replica)
+        with self._lock:
+            self._down_until[index] = time.monotonic() + settings.replica_retry_interval
+            self.failures[index] += 1
+            self.fallbacks += 1
+
+    def snapshot(self) -> list[dict]:
+        """
+        Devuelve el estado de cada réplica.
+
+        Returns:
+            list[dict]: URL (sin contraseña), si está en la rotación, lecturas y fallos.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": make_url(replica.url).render_as_string(hide_password=True),
+                    "healthy": self._down_until[index] <= now,
+                    "reads": self.reads[index],
+                    "failures": self.failures[index],
+                }
+                for index, replica in enumerate(self.replicas)
+            ]
+
+
+class RoutingSession(Session):
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Optional[ReplicaSet] = None,
+        primary_reads: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Inicializa la sesión como una Session ligada a la base principal.
+
+        Args:
+            replicas (ReplicaSet | None): Las réplicas de lectura. Default None
+            primary_reads (bool): Si todas las lecturas van a la base principal, como
+                tras una escritura del mismo cliente (read-your-writes). Default False
+        """
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.primary_reads = primary_reads
+        self._replica: Optional["Database"] = None
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        """
+        Dirige a una réplica las consultas del bloque, si hay réplicas disponibles.
+        """
+        if self.replicas is None or self.primary_reads or self._replica is not None:
+            yield
+            return
+        self._replica = self.replicas.choose()
+        try:
+            yield
+        finally:
+            self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kw: Any) -> Engine:
+        # El flush de una lectura con cambios pendientes siempre escribe en la principal
+        if self._replica is not None and not self._flushing:
+            engine = self._replica.engine
+            return getattr(engine, "sync_engine", engine)
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def execute(self, statement, *args: Any, **kwargs: Any):
+        replica = self._replica
+        if replica is None:
+            return super().execute(statement, *args, **kwargs)
+        try:
+            return super().execute(statement, *args, **kwargs)
+        except OperationalError:
+            logger.warning(
+                "Read replica %s failed, reading from the primary.",
+                make_url(replica.url).render_as_string(hide_password=True),
+                exc_info=True,
+            )
+            self.replicas.mark_down(replica)
+            self._replica = None
+            return super().execute(statement, *args, **kwargs)
+
+
+def replica_reads(db: "Session | AsyncSession") -> ContextManager[None]:
+    """
+    Dirige a una réplica las lecturas del bloque sobre db.
+
+    Args:
+        db (Session | AsyncSession): La sesión del repositorio.
+
+    Returns:
+        ContextManager[None]: El bloque de lectura; no hace nada si la sesión no es
+            una RoutingSession.
+    """
+    db = getattr(db, "sync_session", db)
+    if isinstance(db, RoutingSession):
+        return db.reading()
+    return nullcontext()
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+"""Modelo de lectura de leads sin entidades ORM: dataclasses con __slots__, sin identity map ni atributos instrumentados, armadas en una pasada sobre las filas planas de lead_graph_rows_statement. Tienen los campos y el orden del schema Lead, así que orjson las serializa directamente al mismo JSON que serialize_leads."""
+
+
+@dataclass(slots=True)
+class NombreRow:
+    nombre: str
+
+
+@dataclass(slots=True)
+class InscripcionRow:
+    materia: NombreRow
+    veces_cursada: int
+
+
+@dataclass(slots=True)
+class CursadoRow:
+    carrera: NombreRow
+    año_cursado: int
+    universidad: Optional[str]
+    inscripciones: list[InscripcionRow]
+
+
+@dataclass(slots=True)
+class LeadRow:
+    lead_id: int
+    nombre: str
+    apellido: str
+    email: Optional[str]
+    direccion: Optional[str]
+    tel: Optional[int]
+    cursados: list[CursadoRow]
+
+
+def group_lead_rows(rows: Iterable[tuple]) -> list[LeadRow]:
+    """
+    Agrupa las filas planas del grafo de leads en LeadRow, en una sola pasada.
+
+    Las filas deben venir ordenadas por lead y por cursado, como las devuelve
+    lead_graph_rows_statement. Las carreras y materias con el mismo nombre comparten
+    un único NombreRow.
+
+    Args:
+        rows (Iterable[tuple]): Filas con las columnas de LEAD_GRAPH_COLUMNS.
+
+    Returns:
+        list[LeadRow]: Los leads, en el orden de las filas.
+    """
+    leads: list[LeadRow] = []
+    nombres: dict[str, NombreRow] = {}
+    lead = cursado = None
+    cursado_key = None
+    for (
+        lead_id,
+        nombre,
+        apellido,
+        email,
+        direccion,
+        tel,
+        año_cursado,
+        carrera_id,
+        universidad,
+        carrera,
+        materia,
+        veces_cursada,
+    ) in rows:
+        if lead is None or lead.lead_id != lead_id:
+            # tel se guarda como texto; el schema Lead lo devuelve como entero
+            lead = LeadRow(
+                lead_id,
+                nombre,
+                apellido,
+                email,
+                direccion,
+                None if tel is None else int(tel),
+                [],
+            )
+            leads.append(lead)
+            cursado_key = None
+        if año_cursado is None:
+            continue
+        if cursado_key != (año_cursado, carrera_id):
+            cursado_key = (año_cursado, carrera_id)
+            carrera_row = nombres.get(carrera)
+            if carrera_row is None:
+                carrera_row = nombres[carrera] = NombreRow(carrera)
+            cursado = CursadoRow(carrera_row, año_cursado, universidad, [])
+            lead.cursados.append(cursado)
+        if materia is None:
+            continue
+        materia_row = nombres.get(materia)
+        if materia_row is None:
+            materia_row = nombres[materia] = NombreRow(materia)
+        cursado.inscripciones.append(InscripcionRow(materia_row, veces_cursada))
+    return leads
@@ -8,6 +8,23 @@ class NotFoundException(Exception):
         self.message = message
 
 
+class DuplicateLeadException(Exception):
+    def __init__(self, message: str, lead_id: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.lead_id = lead_id
+
+
+class IdempotencyKeyReuseException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+class IngestQueueFullException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
 class MateriaCreate(BaseModel):
     nombre: str
 
@@ -38,6 +55,24 @@ class Lead(BaseModel):
     cursados: List[CursadoCreate]
 
 
+class LeadSummary(BaseModel):
+    lead_id: int
+    nombre: str
+    apellido: str
+    email: Optional[str]
+
+
+class LeadFilters(BaseModel):
+    email: Optional[str] = None
+    apellido: Optional[str] = None
+    carrera: Optional[str] = None
+    materia: Optional[str] = None
+    año_desde: Optional[int] = None
+    año_hasta: Optional[int] = None
+    universidad: Optional[str] = None
+    q: Optional[str] = None
+
+
 class LeadCreate(BaseModel):
     nombre: str
     apellido: str
@@ -49,3 +84,51 @@ class LeadCreate(BaseModel):
 
 class LeadReturn(BaseModel):
     lead_id: int
+
+
+class LeadTicket(BaseModel):
+    ticket_id: str
+
+
+class TicketStatus(BaseModel):
+    ticket_id: str
+    # "queued", "done" o "failed"
+    status: str
+    lead_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkLeadResult(BaseModel):
+    index: int
+    lead_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkLeadReturn(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkLeadResult]
+
+
+class CarreraStats(BaseModel):
+    carrera_id: int
+    carrera: str
+    cursados: int
+    inscripciones: int
+    promedio_veces_cursada: Optional[float]
+
+
+class MateriaStats(BaseModel):
+    materia_id: int
+    materia: str
+    carrera_id: int
+    carrera: str
+    inscripciones: int
+    promedio_veces_cursada: Optional[float]
+
+
+class YearStats(BaseModel):
+    año_cursado: int
+    cursados: int
+    inscripciones: int
+    promedio_veces_cursada: Optional[float]
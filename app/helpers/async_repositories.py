@@ -0,0 +1,594 @@
+from typing import AsyncIterator, Iterable, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy import Row, delete, insert, select
+from ..db.models import (
+    DBCarrera,
+    DBCursado,
+    DBIdempotencyKey,
+    DBInscripcionMateria,
+    DBLead,
+    DBMateria,
+    DBResumenCursados,
+    DBResumenInscripciones,
+)
+from ..db.replicas import replica_reads
+from ..db.rows import LeadRow, group_lead_rows
+from ..db.schemas import LeadFilters, NotFoundException
+from .catalog_cache import LRUCache, catalog_cache
+from .repositories import (
+    LEAD_GRAPH_OPTIONS,
+    LEAD_SUMMARY_COLUMNS,
+    carrera_ids_statement,
+    carrera_stats_statement,
+    cursado_counts,
+    duplicate_leads_statement,
+    filter_leads,
+    inscripcion_counts,
+    insert_ignore_statement,
+    lead_graph_rows_statement,
+    lead_rows_statement,
+    materia_ids_statement,
+    materia_stats_statement,
+    paginate,
+    summary_increments,
+    upsert_increment_statement,
+    year_stats_statement,
+)
+
+"""Variantes asíncronas de los repositorios de repositories.py, con los mismos métodos y consultas sobre una AsyncSession."""
+
+
+class AsyncLeadRepository:
+    def __init__(
+        self,
+        db: AsyncSession,
+        loader_options: tuple[LoaderOption, ...] = LEAD_GRAPH_OPTIONS,
+    ) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+            loader_options (tuple[LoaderOption, ...]): Estrategias de carga aplicadas a
+                las lecturas de leads. Default LEAD_GRAPH_OPTIONS.
+        """
+        self.db = db
+        self.loader_options = loader_options
+
+    async def create_db_lead(self, db_lead: DBLead) -> DBLead:
+        """
+        Crea un nuevo lead en la base de datos.
+
+        Args:
+            db_lead (DBLead): El objeto DBLead a ser creado.
+
+        Returns:
+            DBLead: El objeto DBLead creado y guardado en la base de datos.
+        """
+        self.db.add(db_lead)
+        await self.db.commit()
+        await self.db.refresh(db_lead)
+        return db_lead
+
+    async def read_all_db_leads(
+        self,
+        limit: int,
+        offset: int,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[DBLead]:
+        """
+        Lee todos los leads de la base de datos, ordenados por lead_id.
+
+        Args:
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
+
+        Returns:
+            list[DBLead]: Lista de todos los objetos DBLead en la base de datos.
+        """
+        stmt = filter_leads(
+            select(DBLead).options(*self.loader_options),
+            filters,
+            self.db.get_bind().dialect,
+        )
+        with replica_reads(self.db):
+            result = await self.db.execute(paginate(stmt, limit, offset, after_lead_id))
+        return result.scalars().all()
+
+    async def read_all_db_lead_summaries(
+        self,
+        limit: int,
+        offset: int,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[Row]:
+        """
+        Lee una página de leads con sólo las columnas de LeadSummary, ordenados por lead_id.
+
+        Args:
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
+
+        Returns:
+            list[Row]: Las filas, con las columnas de LEAD_SUMMARY_COLUMNS.
+        """
+        stmt = filter_leads(
+            select(*LEAD_SUMMARY_COLUMNS), filters, self.db.get_bind().dialect
+        )
+        with replica_reads(self.db):
+            result = await self.db.execute(paginate(stmt, limit, offset, after_lead_id))
+        return result.all()
+
+    async def find_duplicates(self, emails: set[str], tels: set[str]) -> list[Row]:
+        """
+        Busca los leads existentes con alguno de los emails normalizados o teléfonos.
+
+        Args:
+            emails (set[str]): Emails ya normalizados con normalize_email.
+            tels (set[str]): Teléfonos.
+
+        Returns:
+            list[Row]: Las filas de duplicate_leads_statement, ordenadas por lead_id.
+        """
+        if not emails and not tels:
+            return []
+        result = await self.db.execute(duplicate_leads_statement(emails, tels))
+        return result.all()
+
+    async def read_db_lead(self, lead_id: int) -> DBLead:
+        """
+        Lee un lead específico de la base de datos usando su ID.
+
+        Args:
+            lead_id (int): El ID del lead a ser leído.
+
+        Returns:
+            DBLead: El objeto DBLead con el ID especificado.
+
+        Raises:
+            NotFoundException: Si no se encuentra un lead con el ID proporcionado.
+        """
+        with replica_reads(self.db):
+            db_lead = (
+                await self.db.execute(
+                    select(DBLead)
+                    .options(*self.loader_options)
+                    .where(DBLead.lead_id == lead_id)
+                )
+            ).scalar()
+        if db_lead is None:
+            raise NotFoundException(f"Lead with id {lead_id} not found.")
+        return db_lead
+
+    async def stream_lead_rows(self, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Recorre todos los leads como filas planas con un cursor del lado del servidor.
+
+        Args:
+            batch_size (int): Cantidad de filas por lote.
+
+        Returns:
+            AsyncIterator[Sequence[Row]]: Lotes de filas con las columnas de EXPORT_COLUMNS.
+        """
+        with replica_reads(self.db):
+            result = await self.db.stream(
+                lead_rows_statement().execution_options(yield_per=batch_size)
+            )
+        return result.partitions()
+
+
+class AsyncLeadRowRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+
+    async def read_all_lead_rows(
+        self,
+        limit: int,
+        offset: int,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[LeadRow]:
+        """
+        Lee una página de leads con su grafo como LeadRow, ordenados por lead_id, en una
+        sola consulta y sin crear entidades ORM.
+
+        Args:
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
+
+        Returns:
+            list[LeadRow]: Los leads de la página.
+        """
+        page = filter_leads(select(DBLead.lead_id), filters, self.db.get_bind().dialect)
+        stmt = lead_graph_rows_statement(paginate(page, limit, offset, after_lead_id))
+        with replica_reads(self.db):
+            result = await self.db.execute(stmt)
+        return group_lead_rows(result)
+
+
+class AsyncIdempotencyRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+
+    async def read_record(self, idempotency_key: str) -> DBIdempotencyKey | None:
+        """
+        Lee la respuesta guardada para una Idempotency-Key, por clave primaria.
+
+        Args:
+            idempotency_key (str): La clave.
+
+        Returns:
+            DBIdempotencyKey | None: El registro, o None si no existe.
+        """
+        return await self.db.get(DBIdempotencyKey, idempotency_key)
+
+    def create_record(self, record: DBIdempotencyKey) -> None:
+        """
+        Agrega un registro a la sesión, sin confirmar.
+
+        Args:
+            record (DBIdempotencyKey): El registro.
+        """
+        self.db.add(record)
+
+    async def delete_record(self, record: DBIdempotencyKey) -> None:
+        """
+        Borra un registro y confirma la transacción.
+
+        Args:
+            record (DBIdempotencyKey): El registro.
+        """
+        await self.db.delete(record)
+        await self.db.commit()
+
+
+class AsyncCarreraRepository:
+    def __init__(
+        self, db: AsyncSession, cache: LRUCache[str] = catalog_cache.carreras
+    ) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+            cache (LRUCache[str]): Cache de IDs de carreras por nombre. Default el del
+                catálogo compartido por el proceso.
+        """
+        self.db = db
+        self.cache = cache
+
+    async def read_or_create_carrera_ids(
+        self, carrera_nombres: Iterable[str]
+    ) -> dict[str, int]:
+        """
+        Obtiene los IDs de un conjunto de carreras por nombre, creando las faltantes sin
+        confirmar la transacción, como CarreraRepository.read_or_create_carrera_ids.
+
+        Args:
+            carrera_nombres (Iterable[str]): Los nombres de las carreras a ser leídas o creadas.
+
+        Returns:
+            dict[str, int]: Los IDs de las carreras indexados por nombre.
+        """
+        nombres = set(carrera_nombres)
+        carrera_ids = self.cache.get_many(nombres)
+        faltantes = nombres - carrera_ids.keys()
+        if not faltantes:
+            return carrera_ids
+        result = await self.db.execute(carrera_ids_statement(faltantes))
+        existentes = dict(result.tuples().all())
+        self.cache.put_many(existentes.items())
+        carrera_ids.update(existentes)
+        nuevas = faltantes - existentes.keys()
+        if nuevas:
+            await self.db.execute(
+                insert_ignore_statement(
+                    self.db.get_bind().dialect, DBCarrera.__table__, ["nombre"]
+                ),
+                [{"nombre": nombre} for nombre in nuevas],
+            )
+            result = await self.db.execute(
+                carrera_ids_statement(nuevas).with_for_update(read=True)
+            )
+            creadas = dict(result.tuples().all())
+            self.cache.put_after_commit(self.db.sync_session, creadas.items())
+            carrera_ids.update(creadas)
+        return carrera_ids
+
+
+class AsyncMateriaRepository:
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: LRUCache[tuple[int, str]] = catalog_cache.materias,
+    ) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+            cache (LRUCache[tuple[int, str]]): Cache de IDs de materias por
+                (carrera_id, nombre). Default el del catálogo compartido por el proceso.
+        """
+        self.db = db
+        self.cache = cache
+
+    async def read_or_create_materia_ids(
+        self, materias: Iterable[tuple[int, str]]
+    ) -> dict[tuple[int, str], int]:
+        """
+        Obtiene los IDs de un conjunto de materias, identificadas por (carrera_id, nombre),
+        creando las faltantes sin confirmar la transacción, como
+        MateriaRepository.read_or_create_materia_ids.
+
+        Args:
+            materias (Iterable[tuple[int, str]]): Pares (carrera_id, nombre) de las materias.
+
+        Returns:
+            dict[tuple[int, str], int]: Los IDs de las materias indexados por (carrera_id, nombre).
+        """
+        claves = set(materias)
+        materia_ids = self.cache.get_many(claves)
+        faltantes = claves - materia_ids.keys()
+        if not faltantes:
+            return materia_ids
+        result = await self.db.execute(materia_ids_statement(faltantes))
+        existentes = {
+            (carrera_id, nombre): materia_id
+            for carrera_id, nombre, materia_id in result
+            if (carrera_id, nombre) in faltantes
+        }
+        self.cache.put_many(existentes.items())
+        materia_ids.update(existentes)
+        nuevas = faltantes - existentes.keys()
+        if nuevas:
+            await self.db.execute(
+                insert_ignore_statement(
+                    self.db.get_bind().dialect,
+                    DBMateria.__table__,
+                    ["carrera_id", "nombre"],
+                ),
+                [
+                    {"carrera_id": carrera_id, "nombre": nombre}
+                    for carrera_id, nombre in nuevas
+                ],
+            )
+            result = await self.db.execute(
+                materia_ids_statement(nuevas).with_for_update(read=True)
+            )
+            creadas = {
+                (carrera_id, nombre): materia_id
+                for carrera_id, nombre, materia_id in result
+                if (carrera_id, nombre) in nuevas
+            }
+            self.cache.put_after_commit(self.db.sync_session, creadas.items())
+            materia_ids.update(creadas)
+        return materia_ids
+
+
+class AsyncCursadoRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+
+    async def create_cursado(self, db_cursado: DBCursado) -> DBCursado:
+        """
+        Crea un nuevo cursado en la base de datos.
+
+        Args:
+            db_cursado (DBCursado): El objeto DBCursado a ser creado.
+
+        Returns:
+            DBCursado: El objeto DBCursado creado y guardado en la base de datos.
+        """
+        self.db.add(db_cursado)
+        await self.db.commit()
+        await self.db.refresh(db_cursado)
+        return db_cursado
+
+    async def read_cursado(self) -> list[DBCursado]:
+        """
+        Lee todos los cursados de la base de datos.
+
+        Returns:
+            list[DBCursado]: Lista de todos los objetos DBCursado en la base de datos.
+        """
+        return (await self.db.execute(select(DBCursado))).scalars().all()
+
+    async def bulk_insert_cursados(self, cursados: list[dict]) -> None:
+        """
+        Inserta un lote de cursados en una sola sentencia executemany, sin confirmar.
+
+        Args:
+            cursados (list[dict]): Los valores de cada cursado, por nombre de columna.
+        """
+        if cursados:
+            await self.db.execute(insert(DBCursado.__table__), cursados)
+
+
+class AsyncInscripcionMateriaRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+
+    async def create_inscripcion_materia(
+        self,
+        db_inscripcion: DBInscripcionMateria,
+    ) -> DBInscripcionMateria:
+        """
+        Crea una nueva inscripción de materia en la base de datos.
+
+        Args:
+            db_inscripcion (DBInscripcionMateria): El objeto DBInscripcionMateria a ser creado.
+
+        Returns:
+            DBInscripcionMateria: El objeto DBInscripcionMateria creado y guardado en la base de datos.
+        """
+        self.db.add(db_inscripcion)
+        await self.db.commit()
+        await self.db.refresh(db_inscripcion)
+        return db_inscripcion
+
+    async def read_inscripcion_materia(self) -> list[DBInscripcionMateria]:
+        """
+        Lee todas las inscripciones de materias de la base de datos.
+
+        Returns:
+            list[DBInscripcionMateria]: Lista de todos los objetos DBInscripcionMateria en la base de datos.
+        """
+        return (await self.db.execute(select(DBInscripcionMateria))).scalars().all()
+
+    async def bulk_insert_inscripciones(self, inscripciones: list[dict]) -> None:
+        """
+        Inserta un lote de inscripciones en una sola sentencia executemany, sin confirmar.
+
+        Args:
+            inscripciones (list[dict]): Los valores de cada inscripción, por nombre de columna.
+        """
+        if inscripciones:
+            await self.db.execute(insert(DBInscripcionMateria.__table__), inscripciones)
+
+
+class AsyncStatsRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el repositorio con una sesión asíncrona de base de datos.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+
+    async def read_carrera_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por carrera (ver carrera_stats_statement).
+
+        Args:
+            summary (bool): Si se leen las tablas de resumen.
+
+        Returns:
+            list[Row]: Una fila por carrera, con las columnas de CarreraStats.
+        """
+        result = await self.db.execute(carrera_stats_statement(summary))
+        return result.all()
+
+    async def read_materia_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por materia (ver materia_stats_statement).
+
+        Args:
+            summary (bool): Si se lee la tabla de resumen.
+
+        Returns:
+            list[Row]: Una fila por materia, con las columnas de MateriaStats.
+        """
+        result = await self.db.execute(materia_stats_statement(summary))
+        return result.all()
+
+    async def read_year_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por año de cursado (ver year_stats_statement).
+
+        Args:
+            summary (bool): Si se leen las tablas de resumen.
+
+        Returns:
+            list[Row]: Una fila por año, con las columnas de YearStats.
+        """
+        result = await self.db.execute(year_stats_statement(summary))
+        return result.all()
+
+    async def increment_summary(
+        self,
+        cursados: Iterable[tuple[int, int]],
+        inscripciones: Iterable[tuple[int, int, int, int]],
+    ) -> None:
+        """
+        Suma a las tablas de resumen los cursados e inscripciones nuevos, sin confirmar
+        la transacción.
+
+        Args:
+            cursados (Iterable[tuple[int, int]]): Pares (carrera_id, año_cursado).
+            inscripciones (Iterable[tuple[int, int, int, int]]): Tuplas (carrera_id,
+                materia_id, año_cursado, veces_cursada).
+        """
+        dialect = self.db.get_bind().dialect
+        filas_cursados, filas_inscripciones = summary_increments(
+            cursados, inscripciones
+        )
+        if filas_cursados:
+            await self.db.execute(
+                upsert_increment_statement(
+                    dialect,
+                    DBResumenCursados.__table__,
+                    ["carrera_id", "año_cursado"],
+                    ["cursados"],
+                ),
+                filas_cursados,
+            )
+        if filas_inscripciones:
+            await self.db.execute(
+                upsert_increment_statement(
+                    dialect,
+                    DBResumenInscripciones.__table__,
+                    ["carrera_id", "materia_id", "año_cursado"],
+                    ["inscripciones", "veces_cursada_total"],
+                ),
+                filas_inscripciones,
+            )
+
+    async def rebuild_summary(self) -> None:
+        """
+        Recalcula las tablas de resumen desde cursados e inscripciones, sin confirmar la
+        transacción.
+        """
+        await self.db.execute(delete(DBResumenInscripciones))
+        await self.db.execute(delete(DBResumenCursados))
+        await self.db.execute(
+            insert(DBResumenCursados).from_select(
+                ["carrera_id", "año_cursado", "cursados"],
+                select(cursado_counts(summary=False)),
+            )
+        )
+        await self.db.execute(
+            insert(DBResumenInscripciones).from_select(
+                [
+                    "carrera_id",
+                    "materia_id",
+                    "año_cursado",
+                    "inscripciones",
+                    "veces_cursada_total",
+                ],
+                select(inscripcion_counts(summary=False)),
+            )
+        )
@@ -0,0 +1,362 @@
+from .async_repositories import (
+    AsyncLeadRepository,
+    AsyncLeadRowRepository,
+    AsyncCarreraRepository,
+    AsyncInscripcionMateriaRepository,
+    AsyncCursadoRepository,
+    AsyncIdempotencyRepository,
+    AsyncMateriaRepository,
+    AsyncStatsRepository,
+)
+from ..config import settings
+from .export import aencode_partitions
+from .idempotency import build_idempotency_record, is_expired, request_fingerprint
+from .pagination import decode_cursor, encode_cursor
+from .response_cache import LeadResponseCache, lead_response_cache
+from .serialization import serialize_lead
+from .services import LeadService
+from typing import Any, AsyncIterator
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.models import DBIdempotencyKey, DBLead
+from ..db.rows import LeadRow
+from ..db.schemas import (
+    BulkLeadResult,
+    DuplicateLeadException,
+    IdempotencyKeyReuseException,
+    LeadCreate,
+    LeadFilters,
+    NotFoundException,
+)
+
+
+class AsyncLeadService:
+    def __init__(
+        self, db: AsyncSession, response_cache: LeadResponseCache = lead_response_cache
+    ) -> None:
+        """
+        Inicializa el servicio con los repositorios asíncronos necesarios.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+            response_cache (LeadResponseCache): Cache de las respuestas de read_lead_json.
+                Default el cache configurado en settings.
+        """
+        self.db = db
+        self.response_cache = response_cache
+        self.lead_repository = AsyncLeadRepository(db)
+        self.lead_row_repository = AsyncLeadRowRepository(db)
+        self.carrera_repository = AsyncCarreraRepository(db)
+        self.materia_repository = AsyncMateriaRepository(db)
+        self.cursado_repository = AsyncCursadoRepository(db)
+        self.inscripcion_materia_repository = AsyncInscripcionMateriaRepository(db)
+        self.stats_repository = AsyncStatsRepository(db)
+        self.idempotency_repository = AsyncIdempotencyRepository(db)
+
+    async def create_lead(
+        self,
+        lead: LeadCreate,
+        idempotency_key: str | None = None,
+        request_hash: str | None = None,
+    ) -> DBLead:
+        """
+        Crea un nuevo lead junto con sus cursados e inscripciones en una única transacción.
+
+        Como en LeadService.create_lead, un error de integridad quita del cache del
+        catálogo las claves usadas y, si es del catálogo, se reintenta una vez; con
+        STATS_SUMMARY las tablas de resumen se actualizan en la misma transacción.
+
+        Args:
+            lead (LeadCreate): Los datos del lead a ser creado.
+            idempotency_key (str | None): Si se indica, la respuesta se guarda con esta
+                clave en la misma transacción. Default None
+            request_hash (str | None): La huella de la solicitud, junto con
+                idempotency_key. Default None
+
+        Returns:
+            DBLead: El objeto DBLead creado y guardado en la base de datos.
+
+        Raises:
+            DuplicateLeadException: Si LEAD_DEDUP está activado y el lead ya existe.
+        """
+        duplicate_id = (await self.find_duplicate_ids([lead]))[0]
+        if duplicate_id is not None:
+            raise DuplicateLeadException(
+                f"Lead duplicates lead {duplicate_id}.", duplicate_id
+            )
+        for intento in range(2):
+            try:
+                carrera_ids, materia_ids = await self.resolve_catalog(lead)
+                db_lead = LeadService.build_lead(lead, carrera_ids, materia_ids)
+                self.db.add(db_lead)
+                if settings.stats_summary:
+                    await self.stats_repository.increment_summary(
+                        *LeadService.summary_keys(db_lead.cursados)
+                    )
+                if idempotency_key is not None:
+                    await self.db.flush()
+                    self.idempotency_repository.create_record(
+                        build_idempotency_record(
+                            idempotency_key, request_hash, db_lead.lead_id
+                        )
+                    )
+                await self.db.commit()
+            except IntegrityError as error:
+                await self.db.rollback()
+                LeadService.invalidate_catalog(
+                    lead, self.carrera_repository.cache, self.materia_repository.cache
+                )
+                if intento or not LeadService.is_catalog_conflict(error):
+                    raise
+            except Exception:
+                await self.db.rollback()
+                raise
+            else:
+                return db_lead
+
+    async def create_lead_idempotent(
+        self, lead: LeadCreate, idempotency_key: str
+    ) -> tuple[DBIdempotencyKey, bool]:
+        """
+        Crea un lead con un header Idempotency-Key, como
+        LeadService.create_lead_idempotent.
+
+        Args:
+            lead (LeadCreate): Los datos del lead a ser creado.
+            idempotency_key (str): El header Idempotency-Key.
+
+        Returns:
+            tuple[DBIdempotencyKey, bool]: La respuesta guardada y si es una repetición.
+
+        Raises:
+            IdempotencyKeyReuseException: Si la clave ya se usó con otro cuerpo.
+            DuplicateLeadException: Si LEAD_DEDUP está activado y el lead ya existe.
+        """
+        request_hash = request_fingerprint(lead)
+        record = await self.read_idempotency_record(idempotency_key, request_hash)
+        if record is not None:
+            return record, True
+        try:
+            await self.create_lead(lead, idempotency_key, request_hash)
+        except IntegrityError:
+            record = await self.read_idempotency_record(idempotency_key, request_hash)
+            if record is None:
+                raise
+            return record, True
+        return await self.idempotency_repository.read_record(idempotency_key), False
+
+    async def read_idempotency_record(
+        self, idempotency_key: str, request_hash: str
+    ) -> DBIdempotencyKey | None:
+        """
+        Lee la respuesta vigente de una Idempotency-Key, como
+        LeadService.read_idempotency_record.
+
+        Args:
+            idempotency_key (str): La clave.
+            request_hash (str): La huella de la solicitud actual.
+
+        Returns:
+            DBIdempotencyKey | None: El registro vigente, o None.
+
+        Raises:
+            IdempotencyKeyReuseException: Si la clave se guardó con otra huella.
+        """
+        record = await self.idempotency_repository.read_record(idempotency_key)
+        if record is None:
+            return None
+        if is_expired(record, settings.idempotency_ttl):
+            await self.idempotency_repository.delete_record(record)
+            return None
+        if record.request_hash != request_hash:
+            raise IdempotencyKeyReuseException(
+                "Idempotency-Key was already used with a different request body."
+            )
+        return record
+
+    async def find_duplicate_ids(self, leads: list[LeadCreate]) -> list[int | None]:
+        """
+        Busca, según LEAD_DEDUP, los leads existentes que duplican a cada lead.
+
+        Args:
+            leads (list[LeadCreate]): Los leads a crear.
+
+        Returns:
+            list[int | None]: Para cada lead, el lead_id duplicado o None.
+        """
+        emails, tels = LeadService.dedup_keys(leads, settings.lead_dedup)
+        rows = await self.lead_repository.find_duplicates(emails, tels)
+        return LeadService.match_duplicates(leads, rows, settings.lead_dedup)
+
+    async def resolve_catalog(
+        self, lead: LeadCreate
+    ) -> tuple[dict[str, int], dict[tuple[int, str], int]]:
+        """
+        Obtiene los IDs de las carreras y materias de un lead, creando las faltantes sin
+        confirmar la transacción.
+
+        Args:
+            lead (LeadCreate): Los datos del lead.
+
+        Returns:
+            tuple[dict[str, int], dict[tuple[int, str], int]]: Los IDs de carreras por
+                nombre y de materias por (carrera_id, nombre).
+        """
+        carrera_ids = await self.carrera_repository.read_or_create_carrera_ids(
+            cursado.carrera.nombre for cursado in lead.cursados
+        )
+        materia_ids = await self.materia_repository.read_or_create_materia_ids(
+            (carrera_ids[cursado.carrera.nombre], inscripcion.materia.nombre)
+            for cursado in lead.cursados
+            for inscripcion in cursado.inscripciones
+        )
+        return carrera_ids, materia_ids
+
+    async def create_leads_bulk(
+        self, items: list[Any], batch_size: int
+    ) -> list[BulkLeadResult]:
+        """
+        Crea un lote grande de leads. Reutiliza LeadService.create_leads_bulk sobre la
+        conexión de la sesión asíncrona, sin bloquear el event loop.
+
+        Args:
+            items (list[Any]): Los ítems sin validar, por ejemplo de parse_bulk_body.
+            batch_size (int): Cantidad de ítems por bloque.
+
+        Returns:
+            list[BulkLeadResult]: Un resultado por ítem, con su lead_id o su error.
+        """
+        return await self.db.run_sync(
+            lambda db: LeadService(db).create_leads_bulk(items, batch_size)
+        )
+
+    async def read_all_leads(
+        self,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        view: str = "full",
+        filters: LeadFilters | None = None,
+    ) -> tuple[list[DBLead] | list[LeadRow] | list[Row], str | None]:
+        """
+        Lee una página de leads de la base de datos.
+
+        Args:
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            cursor (str | None): Cursor opaco devuelto por la página anterior. Default None
+            view (str): "full" para los leads completos (DBLead, o LeadRow si
+                LEAD_READ_MODEL es "rows") o "summary" para las filas de la vista
+                resumida (LeadSummary). Default "full"
+            filters (LeadFilters | None): Filtros sobre los leads. El cursor sigue
+                siendo el último lead_id, por lo que sirve con los mismos filtros. Default None
+
+        Returns:
+            tuple[list[DBLead] | list[LeadRow] | list[Row], str | None]: Los leads de
+                la página y el cursor de la página siguiente, o None si no hay más
+                resultados.
+        """
+        after_lead_id = None
+        if cursor is not None:
+            if offset:
+                raise NotFoundException("Cursor and offset cannot be combined.")
+            after_lead_id = decode_cursor(cursor)
+        if view == "summary":
+            read_page = self.lead_repository.read_all_db_lead_summaries
+        elif settings.lead_read_model == "rows":
+            read_page = self.lead_row_repository.read_all_lead_rows
+        else:
+            read_page = self.lead_repository.read_all_db_leads
+        leads = await read_page(
+            limit=limit, offset=offset, after_lead_id=after_lead_id, filters=filters
+        )
+        next_cursor = None
+        if leads and len(leads) == limit:
+            next_cursor = encode_cursor(leads[-1].lead_id)
+        return leads, next_cursor
+
+    async def read_lead(self, lead_id: int) -> DBLead:
+        """
+        Lee un lead específico de la base de datos usando su ID.
+
+        Args:
+            lead_id (int): El ID del lead a ser leído.
+
+        Returns:
+            DBLead: El objeto DBLead con el ID especificado.
+        """
+        return await self.lead_repository.read_db_lead(lead_id)
+
+    async def read_lead_json(self, lead_id: int) -> bytes:
+        """
+        Lee un lead específico serializado como JSON, pasando por el cache de respuestas.
+
+        Args:
+            lead_id (int): El ID del lead a ser leído.
+
+        Returns:
+            bytes: El lead serializado según el schema Lead.
+        """
+        body = self.response_cache.get(lead_id)
+        if body is None:
+            body = serialize_lead(await self.read_lead(lead_id))
+            self.response_cache.set(lead_id, body)
+        return body
+
+    async def export_leads(
+        self, export_format: str, batch_size: int
+    ) -> AsyncIterator[str]:
+        """
+        Exporta todos los leads como texto en el formato indicado, por bloques.
+
+        Args:
+            export_format (str): "ndjson" o "csv".
+            batch_size (int): Cantidad de filas leídas y codificadas por bloque.
+
+        Yields:
+            str: Los bloques de texto de la exportación.
+        """
+        partitions = await self.lead_repository.stream_lead_rows(batch_size)
+        async for chunk in aencode_partitions(export_format, partitions):
+            yield chunk
+
+
+class AsyncStatsService:
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Inicializa el servicio de estadísticas con una sesión asíncrona.
+
+        Args:
+            db (AsyncSession): La sesión de la base de datos.
+        """
+        self.db = db
+        self.stats_repository = AsyncStatsRepository(db)
+
+    async def read_stats(self, dimension: str) -> list[Row]:
+        """
+        Lee las estadísticas agrupadas por una dimensión, como StatsService.read_stats.
+
+        Args:
+            dimension (str): "carreras", "materias" o "years".
+
+        Returns:
+            list[Row]: Una fila por valor de la dimensión.
+        """
+        read = {
+            "carreras": self.stats_repository.read_carrera_stats,
+            "materias": self.stats_repository.read_materia_stats,
+            "years": self.stats_repository.read_year_stats,
+        }[dimension]
+        return await read(summary=settings.stats_summary)
+
+    async def rebuild_summary(self) -> None:
+        """
+        Recalcula y confirma las tablas de resumen desde cursados e inscripciones.
+        """
+        try:
+            await self.stats_repository.rebuild_summary()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
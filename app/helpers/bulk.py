@@ -0,0 +1,65 @@
+import json
+from typing import Any, Iterator
+from pydantic import ValidationError
+from ..db.schemas import NotFoundException
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+class InvalidLine:
+    """Línea NDJSON que no pudo decodificarse; se reporta como error de su ítem."""
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+def parse_bulk_body(body: bytes, content_type: str | None) -> list[Any]:
+    """
+    Decodifica el cuerpo de una carga masiva, ya sea un array JSON o NDJSON.
+
+    Args:
+        body (bytes): El cuerpo de la solicitud.
+        content_type (str | None): El header Content-Type de la solicitud.
+
+    Returns:
+        list[Any]: Los ítems sin validar, en el orden recibido. Las líneas NDJSON
+            inválidas se devuelven como InvalidLine.
+
+    Raises:
+        NotFoundException: Si el cuerpo no es un array JSON ni NDJSON.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return list(_parse_ndjson(body))
+    try:
+        items = json.loads(body)
+    except ValueError as e:
+        raise NotFoundException(f"Invalid JSON body: {e}") from e
+    if not isinstance(items, list):
+        raise NotFoundException("Bulk body must be a JSON array or NDJSON.")
+    return items
+
+
+def _parse_ndjson(body: bytes) -> Iterator[Any]:
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield InvalidLine(f"Invalid JSON line: {e}")
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Resume un ValidationError de pydantic en una sola línea.
+
+    Args:
+        error (ValidationError): El error de validación.
+
+    Returns:
+        str: Los errores con el formato "campo.subcampo: mensaje", separados por "; ".
+    """
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
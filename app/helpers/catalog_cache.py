@@ -0,0 +1,147 @@
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterable, TypeVar
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..db.models import DBCarrera, DBMateria
+
+"""Cache en memoria de los IDs del catálogo (carreras por nombre y materias por (carrera_id, nombre)). Los IDs de filas creadas en una transacción sólo entran al cache cuando esa transacción se confirma, de modo que un rollback, por ejemplo al perder una carrera contra un insert concurrente, nunca deja IDs inexistentes en el cache."""
+
+K = TypeVar("K", bound=Hashable)
+
+PENDING_KEY = "catalog_cache_pending"
+
+
+class LRUCache(Generic[K]):
+    def __init__(self, maxsize: int) -> None:
+        """
+        Inicializa un cache LRU de IDs con tamaño acotado.
+
+        Args:
+            maxsize (int): Cantidad máxima de entradas; al superarla se descarta la
+                entrada usada hace más tiempo.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[K], record_stats: bool = True) -> dict[K, int]:
+        """
+        Busca varias claves, registrando aciertos y fallos.
+
+        Args:
+            keys (Iterable[K]): Las claves a buscar.
+            record_stats (bool): Si se cuentan los aciertos y fallos. Default True
+
+        Returns:
+            dict[K, int]: Los IDs de las claves encontradas.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._data.get(key)
+                if value is None:
+                    self.misses += record_stats
+                    continue
+                self._data.move_to_end(key)
+                self.hits += record_stats
+                found[key] = value
+        return found
+
+    def put_many(self, items: Iterable[tuple[K, int]]) -> None:
+        with self._lock:
+            for key, value in items:
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def put_after_commit(self, db: Session, items: Iterable[tuple[K, int]]) -> None:
+        """
+        Agenda IDs recién creados para entrar al cache cuando la transacción de la
+        sesión se confirme. Si la transacción se revierte, se descartan.
+
+        Args:
+            db (Session): La sesión que creó las filas.
+            items (Iterable[tuple[K, int]]): Pares (clave, ID).
+        """
+        db.info.setdefault(PENDING_KEY, []).append((self, list(items)))
+
+    def invalidate(self, keys: Iterable[K]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class CatalogCache:
+    def __init__(self, maxsize: int) -> None:
+        """
+        Inicializa los caches de carreras y materias.
+
+        Args:
+            maxsize (int): Tamaño máximo de cada cache.
+        """
+        self.carreras: LRUCache[str] = LRUCache(maxsize)
+        self.materias: LRUCache[tuple[int, str]] = LRUCache(maxsize)
+
+    def warm(self, db: Session) -> None:
+        """
+        Carga el catálogo existente en el cache, hasta su tamaño máximo.
+
+        Args:
+            db (Session): Una sesión de base de datos.
+        """
+        self.carreras.put_many(
+            db.execute(
+                select(DBCarrera.nombre, DBCarrera.carrera_id).limit(
+                    self.carreras.maxsize
+                )
+            ).tuples()
+        )
+        self.materias.put_many(
+            ((carrera_id, nombre), materia_id)
+            for carrera_id, nombre, materia_id in db.execute(
+                select(
+                    DBMateria.carrera_id, DBMateria.nombre, DBMateria.materia_id
+                ).limit(self.materias.maxsize)
+            ).tuples()
+        )
+
+    def clear(self) -> None:
+        self.carreras.clear()
+        self.materias.clear()
+
+    def stats(self) -> dict:
+        return {"carreras": self.carreras.stats(), "materias": self.materias.stats()}
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending(db: Session) -> None:
+    for cache, items in db.info.pop(PENDING_KEY, ()):
+        cache.put_many(items)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(db: Session) -> None:
+    db.info.pop(PENDING_KEY, None)
+
+
+catalog_cache = CatalogCache(settings.catalog_cache_size)
@@ -0,0 +1,100 @@
+import csv
+import io
+import orjson
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+
+# Columnas de la exportación: una fila por inscripción, con los datos del lead, el
+# cursado, la carrera y la materia. Los leads sin cursados aparecen con valores nulos.
+EXPORT_COLUMNS = (
+    "lead_id",
+    "nombre",
+    "apellido",
+    "email",
+    "direccion",
+    "tel",
+    "año_cursado",
+    "universidad",
+    "carrera",
+    "materia",
+    "veces_cursada",
+)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def ndjson_rows(rows: Sequence[tuple]) -> str:
+    """
+    Codifica un lote de filas como NDJSON, un objeto por fila.
+
+    Args:
+        rows (Sequence[tuple]): Filas con las columnas de EXPORT_COLUMNS.
+
+    Returns:
+        str: El bloque de texto del lote.
+    """
+    return b"".join(
+        orjson.dumps(dict(zip(EXPORT_COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    ).decode()
+
+
+def csv_rows(rows: Sequence[tuple]) -> str:
+    """
+    Codifica un lote de filas como CSV.
+
+    Args:
+        rows (Sequence[tuple]): Filas con las columnas de EXPORT_COLUMNS.
+
+    Returns:
+        str: El bloque de texto del lote.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+# Por formato: encabezado y codificador de lotes
+EXPORT_FORMATS = {
+    "ndjson": ("", ndjson_rows),
+    "csv": (csv_rows([EXPORT_COLUMNS]), csv_rows),
+}
+
+
+def encode_partitions(
+    export_format: str, partitions: Iterable[Sequence[tuple]]
+) -> Iterator[str]:
+    """
+    Codifica lotes de filas en el formato indicado.
+
+    Args:
+        export_format (str): "ndjson" o "csv".
+        partitions (Iterable[Sequence[tuple]]): Lotes de filas con las columnas de EXPORT_COLUMNS.
+
+    Yields:
+        str: El encabezado, si el formato lo tiene, y luego un bloque de texto por lote.
+    """
+    header, encode = EXPORT_FORMATS[export_format]
+    if header:
+        yield header
+    for rows in partitions:
+        yield encode(rows)
+
+
+async def aencode_partitions(
+    export_format: str, partitions: AsyncIterable[Sequence[tuple]]
+) -> AsyncIterator[str]:
+    """
+    Variante de encode_partitions para lotes leídos de forma asíncrona.
+
+    Args:
+        export_format (str): "ndjson" o "csv".
+        partitions (AsyncIterable[Sequence[tuple]]): Lotes de filas con las columnas de EXPORT_COLUMNS.
+
+    Yields:
+        str: El encabezado, si el formato lo tiene, y luego un bloque de texto por lote.
+    """
+    header, encode = EXPORT_FORMATS[export_format]
+    if header:
+        yield header
+    async for rows in partitions:
+        yield encode(rows)
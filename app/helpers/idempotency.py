@@ -0,0 +1,64 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+import orjson
+from ..db.models import DBIdempotencyKey
+from ..db.schemas import LeadCreate, LeadReturn
+
+"""Idempotencia de POST /leads: huella de cada solicitud y armado y vigencia de las respuestas guardadas por Idempotency-Key."""
+
+
+def request_fingerprint(lead: LeadCreate) -> str:
+    """
+    Calcula la huella de una solicitud de creación, para detectar una Idempotency-Key
+    reutilizada con otro cuerpo.
+
+    Args:
+        lead (LeadCreate): Los datos del lead.
+
+    Returns:
+        str: El hash del lead serializado con las claves ordenadas (64 caracteres hex).
+    """
+    body = orjson.dumps(lead.model_dump(), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(body, digest_size=32).hexdigest()
+
+
+def utcnow() -> datetime:
+    # Las columnas DateTime no guardan zona horaria: se usa UTC sin tzinfo
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def build_idempotency_record(
+    idempotency_key: str, request_hash: str, lead_id: int
+) -> DBIdempotencyKey:
+    """
+    Arma el registro con la respuesta de un POST /leads exitoso.
+
+    Args:
+        idempotency_key (str): El header Idempotency-Key de la solicitud.
+        request_hash (str): La huella de la solicitud (request_fingerprint).
+        lead_id (int): El ID del lead creado.
+
+    Returns:
+        DBIdempotencyKey: El registro, pendiente de ser agregado a la sesión.
+    """
+    return DBIdempotencyKey(
+        idempotency_key=idempotency_key,
+        request_hash=request_hash,
+        status_code=200,
+        response_body=LeadReturn(lead_id=lead_id).model_dump_json().encode(),
+        created_at=utcnow(),
+    )
+
+
+def is_expired(record: DBIdempotencyKey, ttl: int) -> bool:
+    """
+    Indica si la respuesta guardada ya no debe usarse para contestar reintentos.
+
+    Args:
+        record (DBIdempotencyKey): El registro guardado.
+        ttl (int): Segundos de vigencia (IDEMPOTENCY_TTL).
+
+    Returns:
+        bool: True si el registro venció.
+    """
+    return record.created_at <= utcnow() - timedelta(seconds=ttl)
@@ -0,0 +1,269 @@
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+import orjson
+from ..config import settings
+from ..db.schemas import (
+    BulkLeadResult,
+    IngestQueueFullException,
+    LeadCreate,
+    TicketStatus,
+)
+
+"""Cola de ingesta write-behind de POST /leads: los leads validados se encolan en memoria (y opcionalmente en un spool en disco) y un thread los inserta por lotes con el camino de carga bulk. Cada lead encolado recibe un ticket para consultar su estado."""
+
+logger = logging.getLogger(__name__)
+
+# Función que inserta un lote de leads y devuelve un resultado por lead, en orden
+FlushFunction = Callable[[list[LeadCreate]], list[BulkLeadResult]]
+
+_STOP = object()
+
+
+class IngestQueue:
+    def __init__(
+        self,
+        maxsize: int,
+        batch_size: int,
+        flush_interval: float,
+        spool_path: Optional[str] = None,
+        ticket_limit: int = 100000,
+    ) -> None:
+        """
+        Inicializa la cola de ingesta.
+
+        Args:
+            maxsize (int): Cantidad máxima de leads esperando; con la cola llena,
+                submit rechaza los leads nuevos.
+            batch_size (int): Cantidad máxima de leads por lote insertado.
+            flush_interval (float): Segundos que se espera a completar un lote antes de
+                insertarlo incompleto.
+            spool_path (Optional[str]): Archivo NDJSON donde se registra cada lead
+                encolado y su finalización; los leads sin finalizar se reencolan al
+                iniciar. Default None (sin spool)
+            ticket_limit (int): Cantidad máxima de tickets recordados. Default 100000
+        """
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.ticket_limit = ticket_limit
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._tickets: OrderedDict[str, TicketStatus] = OrderedDict()
+        self._lock = threading.Lock()
+        self._spool = None
+        self._spool_pending = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, lead: LeadCreate) -> str:
+        """
+        Encola un lead para su inserción en segundo plano.
+
+        Args:
+            lead (LeadCreate): El lead ya validado.
+
+        Returns:
+            str: El ID del ticket del lead.
+
+        Raises:
+            IngestQueueFullException: Si la cola está llena.
+        """
+        ticket_id = uuid.uuid4().hex
+        with self._lock:
+            if self._queue.full():
+                raise IngestQueueFullException("Ingest queue is full.")
+            self._spool_write({"ticket_id": ticket_id, "lead": lead.model_dump()})
+            self._set_ticket(TicketStatus(ticket_id=ticket_id, status="queued"))
+            # Sólo este método agrega leads y lo hace bajo el lock: no se bloquea
+            self._queue.put_nowait((ticket_id, lead))
+        return ticket_id
+
+    def ticket(self, ticket_id: str) -> Optional[TicketStatus]:
+        """
+        Obtiene el estado de un ticket.
+
+        Args:
+            ticket_id (str): El ID del ticket.
+
+        Returns:
+            Optional[TicketStatus]: El estado, o None si no existe o ya se olvidó.
+        """
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def start(self, flush: FlushFunction) -> None:
+        """
+        Inicia el thread que inserta los lotes, reencolando antes los leads del spool
+        que no llegaron a insertarse.
+
+        Args:
+            flush (FlushFunction): La función que inserta cada lote.
+        """
+        if self.spool_path is not None:
+            pending = self._recover_spool()
+            self._spool = open(self.spool_path, "ab")
+            self._spool_pending = len(pending)
+        else:
+            pending = []
+        self._thread = threading.Thread(
+            target=self._run, args=(flush,), name="ingest-queue", daemon=True
+        )
+        self._thread.start()
+        for ticket_id, lead in pending:
+            self._set_ticket(TicketStatus(ticket_id=ticket_id, status="queued"))
+            # Puede superar maxsize al iniciar: se espera a que el thread haga lugar
+            self._queue.put((ticket_id, lead))
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el thread después de insertar los leads ya encolados.
+
+        Args:
+            timeout (Optional[float]): Segundos máximos de espera. Default None
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def _run(self, flush: FlushFunction) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush_batch(flush, batch)
+
+    def _flush_batch(
+        self, flush: FlushFunction, batch: list[tuple[str, LeadCreate]]
+    ) -> None:
+        try:
+            results = flush([lead for _, lead in batch])
+        except Exception as e:
+            logger.exception("Could not insert a batch of %d queued leads.", len(batch))
+            results = [
+                BulkLeadResult(index=index, error=str(e)) for index in range(len(batch))
+            ]
+        with self._lock:
+            for (ticket_id, _), result in zip(batch, results):
+                self._set_ticket(
+                    TicketStatus(
+                        ticket_id=ticket_id,
+                        status="failed" if result.error else "done",
+                        lead_id=result.lead_id,
+                        error=result.error,
+                    )
+                )
+                self._spool_write({"ticket_id": ticket_id, "done": True})
+            self._spool_pending -= len(batch)
+            # Sin leads pendientes, el spool se vacía para que no crezca sin límite
+            if self._spool is not None and self._spool_pending <= 0:
+                self._spool.truncate(0)
+                os.fsync(self._spool.fileno())
+                self._spool_pending = 0
+
+    def _set_ticket(self, status: TicketStatus) -> None:
+        self._tickets[status.ticket_id] = status
+        self._tickets.move_to_end(status.ticket_id)
+        while len(self._tickets) > self.ticket_limit:
+            self._tickets.popitem(last=False)
+
+    def _spool_write(self, entry: dict) -> None:
+        if self._spool is None:
+            return
+        self._spool.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+        self._spool.flush()
+        os.fsync(self._spool.fileno())
+        if "lead" in entry:
+            self._spool_pending += 1
+
+    def _recover_spool(self) -> list[tuple[str, LeadCreate]]:
+        if not os.path.exists(self.spool_path):
+            return []
+        pending: OrderedDict[str, LeadCreate] = OrderedDict()
+        with open(self.spool_path, "rb") as spool:
+            for line in spool:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Una línea cortada por una caída a mitad de escritura
+                    continue
+                if entry.get("done"):
+                    pending.pop(entry["ticket_id"], None)
+                else:
+                    pending[entry["ticket_id"]] = LeadCreate.model_validate(
+                        entry["lead"]
+                    )
+        self._rewrite_spool(pending)
+        if pending:
+            logger.info("Recovered %d queued leads from the spool.", len(pending))
+        return list(pending.items())
+
+    def _rewrite_spool(self, pending: OrderedDict[str, LeadCreate]) -> None:
+        """
+        Reemplaza el spool por uno con sólo los leads pendientes.
+
+        El nuevo spool se escribe y sincroniza en un archivo temporal del mismo
+        directorio y recién entonces reemplaza al anterior con os.replace, que es
+        atómico: si el proceso cae a mitad de camino, el spool anterior sigue entero.
+
+        Args:
+            pending (OrderedDict[str, LeadCreate]): Los leads pendientes por ticket.
+        """
+        directory = os.path.dirname(os.path.abspath(self.spool_path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.spool_path)}.", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as spool:
+                for ticket_id, lead in pending.items():
+                    spool.write(
+                        orjson.dumps(
+                            {"ticket_id": ticket_id, "lead": lead.model_dump()},
+                            option=orjson.OPT_APPEND_NEWLINE,
+                        )
+                    )
+                spool.flush()
+                os.fsync(spool.fileno())
+            os.replace(temp_path, self.spool_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        # El reemplazo queda registrado en el directorio recién cuando éste se sincroniza
+        directory_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+
+
+ingest_queue = IngestQueue(
+    settings.ingest_queue_size,
+    settings.ingest_batch_size,
+    settings.ingest_flush_interval,
+    settings.ingest_spool_path,
+)
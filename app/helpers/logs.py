@@ -0,0 +1,164 @@
+import atexit
+import copy
+import logging
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional
+import orjson
+from ..config import settings
+
+"""Configuración del logging: el nivel sale de Settings, los requests llevan un request id y los registros se encolan en un QueueHandler para que un thread (QueueListener) los formatee y escriba, fuera del camino del request."""
+
+# Loggers de bibliotecas que con el nivel de la aplicación en DEBUG registrarían cada
+# sentencia, conexión o request; usan LOG_LIBRARY_LEVEL
+LIBRARY_LOGGERS = (
+    "sqlalchemy",
+    "aiosqlite",
+    "aiomysql",
+    "asyncio",
+    "httpx",
+    "httpcore",
+    "multipart",
+)
+
+current_request_id: ContextVar[str] = ContextVar("current_request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """Agrega el request id del contexto en curso a cada registro."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Deja pasar sólo una fracción de los registros DEBUG."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry).decode()
+
+
+class LocalQueueHandler(QueueHandler):
+    """QueueHandler para una cola del mismo proceso.
+
+    Sólo arma el mensaje y el traceback antes de encolar. Deja el formato final,
+    texto o JSON, al handler del QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+def configure_logging() -> Optional[QueueListener]:
+    """
+    Configura el logger raíz según LOG_LEVEL, LOG_FORMAT, LOG_LIBRARY_LEVEL y
+    LOG_DEBUG_SAMPLE_RATE.
+
+    Como logging.basicConfig, si el logger raíz ya tiene handlers (por ejemplo los de
+    pytest o de un --log-config de uvicorn) sólo se ajustan los niveles.
+
+    Returns:
+        Optional[QueueListener]: El listener que escribe los registros, ya iniciado y
+            detenido al salir del proceso, o None si no se agregaron handlers.
+    """
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(settings.log_library_level.upper())
+    if root.handlers:
+        return None
+
+    output = logging.StreamHandler(sys.stderr)
+    if settings.log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = LocalQueueHandler(records)
+    # Los filtros corren en el thread del request: el request id sale de su contexto y
+    # los DEBUG descartados no llegan a encolarse
+    handler.addFilter(RequestIdFilter())
+    if settings.log_debug_sample_rate < 1:
+        handler.addFilter(DebugSamplingFilter(settings.log_debug_sample_rate))
+    root.addHandler(handler)
+
+    listener = QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI que asigna un request id a cada request HTTP.
+
+    Se usa el header X-Request-ID de la solicitud si viene, y se devuelve en la
+    respuesta.
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = current_request_id.set(request_id)
+
+        async def send_with_request_id(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            current_request_id.reset(token)
@@ -0,0 +1,41 @@
+import base64
+import binascii
+import json
+from ..db.schemas import NotFoundException
+
+
+def encode_cursor(lead_id: int) -> str:
+    """
+    Codifica la posición de un lead como un cursor opaco.
+
+    Args:
+        lead_id (int): El ID del último lead devuelto.
+
+    Returns:
+        str: El cursor codificado en base64 url-safe.
+    """
+    data = json.dumps({"lead_id": lead_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor (str): El cursor recibido del cliente.
+
+    Returns:
+        int: El ID del lead a partir del cual continuar.
+
+    Raises:
+        NotFoundException: Si el cursor no es válido.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        lead_id = json.loads(data)["lead_id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise NotFoundException("Illegal cursor value.") from e
+    if not isinstance(lead_id, int) or isinstance(lead_id, bool):
+        raise NotFoundException("Illegal cursor value.")
+    return lead_id
@@ -0,0 +1,40 @@
+from typing import Callable
+from ..config import settings
+from ..db.replicas import PRIMARY_READS_COOKIE
+
+"""Read-your-writes con réplicas de lectura: después de una escritura exitosa se le entrega al cliente una cookie que vence a los REPLICA_READ_YOUR_WRITES segundos, y mientras la envíe get_db le da una sesión que lee de la base principal, sin el retraso de replicación."""
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que agrega la cookie de lecturas en la principal a las escrituras."""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        window = settings.replica_read_your_writes
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not window
+            or not (settings.replica_urls or settings.async_replica_urls)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cookie = (
+            f"{PRIMARY_READS_COOKIE}=1; Max-Age={window}; Path=/; HttpOnly; "
+            "SameSite=Lax"
+        ).encode("latin-1")
+
+        async def send_with_cookie(message: dict) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
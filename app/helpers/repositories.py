@@ -1,19 +1,642 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from ..db.models import DBCarrera, DBCursado, DBInscripcionMateria, DBLead, DBMateria
+import importlib
+from types import ModuleType
+from typing import Iterable, Iterator, Sequence
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy import (
+    ColumnElement,
+    Dialect,
+    Insert,
+    Row,
+    Select,
+    Subquery,
+    Table,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+)
+from ..db.models import (
+    DBCarrera,
+    DBCursado,
+    DBIdempotencyKey,
+    DBInscripcionMateria,
+    DBLead,
+    DBMateria,
+    DBResumenCursados,
+    DBResumenInscripciones,
+)
 from fastapi import Query
-from ..db.schemas import NotFoundException
+from ..db.replicas import replica_reads
+from ..db.rows import LeadRow, group_lead_rows
+from ..db.schemas import LeadFilters, NotFoundException
+from ..config import settings
+from .catalog_cache import LRUCache, catalog_cache
+
+# Carga del grafo completo de un lead en una cantidad fija de consultas, sin importar
+# cuántos leads tenga la página: una para los leads, una para los cursados (con su carrera
+# por JOIN) y una para las inscripciones (con su materia por JOIN).
+LEAD_GRAPH_OPTIONS: tuple[LoaderOption, ...] = (
+    selectinload(DBLead.cursados).options(
+        joinedload(DBCursado.carrera),
+        selectinload(DBCursado.inscripciones).joinedload(DBInscripcionMateria.materia),
+    ),
+)
+
+
+# Columnas de la vista resumida de leads (schema LeadSummary)
+LEAD_SUMMARY_COLUMNS = (DBLead.lead_id, DBLead.nombre, DBLead.apellido, DBLead.email)
+
+
+# Columnas de la consulta plana del grafo de leads (ver group_lead_rows)
+LEAD_GRAPH_COLUMNS = (
+    DBLead.lead_id,
+    DBLead.nombre,
+    DBLead.apellido,
+    DBLead.email,
+    DBLead.direccion,
+    DBLead.tel,
+    DBCursado.año_cursado,
+    DBCursado.carrera_id,
+    DBCursado.universidad,
+    DBCarrera.nombre,
+    DBMateria.nombre,
+    DBInscripcionMateria.veces_cursada,
+)
+
+
+# Email sin espacios ni mayúsculas, tal como lo indexa ix_leads_email_normalizado
+NORMALIZED_EMAIL = func.lower(func.trim(DBLead.email))
+
+
+def normalize_email(email: str) -> str:
+    """Normaliza un email como NORMALIZED_EMAIL, para buscarlo en ese índice."""
+    return email.strip().lower()
+
+
+def duplicate_leads_statement(emails: set[str], tels: set[str]) -> Select:
+    """
+    Arma la consulta de los leads con alguno de los emails normalizados o teléfonos
+    indicados. Cada condición usa su índice (ix_leads_email_normalizado, ix_leads_tel).
+
+    Args:
+        emails (set[str]): Emails ya normalizados con normalize_email.
+        tels (set[str]): Teléfonos.
+
+    Returns:
+        Select: La consulta, con las columnas lead_id, email (normalizado) y tel.
+    """
+    condiciones = []
+    if emails:
+        condiciones.append(NORMALIZED_EMAIL.in_(emails))
+    if tels:
+        condiciones.append(DBLead.tel.in_(tels))
+    return (
+        select(DBLead.lead_id, NORMALIZED_EMAIL.label("email"), DBLead.tel)
+        .where(or_(*condiciones))
+        .order_by(DBLead.lead_id)
+    )
+
+
+def paginate(
+    stmt: Select, limit: int, offset: int, after_lead_id: int | None = None
+) -> Select:
+    """
+    Aplica a una consulta de leads el orden por lead_id y la página pedida.
+
+    Si se indica after_lead_id se pagina por clave (keyset): se leen los leads con
+    lead_id mayor, por lo que el costo de una página no depende de su profundidad.
+
+    Args:
+        stmt (Select): La consulta de leads.
+        limit (int): Número máximo de resultados a devolver.
+        offset (int): Número de resultados a saltar desde el inicio.
+        after_lead_id (int | None): Último lead_id de la página anterior. Default None
+
+    Returns:
+        Select: La consulta paginada.
+
+    Raises:
+        NotFoundException: Si limit u offset no son enteros mayores o iguales a 0.
+    """
+    if not isinstance(limit, int) or not isinstance(offset, int):
+        raise NotFoundException(f"Illegal limit/offset value. Only numbers >= 0.")
+    if limit < 0 or offset < 0:
+        raise NotFoundException(f"Illegal limit/offset value. Only numbers >= 0.")
+
+    stmt = stmt.order_by(DBLead.lead_id)
+    if after_lead_id is not None:
+        stmt = stmt.where(DBLead.lead_id > after_lead_id)
+    return stmt.limit(limit).offset(offset)
+
+
+def filter_leads(
+    stmt: Select,
+    filters: LeadFilters | None,
+    dialect: Dialect,
+    search_mode: str | None = None,
+) -> Select:
+    """
+    Aplica a una consulta de leads los filtros de GET /leads.
+
+    email es una igualdad y apellido un prefijo (LIKE 'x%'), ambos resueltos con los
+    índices de leads. Los filtros de cursado (carrera, materia, rango de año_cursado y
+    universidad) se traducen en un único lead_id IN (subconsulta) sobre cursados, unido
+    a carreras y, si hace falta, a inscripciones y materias: todas las condiciones deben
+    cumplirse en el mismo cursado, y un lead con varios cursados que coinciden no se
+    repite en la página. La subconsulta no está correlacionada, por lo que el motor la
+    resuelve una vez desde el índice más selectivo en lugar de evaluarla por cada lead.
+
+    q busca en nombre y apellido: con search_mode "fulltext" en MySQL se usa MATCH ...
+    AGAINST en modo booleano sobre el índice FULLTEXT; en otro caso, un prefijo sobre
+    cualquiera de las dos columnas.
+
+    Args:
+        stmt (Select): La consulta de leads.
+        filters (LeadFilters | None): Los filtros; los campos en None no se aplican.
+        dialect (Dialect): El dialecto de la conexión.
+        search_mode (str | None): "prefix" o "fulltext". Default settings.lead_search_mode
+
+    Returns:
+        Select: La consulta filtrada.
+    """
+    if filters is None:
+        return stmt
+    if filters.email is not None:
+        stmt = stmt.where(DBLead.email == filters.email)
+    if filters.apellido:
+        stmt = stmt.where(DBLead.apellido.startswith(filters.apellido, autoescape=True))
+    if filters.q:
+        search_mode = search_mode or settings.lead_search_mode
+        if search_mode == "fulltext" and dialect.name == "mysql":
+            stmt = stmt.where(
+                dialect_module(dialect)
+                .match(DBLead.nombre, DBLead.apellido, against=filters.q)
+                .in_boolean_mode()
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    DBLead.nombre.startswith(filters.q, autoescape=True),
+                    DBLead.apellido.startswith(filters.q, autoescape=True),
+                )
+            )
+
+    condiciones = []
+    cursados = select(DBCursado.lead_id)
+    if filters.carrera is not None:
+        cursados = cursados.join(DBCursado.carrera)
+        condiciones.append(DBCarrera.nombre == filters.carrera)
+    if filters.materia is not None:
+        cursados = cursados.join(DBCursado.inscripciones).join(
+            DBInscripcionMateria.materia
+        )
+        condiciones.append(DBMateria.nombre == filters.materia)
+    if filters.año_desde is not None:
+        condiciones.append(DBCursado.año_cursado >= filters.año_desde)
+    if filters.año_hasta is not None:
+        condiciones.append(DBCursado.año_cursado <= filters.año_hasta)
+    if filters.universidad is not None:
+        condiciones.append(DBCursado.universidad == filters.universidad)
+    if condiciones:
+        stmt = stmt.where(DBLead.lead_id.in_(cursados.where(*condiciones)))
+    return stmt
+
+
+def lead_rows_statement() -> Select:
+    """
+    Arma la consulta plana de leads usada por la exportación: leads, cursados, carreras,
+    inscripciones y materias unidos por OUTER JOIN, ordenados por lead_id.
+
+    Returns:
+        Select: La consulta, con las columnas de EXPORT_COLUMNS.
+    """
+    return (
+        select(
+            DBLead.lead_id,
+            DBLead.nombre,
+            DBLead.apellido,
+            DBLead.email,
+            DBLead.direccion,
+            DBLead.tel,
+            DBCursado.año_cursado,
+            DBCursado.universidad,
+            DBCarrera.nombre,
+            DBMateria.nombre,
+            DBInscripcionMateria.veces_cursada,
+        )
+        .outerjoin(DBLead.cursados)
+        .outerjoin(DBCursado.carrera)
+        .outerjoin(DBCursado.inscripciones)
+        .outerjoin(DBInscripcionMateria.materia)
+        .order_by(DBLead.lead_id)
+    )
+
+
+def lead_graph_rows_statement(page: Select) -> Select:
+    """
+    Arma la consulta plana del grafo de los leads de una página: leads, cursados,
+    carreras, inscripciones y materias unidos por OUTER JOIN, ordenados por lead y por
+    cursado para agruparlos en una pasada con group_lead_rows.
+
+    La página se une como tabla derivada y no con lead_id IN (subconsulta), porque
+    MySQL no admite LIMIT en una subconsulta de IN.
+
+    Args:
+        page (Select): La consulta de los lead_id de la página, filtrada y paginada.
+
+    Returns:
+        Select: La consulta, con las columnas de LEAD_GRAPH_COLUMNS.
+    """
+    page = page.subquery()
+    return (
+        select(*LEAD_GRAPH_COLUMNS)
+        .select_from(page)
+        .join(DBLead, DBLead.lead_id == page.c.lead_id)
+        .outerjoin(DBLead.cursados)
+        .outerjoin(DBCursado.carrera)
+        .outerjoin(DBCursado.inscripciones)
+        .outerjoin(DBInscripcionMateria.materia)
+        .order_by(
+            DBLead.lead_id,
+            DBCursado.año_cursado,
+            DBCursado.carrera_id,
+            DBInscripcionMateria.materia_id,
+        )
+    )
+
+
+def dialect_module(dialect: Dialect) -> ModuleType:
+    # Se importa al armar la sentencia, cuando el engine ya cargó su dialecto: importar
+    # los de MySQL, SQLite y PostgreSQL (con asyncpg) alargaba el arranque de cada worker
+    return importlib.import_module(f"sqlalchemy.dialects.{dialect.name}")
+
+
+def insert_ignore_statement(
+    dialect: Dialect, table: Table, index_elements: list[str]
+) -> Insert:
+    """
+    Arma un INSERT que ignora las filas que ya existen según un constraint único:
+    ON DUPLICATE KEY UPDATE sin cambios en MySQL y ON CONFLICT DO NOTHING en SQLite y
+    PostgreSQL. A diferencia de un INSERT común, no falla si un insert concurrente
+    creó la misma fila.
+
+    Args:
+        dialect (Dialect): El dialecto de la conexión.
+        table (Table): La tabla.
+        index_elements (list[str]): Las columnas del constraint único.
+
+    Returns:
+        Insert: La sentencia, para ejecutar con una lista de filas.
+    """
+    if dialect.name == "mysql":
+        stmt = dialect_module(dialect).insert(table)
+        columna = index_elements[-1]
+        return stmt.on_duplicate_key_update({columna: stmt.inserted[columna]})
+    if dialect.name in ("sqlite", "postgresql"):
+        return (
+            dialect_module(dialect)
+            .insert(table)
+            .on_conflict_do_nothing(index_elements=index_elements)
+        )
+    # Sin upsert: un insert concurrente termina en IntegrityError
+    return insert(table)
+
+
+def upsert_increment_statement(
+    dialect: Dialect, table: Table, index_elements: list[str], columns: list[str]
+) -> Insert:
+    """
+    Arma un INSERT que, si la fila ya existe según su clave, le suma los valores
+    insertados a columns: ON DUPLICATE KEY UPDATE en MySQL y ON CONFLICT DO UPDATE en
+    SQLite y PostgreSQL. La suma la hace el motor sobre la fila bloqueada, por lo que
+    dos transacciones concurrentes no pierden incrementos.
+
+    Args:
+        dialect (Dialect): El dialecto de la conexión.
+        table (Table): La tabla.
+        index_elements (list[str]): Las columnas de la clave.
+        columns (list[str]): Las columnas a incrementar.
+
+    Returns:
+        Insert: La sentencia, para ejecutar con una lista de filas.
+
+    Raises:
+        ValueError: Si el dialecto no tiene upsert.
+    """
+    if dialect.name == "mysql":
+        stmt = dialect_module(dialect).insert(table)
+        return stmt.on_duplicate_key_update(
+            {columna: table.c[columna] + stmt.inserted[columna] for columna in columns}
+        )
+    if dialect.name in ("sqlite", "postgresql"):
+        stmt = dialect_module(dialect).insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                columna: table.c[columna] + stmt.excluded[columna]
+                for columna in columns
+            },
+        )
+    raise ValueError(f"Dialect {dialect.name} does not support upserts.")
+
+
+def summary_increments(
+    cursados: Iterable[tuple[int, int]],
+    inscripciones: Iterable[tuple[int, int, int, int]],
+) -> tuple[list[dict], list[dict]]:
+    """
+    Agrupa los cursados e inscripciones nuevos en los incrementos de las tablas de
+    resumen, ordenados por clave para que las transacciones concurrentes bloqueen las
+    filas en el mismo orden.
+
+    Args:
+        cursados (Iterable[tuple[int, int]]): Pares (carrera_id, año_cursado).
+        inscripciones (Iterable[tuple[int, int, int, int]]): Tuplas (carrera_id,
+            materia_id, año_cursado, veces_cursada).
+
+    Returns:
+        tuple[list[dict], list[dict]]: Las filas de resumen_cursados y de
+            resumen_inscripciones, por nombre de columna.
+    """
+    por_cursado: dict[tuple[int, int], int] = {}
+    for clave in cursados:
+        por_cursado[clave] = por_cursado.get(clave, 0) + 1
+    por_inscripcion: dict[tuple[int, int, int], list[int]] = {}
+    for carrera_id, materia_id, año_cursado, veces_cursada in inscripciones:
+        totales = por_inscripcion.setdefault(
+            (carrera_id, materia_id, año_cursado), [0, 0]
+        )
+        totales[0] += 1
+        totales[1] += veces_cursada
+    return (
+        [
+            {"carrera_id": carrera_id, "año_cursado": año_cursado, "cursados": cantidad}
+            for (carrera_id, año_cursado), cantidad in sorted(por_cursado.items())
+        ],
+        [
+            {
+                "carrera_id": carrera_id,
+                "materia_id": materia_id,
+                "año_cursado": año_cursado,
+                "inscripciones": cantidad,
+                "veces_cursada_total": veces,
+            }
+            for (carrera_id, materia_id, año_cursado), (cantidad, veces) in sorted(
+                por_inscripcion.items()
+            )
+        ],
+    )
+
+
+def cursado_counts(summary: bool) -> Subquery:
+    """
+    Cantidad de cursados por (carrera_id, año_cursado): con GROUP BY sobre cursados o,
+    con summary, leída de resumen_cursados.
+
+    Args:
+        summary (bool): Si se lee la tabla de resumen.
+
+    Returns:
+        Subquery: Con las columnas carrera_id, año_cursado y cursados.
+    """
+    if summary:
+        return select(
+            DBResumenCursados.carrera_id,
+            DBResumenCursados.año_cursado,
+            DBResumenCursados.cursados,
+        ).subquery()
+    return (
+        select(
+            DBCursado.carrera_id,
+            DBCursado.año_cursado,
+            func.count().label("cursados"),
+        )
+        .group_by(DBCursado.carrera_id, DBCursado.año_cursado)
+        .subquery()
+    )
+
+
+def inscripcion_counts(summary: bool) -> Subquery:
+    """
+    Cantidad de inscripciones y suma de veces_cursada por (carrera_id, materia_id,
+    año_cursado): con GROUP BY sobre inscripcion_materia o, con summary, leídas de
+    resumen_inscripciones.
+
+    Args:
+        summary (bool): Si se lee la tabla de resumen.
+
+    Returns:
+        Subquery: Con las columnas carrera_id, materia_id, año_cursado, inscripciones y
+            veces_cursada_total.
+    """
+    if summary:
+        return select(
+            DBResumenInscripciones.carrera_id,
+            DBResumenInscripciones.materia_id,
+            DBResumenInscripciones.año_cursado,
+            DBResumenInscripciones.inscripciones,
+            DBResumenInscripciones.veces_cursada_total,
+        ).subquery()
+    return (
+        select(
+            DBInscripcionMateria.carrera_id,
+            DBInscripcionMateria.materia_id,
+            DBInscripcionMateria.año_cursado,
+            func.count().label("inscripciones"),
+            func.sum(DBInscripcionMateria.veces_cursada).label("veces_cursada_total"),
+        )
+        .group_by(
+            DBInscripcionMateria.carrera_id,
+            DBInscripcionMateria.materia_id,
+            DBInscripcionMateria.año_cursado,
+        )
+        .subquery()
+    )
+
+
+def grouped_inscripciones(summary: bool, key: str) -> Subquery:
+    """
+    Agrupa inscripcion_counts por una de sus columnas de clave.
+
+    Args:
+        summary (bool): Si se lee la tabla de resumen.
+        key (str): "carrera_id", "materia_id" o "año_cursado".
+
+    Returns:
+        Subquery: Con las columnas key, inscripciones y veces_cursada_total.
+    """
+    counts = inscripcion_counts(summary)
+    return (
+        select(
+            counts.c[key],
+            func.sum(counts.c.inscripciones).label("inscripciones"),
+            func.sum(counts.c.veces_cursada_total).label("veces_cursada_total"),
+        )
+        .group_by(counts.c[key])
+        .subquery()
+    )
+
+
+def grouped_cursados(summary: bool, key: str) -> Subquery:
+    """
+    Agrupa cursado_counts por una de sus columnas de clave.
+
+    Args:
+        summary (bool): Si se lee la tabla de resumen.
+        key (str): "carrera_id" o "año_cursado".
+
+    Returns:
+        Subquery: Con las columnas key y cursados.
+    """
+    counts = cursado_counts(summary)
+    return (
+        select(counts.c[key], func.sum(counts.c.cursados).label("cursados"))
+        .group_by(counts.c[key])
+        .subquery()
+    )
+
+
+def stats_columns(inscripciones: Subquery) -> tuple[ColumnElement, ...]:
+    """
+    Columnas inscripciones y promedio_veces_cursada de una agrupación de
+    grouped_inscripciones unida por OUTER JOIN (sin inscripciones, 0 y NULL).
+    """
+    return (
+        func.coalesce(inscripciones.c.inscripciones, 0).label("inscripciones"),
+        # * 1.0 evita la división entera de SQLite
+        (
+            inscripciones.c.veces_cursada_total
+            * 1.0
+            / func.nullif(inscripciones.c.inscripciones, 0)
+        ).label("promedio_veces_cursada"),
+    )
+
+
+def carrera_stats_statement(summary: bool) -> Select:
+    """
+    Arma la consulta de cursados, inscripciones y promedio de veces_cursada por carrera.
+
+    Args:
+        summary (bool): Si se leen las tablas de resumen en lugar de agrupar cursados
+            e inscripciones.
+
+    Returns:
+        Select: La consulta, con las columnas de CarreraStats, ordenada por carrera_id.
+    """
+    cursados = grouped_cursados(summary, "carrera_id")
+    inscripciones = grouped_inscripciones(summary, "carrera_id")
+    return (
+        select(
+            DBCarrera.carrera_id,
+            DBCarrera.nombre.label("carrera"),
+            func.coalesce(cursados.c.cursados, 0).label("cursados"),
+            *stats_columns(inscripciones),
+        )
+        .outerjoin(cursados, cursados.c.carrera_id == DBCarrera.carrera_id)
+        .outerjoin(inscripciones, inscripciones.c.carrera_id == DBCarrera.carrera_id)
+        .order_by(DBCarrera.carrera_id)
+    )
+
+
+def materia_stats_statement(summary: bool) -> Select:
+    """
+    Arma la consulta de inscripciones y promedio de veces_cursada por materia.
+
+    Args:
+        summary (bool): Si se lee la tabla de resumen en lugar de agrupar inscripciones.
+
+    Returns:
+        Select: La consulta, con las columnas de MateriaStats, ordenada por materia_id.
+    """
+    inscripciones = grouped_inscripciones(summary, "materia_id")
+    return (
+        select(
+            DBMateria.materia_id,
+            DBMateria.nombre.label("materia"),
+            DBMateria.carrera_id,
+            DBCarrera.nombre.label("carrera"),
+            *stats_columns(inscripciones),
+        )
+        .join(DBMateria.carrera)
+        .outerjoin(inscripciones, inscripciones.c.materia_id == DBMateria.materia_id)
+        .order_by(DBMateria.materia_id)
+    )
+
+
+def year_stats_statement(summary: bool) -> Select:
+    """
+    Arma la consulta de cursados, inscripciones y promedio de veces_cursada por año de
+    cursado. Toda inscripción pertenece a un cursado, por lo que los años salen de los
+    cursados.
+
+    Args:
+        summary (bool): Si se leen las tablas de resumen en lugar de agrupar cursados
+            e inscripciones.
+
+    Returns:
+        Select: La consulta, con las columnas de YearStats, ordenada por año_cursado.
+    """
+    cursados = grouped_cursados(summary, "año_cursado")
+    inscripciones = grouped_inscripciones(summary, "año_cursado")
+    return (
+        select(
+            cursados.c.año_cursado, cursados.c.cursados, *stats_columns(inscripciones)
+        )
+        .outerjoin(inscripciones, inscripciones.c.año_cursado == cursados.c.año_cursado)
+        .order_by(cursados.c.año_cursado)
+    )
+
+
+def carrera_ids_statement(nombres: Iterable[str]) -> Select:
+    """
+    Arma la consulta de los IDs de un conjunto de carreras por nombre.
+
+    Args:
+        nombres (Iterable[str]): Los nombres de las carreras.
+
+    Returns:
+        Select: La consulta, con las columnas nombre y carrera_id.
+    """
+    return select(DBCarrera.nombre, DBCarrera.carrera_id).where(
+        DBCarrera.nombre.in_(nombres)
+    )
+
+
+def materia_ids_statement(claves: set[tuple[int, str]]) -> Select:
+    """
+    Arma la consulta de los IDs de un conjunto de materias por (carrera_id, nombre).
+
+    El filtro por IN en ambas columnas puede traer combinaciones de más, que quien
+    ejecuta la consulta descarta al indexar por el par completo.
+
+    Args:
+        claves (set[tuple[int, str]]): Pares (carrera_id, nombre) de las materias.
+
+    Returns:
+        Select: La consulta, con las columnas carrera_id, nombre y materia_id.
+    """
+    return select(DBMateria.carrera_id, DBMateria.nombre, DBMateria.materia_id).where(
+        DBMateria.carrera_id.in_({carrera_id for carrera_id, _ in claves}),
+        DBMateria.nombre.in_({nombre for _, nombre in claves}),
+    )
 
 
 class LeadRepository:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self, db: Session, loader_options: tuple[LoaderOption, ...] = LEAD_GRAPH_OPTIONS
+    ) -> None:
         """
         Inicializa el repositorio con una sesión de base de datos.
 
         Args:
             db (Session): La sesión de la base de datos.
+            loader_options (tuple[LoaderOption, ...]): Estrategias de carga aplicadas a
+                las lecturas de leads. Default LEAD_GRAPH_OPTIONS.
         """
         self.db = db
+        self.loader_options = loader_options
 
     def create_db_lead(self, db_lead: DBLead) -> DBLead:
         """
@@ -30,25 +653,85 @@ class LeadRepository:
         self.db.refresh(db_lead)
         return db_lead
 
-    def read_all_db_leads(self, limit=Query, offset=Query) -> list[DBLead]:
+    def bulk_create_db_leads(self, db_leads: list[DBLead]) -> list[DBLead]:
+        """
+        Inserta un lote de leads con un flush, sin confirmar la transacción.
+
+        En los motores con INSERT ... RETURNING el lote se envía en sentencias
+        multi-fila; los IDs quedan disponibles en los objetos luego del flush.
+
+        Args:
+            db_leads (list[DBLead]): Los objetos DBLead a ser insertados.
+
+        Returns:
+            list[DBLead]: Los mismos objetos, con su lead_id asignado.
+        """
+        self.db.add_all(db_leads)
+        self.db.flush()
+        return db_leads
+
+    def read_all_db_leads(
+        self,
+        limit=Query,
+        offset=Query,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[DBLead]:
         """
-        Lee todos los leads de la base de datos.
+        Lee todos los leads de la base de datos, ordenados por lead_id.
+
+        Si se indica after_lead_id se pagina por clave (keyset): se leen los leads con
+        lead_id mayor, por lo que el costo de una página no depende de su profundidad.
 
         Args:
             limit (Query): Número máximo de resultados a devolver. Default 10
             offset (Query): Número de resultados a saltar desde el inicio. Default 0
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
 
         Returns:
             list[DBLead]: Lista de todos los objetos DBLead en la base de datos.
         """
-        if not isinstance(limit, int) or not isinstance(offset, int):
-            raise NotFoundException(f"Illegal limit/offset value. Only numbers >= 0.")
-        if limit < 0 or offset < 0:
-            raise NotFoundException(f"Illegal limit/offset value. Only numbers >= 0.")
+        stmt = filter_leads(
+            select(DBLead).options(*self.loader_options),
+            filters,
+            self.db.get_bind().dialect,
+        )
+        # Las consultas de selectinload corren al leer el resultado, dentro del bloque
+        with replica_reads(self.db):
+            return (
+                self.db.execute(paginate(stmt, limit, offset, after_lead_id))
+                .scalars()
+                .all()
+            )
 
-        return (
-            self.db.execute(select(DBLead).limit(limit).offset(offset)).scalars().all()
+    def read_all_db_lead_summaries(
+        self,
+        limit: int,
+        offset: int,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[Row]:
+        """
+        Lee una página de leads con sólo las columnas de LeadSummary, ordenados por lead_id.
+
+        La consulta es de columnas, por lo que no carga los cursados ni crea objetos
+        DBLead en el identity map de la sesión.
+
+        Args:
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
+
+        Returns:
+            list[Row]: Las filas, con las columnas de LEAD_SUMMARY_COLUMNS.
+        """
+        stmt = filter_leads(
+            select(*LEAD_SUMMARY_COLUMNS), filters, self.db.get_bind().dialect
         )
+        with replica_reads(self.db):
+            return self.db.execute(paginate(stmt, limit, offset, after_lead_id)).all()
 
     def read_db_lead(self, lead_id: int) -> DBLead:
         """
@@ -63,15 +746,53 @@ class LeadRepository:
         Raises:
             HTTPException: Si no se encuentra un lead con el ID proporcionado.
         """
-        db_lead = self.db.execute(
-            select(DBLead).where(DBLead.lead_id == lead_id)
-        ).scalar()
+        with replica_reads(self.db):
+            db_lead = self.db.execute(
+                select(DBLead)
+                .options(*self.loader_options)
+                .where(DBLead.lead_id == lead_id)
+            ).scalar()
         if db_lead is None:
             raise NotFoundException(f"Lead with id {lead_id} not found.")
         return db_lead
 
+    def find_duplicates(self, emails: set[str], tels: set[str]) -> list[Row]:
+        """
+        Busca los leads existentes con alguno de los emails normalizados o teléfonos.
 
-class CarreraRepository:
+        Args:
+            emails (set[str]): Emails ya normalizados con normalize_email.
+            tels (set[str]): Teléfonos.
+
+        Returns:
+            list[Row]: Las filas de duplicate_leads_statement, ordenadas por lead_id.
+        """
+        if not emails and not tels:
+            return []
+        return self.db.execute(duplicate_leads_statement(emails, tels)).all()
+
+    def stream_lead_rows(self, batch_size: int) -> Iterator[Sequence[Row]]:
+        """
+        Recorre todos los leads como filas planas, uniendo cursados, carreras,
+        inscripciones y materias, ordenadas por lead_id.
+
+        Usa un cursor del lado del servidor (yield_per), por lo que la memoria usada no
+        depende del tamaño de la tabla. La sesión debe permanecer abierta mientras se
+        consumen los lotes.
+
+        Args:
+            batch_size (int): Cantidad de filas por lote.
+
+        Returns:
+            Iterator[Sequence[Row]]: Lotes de filas con las columnas de EXPORT_COLUMNS.
+        """
+        stmt = lead_rows_statement().execution_options(yield_per=batch_size)
+        # El cursor queda abierto en la conexión de la réplica que ejecutó la consulta
+        with replica_reads(self.db):
+            return self.db.execute(stmt).partitions()
+
+
+class LeadRowRepository:
     def __init__(self, db: Session) -> None:
         """
         Inicializa el repositorio con una sesión de base de datos.
@@ -81,28 +802,37 @@ class CarreraRepository:
         """
         self.db = db
 
-    def read_or_create_carrera(self, carrera_nombre: str) -> DBCarrera:
+    def read_all_lead_rows(
+        self,
+        limit: int,
+        offset: int,
+        after_lead_id: int | None = None,
+        filters: LeadFilters | None = None,
+    ) -> list[LeadRow]:
         """
-        Lee una carrera de la base de datos por su nombre o la crea si no existe.
+        Lee una página de leads con su grafo como LeadRow, ordenados por lead_id, en una
+        sola consulta y sin crear entidades ORM.
 
         Args:
-            carrera_nombre (str): El nombre de la carrera a ser leída o creada.
+            limit (int): Número máximo de resultados a devolver.
+            offset (int): Número de resultados a saltar desde el inicio.
+            after_lead_id (int | None): Último lead_id de la página anterior. Default None
+            filters (LeadFilters | None): Filtros de la consulta (ver filter_leads). Default None
 
         Returns:
-            DBCarrera: El objeto DBCarrera leído o creado.
+            list[LeadRow]: Los leads de la página.
         """
-        db_carrera = self.db.execute(
-            select(DBCarrera).where(DBCarrera.nombre == carrera_nombre)
-        ).scalar()
-        if db_carrera is None:
-            db_carrera = DBCarrera(nombre=carrera_nombre)
-            self.db.add(db_carrera)
-            self.db.commit()
-            self.db.refresh(db_carrera)
-        return db_carrera
+        page = filter_leads(select(DBLead.lead_id), filters, self.db.get_bind().dialect)
+        # Las filas se agrupan por lotes a medida que llegan, sin tener en memoria a la
+        # vez todas las filas planas de una página grande
+        stmt = lead_graph_rows_statement(
+            paginate(page, limit, offset, after_lead_id)
+        ).execution_options(yield_per=1000)
+        with replica_reads(self.db):
+            return group_lead_rows(self.db.execute(stmt))
 
 
-class MateriaRepository:
+class IdempotencyRepository:
     def __init__(self, db: Session) -> None:
         """
         Inicializa el repositorio con una sesión de base de datos.
@@ -112,26 +842,176 @@ class MateriaRepository:
         """
         self.db = db
 
-    def read_or_create_materia(self, materia_nombre: str, carrera_id: int) -> DBMateria:
+    def read_record(self, idempotency_key: str) -> DBIdempotencyKey | None:
+        """
+        Lee la respuesta guardada para una Idempotency-Key, por clave primaria.
+
+        Args:
+            idempotency_key (str): La clave.
+
+        Returns:
+            DBIdempotencyKey | None: El registro, o None si no existe.
+        """
+        return self.db.get(DBIdempotencyKey, idempotency_key)
+
+    def create_record(self, record: DBIdempotencyKey) -> None:
+        """
+        Agrega un registro a la sesión, sin confirmar: se guarda en la misma
+        transacción que el lead que responde. Una clave repetida falla con
+        IntegrityError al confirmar.
+
+        Args:
+            record (DBIdempotencyKey): El registro.
+        """
+        self.db.add(record)
+
+    def delete_record(self, record: DBIdempotencyKey) -> None:
+        """
+        Borra un registro y confirma la transacción.
+
+        Args:
+            record (DBIdempotencyKey): El registro.
+        """
+        self.db.delete(record)
+        self.db.commit()
+
+
+class CarreraRepository:
+    def __init__(
+        self, db: Session, cache: LRUCache[str] = catalog_cache.carreras
+    ) -> None:
+        """
+        Inicializa el repositorio con una sesión de base de datos.
+
+        Args:
+            db (Session): La sesión de la base de datos.
+            cache (LRUCache[str]): Cache de IDs de carreras por nombre. Default el del
+                catálogo compartido por el proceso.
+        """
+        self.db = db
+        self.cache = cache
+
+    def read_or_create_carrera_ids(
+        self, carrera_nombres: Iterable[str]
+    ) -> dict[str, int]:
+        """
+        Obtiene los IDs de un conjunto de carreras por nombre, creando las faltantes.
+
+        Primero se consulta el cache del catálogo; las carreras que no están se buscan
+        con una única consulta y las que no existen se insertan con insert_ignore_statement,
+        sin confirmar la transacción, de modo que dos requests que crean la misma carrera
+        a la vez no fallan. Los IDs nuevos entran al cache recién cuando quien llama
+        confirma la transacción.
+
+        Args:
+            carrera_nombres (Iterable[str]): Los nombres de las carreras a ser leídas o creadas.
+
+        Returns:
+            dict[str, int]: Los IDs de las carreras indexados por nombre.
+        """
+        nombres = set(carrera_nombres)
+        carrera_ids = self.cache.get_many(nombres)
+        faltantes = nombres - carrera_ids.keys()
+        if not faltantes:
+            return carrera_ids
+        existentes = dict(
+            self.db.execute(carrera_ids_statement(faltantes)).tuples().all()
+        )
+        self.cache.put_many(existentes.items())
+        carrera_ids.update(existentes)
+        nuevas = faltantes - existentes.keys()
+        if nuevas:
+            self.db.execute(
+                insert_ignore_statement(
+                    self.db.get_bind().dialect, DBCarrera.__table__, ["nombre"]
+                ),
+                [{"nombre": nombre} for nombre in nuevas],
+            )
+            # Lectura con lock: también ve las filas que otra transacción confirmó
+            # después del inicio de esta
+            creadas = dict(
+                self.db.execute(
+                    carrera_ids_statement(nuevas).with_for_update(read=True)
+                )
+                .tuples()
+                .all()
+            )
+            self.cache.put_after_commit(self.db, creadas.items())
+            carrera_ids.update(creadas)
+        return carrera_ids
+
+
+class MateriaRepository:
+    def __init__(
+        self,
+        db: Session,
+        cache: LRUCache[tuple[int, str]] = catalog_cache.materias,
+    ) -> None:
+        """
+        Inicializa el repositorio con una sesión de base de datos.
+
+        Args:
+            db (Session): La sesión de la base de datos.
+            cache (LRUCache[tuple[int, str]]): Cache de IDs de materias por
+                (carrera_id, nombre). Default el del catálogo compartido por el proceso.
+        """
+        self.db = db
+        self.cache = cache
+
+    def read_or_create_materia_ids(
+        self, materias: Iterable[tuple[int, str]]
+    ) -> dict[tuple[int, str], int]:
         """
-        Lee una materia de la base de datos por su nombre o la crea si no existe.
+        Obtiene los IDs de un conjunto de materias, creando las faltantes.
+
+        Las materias son únicas dentro de cada carrera, por lo que se identifican por el
+        par (carrera_id, nombre). Se resuelven como en read_or_create_carrera_ids:
+        cache, una única consulta para las que faltan e insert_ignore_statement para las
+        nuevas.
 
         Args:
-            materia_nombre (str): El nombre de la materia a ser leída o creada.
-            carrera_id (int): El ID de la carrera asociada a la materia.
+            materias (Iterable[tuple[int, str]]): Pares (carrera_id, nombre) de las materias.
 
         Returns:
-            DBMateria: El objeto DBMateria leído o creado.
+            dict[tuple[int, str], int]: Los IDs de las materias indexados por (carrera_id, nombre).
         """
-        db_materia = self.db.execute(
-            select(DBMateria).where(DBMateria.nombre == materia_nombre)
-        ).scalar()
-        if db_materia is None:
-            db_materia = DBMateria(nombre=materia_nombre, carrera_id=carrera_id)
-            self.db.add(db_materia)
-            self.db.commit()
-            self.db.refresh(db_materia)
-        return db_materia
+        claves = set(materias)
+        materia_ids = self.cache.get_many(claves)
+        faltantes = claves - materia_ids.keys()
+        if not faltantes:
+            return materia_ids
+        existentes = {
+            (carrera_id, nombre): materia_id
+            for carrera_id, nombre, materia_id in self.db.execute(
+                materia_ids_statement(faltantes)
+            )
+            if (carrera_id, nombre) in faltantes
+        }
+        self.cache.put_many(existentes.items())
+        materia_ids.update(existentes)
+        nuevas = faltantes - existentes.keys()
+        if nuevas:
+            self.db.execute(
+                insert_ignore_statement(
+                    self.db.get_bind().dialect,
+                    DBMateria.__table__,
+                    ["carrera_id", "nombre"],
+                ),
+                [
+                    {"carrera_id": carrera_id, "nombre": nombre}
+                    for carrera_id, nombre in nuevas
+                ],
+            )
+            creadas = {
+                (carrera_id, nombre): materia_id
+                for carrera_id, nombre, materia_id in self.db.execute(
+                    materia_ids_statement(nuevas).with_for_update(read=True)
+                )
+                if (carrera_id, nombre) in nuevas
+            }
+            self.cache.put_after_commit(self.db, creadas.items())
+            materia_ids.update(creadas)
+        return materia_ids
 
 
 class CursadoRepository:
@@ -159,6 +1039,17 @@ class CursadoRepository:
         self.db.refresh(db_cursado)
         return db_cursado
 
+    def bulk_insert_cursados(self, cursados: list[dict]) -> None:
+        """
+        Inserta un lote de cursados en una sola sentencia executemany, sin confirmar.
+        Se usa el INSERT de Core sobre la tabla para evitar el armado de objetos del ORM.
+
+        Args:
+            cursados (list[dict]): Los valores de cada cursado, por nombre de columna.
+        """
+        if cursados:
+            self.db.execute(insert(DBCursado.__table__), cursados)
+
     def read_cursado(self) -> list[DBCursado]:
         """
         Lee todos los cursados de la base de datos.
@@ -197,6 +1088,17 @@ class InscripcionMateriaRepository:
         self.db.refresh(db_inscripcion)
         return db_inscripcion
 
+    def bulk_insert_inscripciones(self, inscripciones: list[dict]) -> None:
+        """
+        Inserta un lote de inscripciones en una sola sentencia executemany, sin confirmar.
+        Se usa el INSERT de Core sobre la tabla para evitar el armado de objetos del ORM.
+
+        Args:
+            inscripciones (list[dict]): Los valores de cada inscripción, por nombre de columna.
+        """
+        if inscripciones:
+            self.db.execute(insert(DBInscripcionMateria.__table__), inscripciones)
+
     def read_inscripcion_materia(self) -> list[DBMateria]:
         """
         Lee todas las inscripciones de materias de la base de datos.
@@ -205,3 +1107,115 @@ class InscripcionMateriaRepository:
             list[DBMateria]: Lista de todos los objetos DBInscripcionMateria en la base de datos.
         """
         return self.db.execute(select(DBInscripcionMateria)).scalars().all()
+
+
+class StatsRepository:
+    def __init__(self, db: Session) -> None:
+        """
+        Inicializa el repositorio con una sesión de base de datos.
+
+        Args:
+            db (Session): La sesión de la base de datos.
+        """
+        self.db = db
+
+    def read_carrera_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por carrera (ver carrera_stats_statement).
+
+        Args:
+            summary (bool): Si se leen las tablas de resumen.
+
+        Returns:
+            list[Row]: Una fila por carrera, con las columnas de CarreraStats.
+        """
+        return self.db.execute(carrera_stats_statement(summary)).all()
+
+    def read_materia_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por materia (ver materia_stats_statement).
+
+        Args:
+            summary (bool): Si se lee la tabla de resumen.
+
+        Returns:
+            list[Row]: Una fila por materia, con las columnas de MateriaStats.
+        """
+        return self.db.execute(materia_stats_statement(summary)).all()
+
+    def read_year_stats(self, summary: bool) -> list[Row]:
+        """
+        Lee las estadísticas por año de cursado (ver year_stats_statement).
+
+        Args:
+            summary (bool): Si se leen las tablas de resumen.
+
+        Returns:
+            list[Row]: Una fila por año, con las columnas de YearStats.
+        """
+        return self.db.execute(year_stats_statement(summary)).all()
+
+    def increment_summary(
+        self,
+        cursados: Iterable[tuple[int, int]],
+        inscripciones: Iterable[tuple[int, int, int, int]],
+    ) -> None:
+        """
+        Suma a las tablas de resumen los cursados e inscripciones nuevos, sin confirmar
+        la transacción, para que el resumen se confirme o se descarte junto con ellos.
+
+        Args:
+            cursados (Iterable[tuple[int, int]]): Pares (carrera_id, año_cursado).
+            inscripciones (Iterable[tuple[int, int, int, int]]): Tuplas (carrera_id,
+                materia_id, año_cursado, veces_cursada).
+        """
+        dialect = self.db.get_bind().dialect
+        filas_cursados, filas_inscripciones = summary_increments(
+            cursados, inscripciones
+        )
+        if filas_cursados:
+            self.db.execute(
+                upsert_increment_statement(
+                    dialect,
+                    DBResumenCursados.__table__,
+                    ["carrera_id", "año_cursado"],
+                    ["cursados"],
+                ),
+                filas_cursados,
+            )
+        if filas_inscripciones:
+            self.db.execute(
+                upsert_increment_statement(
+                    dialect,
+                    DBResumenInscripciones.__table__,
+                    ["carrera_id", "materia_id", "año_cursado"],
+                    ["inscripciones", "veces_cursada_total"],
+                ),
+                filas_inscripciones,
+            )
+
+    def rebuild_summary(self) -> None:
+        """
+        Recalcula las tablas de resumen desde cursados e inscripciones, sin confirmar la
+        transacción. Sirve para activar STATS_SUMMARY sobre datos cargados sin él.
+        """
+        self.db.execute(delete(DBResumenInscripciones))
+        self.db.execute(delete(DBResumenCursados))
+        self.db.execute(
+            insert(DBResumenCursados).from_select(
+                ["carrera_id", "año_cursado", "cursados"],
+                select(cursado_counts(summary=False)),
+            )
+        )
+        self.db.execute(
+            insert(DBResumenInscripciones).from_select(
+                [
+                    "carrera_id",
+                    "materia_id",
+                    "año_cursado",
+                    "inscripciones",
+                    "veces_cursada_total",
+                ],
+                select(inscripcion_counts(summary=False)),
+            )
+        )
@@ -0,0 +1,306 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, TypeVar
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Engine, event
+from ..config import settings
+from ..db.pool import CHECKOUT_LATENCY_BUCKETS
+
+"""Instrumentación por request: un middleware ASGI mide el tiempo total de cada request y, mediante los eventos de SQLAlchemy, el tiempo en la base, las sentencias ejecutadas y las filas obtenidas, además del tiempo de serialización. Las métricas se agregan por ruta y se exportan en formato Prometheus en GET /metrics."""
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores, en segundos, del histograma de duración de requests
+REQUEST_DURATION_BUCKETS = CHECKOUT_LATENCY_BUCKETS
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class RequestStats:
+    """Tiempos y contadores del request en curso."""
+
+    def __init__(self) -> None:
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.serialization_seconds = 0.0
+
+
+# Las sentencias ejecutadas en el threadpool o en el greenlet de una AsyncSession
+# heredan el contexto del request y suman sobre el mismo RequestStats
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+class RouteMetrics:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.duration_buckets = [0] * (len(REQUEST_DURATION_BUCKETS) + 1)
+        self.duration_seconds = 0.0
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.serialization_seconds = 0.0
+        self.budget_exceeded = 0
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        """
+        Inicializa el registro de métricas por ruta vacío.
+        """
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str, int], RouteMetrics] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+        budget_exceeded: bool,
+    ) -> None:
+        """
+        Registra un request terminado.
+
+        Args:
+            method (str): El método HTTP.
+            route (str): La plantilla de la ruta, por ejemplo /leads/{lead_id}.
+            status (int): El código de estado de la respuesta.
+            seconds (float): El tiempo total del request.
+            stats (RequestStats): Los tiempos y contadores del request.
+            budget_exceeded (bool): Si el request superó su presupuesto de sentencias.
+        """
+        index = bisect.bisect_left(REQUEST_DURATION_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._routes.get((method, route, status))
+            if metrics is None:
+                metrics = self._routes[(method, route, status)] = RouteMetrics()
+            metrics.requests += 1
+            metrics.duration_buckets[index] += 1
+            metrics.duration_seconds += seconds
+            metrics.db_seconds += stats.db_seconds
+            metrics.statements += stats.statements
+            metrics.rows += stats.rows
+            metrics.serialization_seconds += stats.serialization_seconds
+            metrics.budget_exceeded += budget_exceeded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """
+        Exporta las métricas acumuladas en el formato de texto de Prometheus.
+
+        Returns:
+            str: Una familia de métricas por magnitud, con las etiquetas method, route
+                y status.
+        """
+        with self._lock:
+            routes = {
+                key: (
+                    metrics.requests,
+                    list(metrics.duration_buckets),
+                    metrics.duration_seconds,
+                    metrics.db_seconds,
+                    metrics.statements,
+                    metrics.rows,
+                    metrics.serialization_seconds,
+                    metrics.budget_exceeded,
+                )
+                for key, metrics in sorted(self._routes.items())
+            }
+        counters = (
+            ("http_requests_total", "Requests atendidos.", 0),
+            (
+                "http_request_db_seconds_total",
+                "Segundos ejecutando sentencias en la base.",
+                3,
+            ),
+            ("http_request_db_statements_total", "Sentencias ejecutadas.", 4),
+            ("http_request_db_rows_total", "Filas obtenidas o modificadas.", 5),
+            (
+                "http_request_serialization_seconds_total",
+                "Segundos serializando respuestas.",
+                6,
+            ),
+            (
+                "http_request_query_budget_exceeded_total",
+                "Requests que superaron su presupuesto de sentencias.",
+                7,
+            ),
+        )
+        lines = []
+        for name, description, position in counters:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for key, values in routes.items():
+                lines.append(f"{name}{{{labels(*key)}}} {values[position]}")
+
+        name = "http_request_duration_seconds"
+        lines.append(f"# HELP {name} Duración de los requests.")
+        lines.append(f"# TYPE {name} histogram")
+        for key, (requests, buckets, seconds, *_) in routes.items():
+            cumulative = 0
+            for bound, count in zip(REQUEST_DURATION_BUCKETS + ("+Inf",), buckets):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{{labels(*key)},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{name}_sum{{{labels(*key)}}} {seconds}")
+            lines.append(f"{name}_count{{{labels(*key)}}} {requests}")
+        return "\n".join(lines) + "\n"
+
+
+def labels(method: str, route: str, status: int) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}",status="{status}"'
+
+
+request_metrics = RequestMetrics()
+
+
+def query_budget(method: str, route: str) -> int:
+    """
+    Obtiene el presupuesto de sentencias de una ruta.
+
+    Args:
+        method (str): El método HTTP.
+        route (str): La plantilla de la ruta.
+
+    Returns:
+        int: La cantidad máxima de sentencias por request, o 0 si no tiene límite.
+    """
+    return settings.query_budgets.get(f"{method} {route}", settings.query_budget)
+
+
+def server_timing(seconds: float, stats: RequestStats) -> str:
+    """
+    Arma el header Server-Timing de un request.
+
+    Args:
+        seconds (float): El tiempo total hasta enviar los headers.
+        stats (RequestStats): Los tiempos y contadores del request.
+
+    Returns:
+        str: Las duraciones total, db y serialize, en milisegundos.
+    """
+    return (
+        f"total;dur={seconds * 1000:.3f}, "
+        f'db;dur={stats.db_seconds * 1000:.3f};desc="{stats.statements} queries", '
+        f"serialize;dur={stats.serialization_seconds * 1000:.3f}"
+    )
+
+
+class RequestMetricsMiddleware:
+    """Middleware ASGI que mide cada request HTTP y lo registra en request_metrics."""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing:
+                    header = server_timing(time.perf_counter() - start, stats)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            # El router de FastAPI deja la ruta resuelta en el scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            budget = query_budget(method, route)
+            exceeded = bool(budget) and stats.statements > budget
+            if exceeded:
+                logger.warning(
+                    "%s %s ran %d statements, over its budget of %d (N+1?).",
+                    method,
+                    route,
+                    stats.statements,
+                    budget,
+                )
+            seconds = time.perf_counter() - start
+            request_metrics.observe(method, route, status, seconds, stats, exceeded)
+            logger.debug(
+                "%s %s %d in %.1f ms (%d statements)",
+                method,
+                route,
+                status,
+                seconds * 1000,
+                stats.statements,
+            )
+
+
+def measure_serialization(function: F) -> F:
+    """
+    Suma el tiempo de cada llamada a la función a la serialización del request en curso.
+
+    Args:
+        function (F): La función que serializa.
+
+    Returns:
+        F: La función medida.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stats = current_request.get()
+        if stats is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.serialization_seconds += time.perf_counter() - start
+
+    return wrapper
+
+
+class InstrumentedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse que mide la codificación de las respuestas armadas por FastAPI."""
+
+    render = measure_serialization(ORJSONResponse.render)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info.setdefault("request_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    starts = conn.info.get("request_metrics_start")
+    if stats is None or not starts:
+        return
+    stats.db_seconds += time.perf_counter() - starts.pop()
+    stats.statements += 1
+    # Los drivers de MySQL informan las filas de un SELECT; sqlite3 devuelve -1
+    if cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
@@ -0,0 +1,255 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..db.models import DBCursado, DBInscripcionMateria, DBLead
+
+"""Cache de las respuestas JSON de GET /leads/{lead_id}. Guarda los bytes ya serializados detrás de una interfaz de backend (en memoria o compatible con Redis) y se invalida cuando se confirma una transacción que escribió un lead, sus cursados o sus inscripciones."""
+
+PENDING_KEY = "lead_response_cache_pending"
+
+
+class CacheBackend(ABC):
+    """Interfaz de almacenamiento clave-valor con vencimiento del cache de respuestas."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        Obtiene un valor si existe y no venció.
+
+        Args:
+            key (str): La clave.
+
+        Returns:
+            bytes | None: El valor guardado, o None.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Guarda un valor que vence después de ttl segundos.
+
+        Args:
+            key (str): La clave.
+            value (bytes): El valor.
+            ttl (float): Segundos hasta el vencimiento.
+        """
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """
+        Borra varias claves; las que no existen se ignoran.
+
+        Args:
+            keys (Iterable[str]): Las claves a borrar.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Borra todas las claves del cache."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int) -> None:
+        """
+        Inicializa un backend en memoria del proceso, con vencimiento por clave y
+        tamaño acotado (LRU).
+
+        Args:
+            maxsize (int): Cantidad máxima de entradas.
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client: Any, prefix: str = "leads:") -> None:
+        """
+        Inicializa un backend sobre un cliente compatible con redis-py (get, set con
+        px, delete y scan_iter), compartido por todos los procesos de la aplicación.
+
+        Args:
+            client (Any): El cliente de Redis.
+            prefix (str): Prefijo de las claves de este cache. Default "leads:"
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class LeadResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        """
+        Inicializa el cache de respuestas de leads.
+
+        Args:
+            backend (CacheBackend): Dónde se guardan las respuestas.
+            ttl (float): Segundos que se conserva cada respuesta. Acota además el tiempo
+                que puede sobrevivir una respuesta guardada por una lectura concurrente
+                con la escritura que la invalidó.
+        """
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, lead_id: int) -> bytes | None:
+        return self.backend.get(str(lead_id))
+
+    def set(self, lead_id: int, body: bytes) -> None:
+        self.backend.set(str(lead_id), body, self.ttl)
+
+    def invalidate(self, lead_ids: Iterable[int]) -> None:
+        self.backend.delete(str(lead_id) for lead_id in lead_ids)
+
+    def invalidate_after_commit(self, db: Session, lead_ids: Iterable[int]) -> None:
+        """
+        Agenda la invalidación de leads para cuando la transacción de la sesión se
+        confirme. Las escrituras del ORM se agendan solas al hacer flush; las sentencias
+        Core que modifiquen leads existentes tienen que llamarlo.
+
+        Args:
+            db (Session): La sesión que escribió los leads.
+            lead_ids (Iterable[int]): Los IDs de los leads escritos.
+        """
+        db.info.setdefault(PENDING_KEY, set()).update(lead_ids)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def create_backend() -> CacheBackend:
+    """
+    Crea el backend configurado en LEAD_CACHE_BACKEND ("memory" o "redis").
+
+    Returns:
+        CacheBackend: El backend del cache de respuestas.
+
+    Raises:
+        ValueError: Si el backend no es válido o falta REDIS_URL.
+    """
+    if settings.lead_cache_backend == "memory":
+        return MemoryCacheBackend(settings.lead_cache_size)
+    if settings.lead_cache_backend == "redis":
+        if not settings.redis_url:
+            raise ValueError("REDIS_URL is required for the redis lead cache backend.")
+        # Dependencia opcional, sólo necesaria con este backend
+        import redis
+
+        return RedisCacheBackend(redis.Redis.from_url(settings.redis_url))
+    raise ValueError(f"Unknown lead cache backend: {settings.lead_cache_backend}")
+
+
+def etag(body: bytes) -> str:
+    """
+    Calcula el ETag fuerte de una respuesta.
+
+    Args:
+        body (bytes): El cuerpo de la respuesta.
+
+    Returns:
+        str: El ETag, entre comillas.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def conditional_json_response(request: Request, body: bytes) -> Response:
+    """
+    Arma la respuesta de un JSON ya serializado con su ETag, o un 304 sin cuerpo si
+    coincide con el If-None-Match de la solicitud.
+
+    Args:
+        request (Request): La solicitud.
+        body (bytes): El JSON serializado.
+
+    Returns:
+        Response: La respuesta 200 o 304.
+    """
+    tag = etag(body)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+        # La comparación de If-None-Match es débil: W/"x" coincide con "x"
+        if "*" in candidates or tag in {c.removeprefix("W/") for c in candidates}:
+            return Response(status_code=304, headers={"ETag": tag})
+    return Response(body, media_type="application/json", headers={"ETag": tag})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_leads(db: Session, flush_context) -> None:
+    # Un lead nuevo no puede estar en el cache, pero sí el lead de un cursado nuevo
+    lead_ids = {
+        instance.lead_id
+        for instance in (*db.dirty, *db.deleted)
+        if isinstance(instance, DBLead)
+    }
+    lead_ids.update(
+        instance.lead_id
+        for instance in (*db.new, *db.dirty, *db.deleted)
+        if isinstance(instance, (DBCursado, DBInscripcionMateria))
+    )
+    if lead_ids:
+        lead_response_cache.invalidate_after_commit(db, lead_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_leads(db: Session) -> None:
+    lead_ids = db.info.pop(PENDING_KEY, None)
+    if lead_ids:
+        lead_response_cache.invalidate(lead_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_leads(db: Session) -> None:
+    db.info.pop(PENDING_KEY, None)
+
+
+lead_response_cache = LeadResponseCache(create_backend(), settings.lead_cache_ttl)
@@ -0,0 +1,79 @@
+from typing import List, Sequence
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+from ..db.models import DBLead
+from ..db.rows import LeadRow
+from ..db.schemas import Lead
+from .request_metrics import measure_serialization
+
+"""Serialización de leads a JSON sin pasar por jsonable_encoder: el grafo ORM se valida una sola vez contra el schema Lead y pydantic lo escribe directamente a bytes."""
+
+LEAD_ADAPTER = TypeAdapter(Lead)
+LEAD_LIST_ADAPTER = TypeAdapter(List[Lead])
+
+
+@measure_serialization
+def serialize_lead(db_lead: DBLead) -> bytes:
+    """
+    Serializa un lead como JSON según el schema Lead, igual que la respuesta de FastAPI.
+
+    Args:
+        db_lead (DBLead): El lead con su grafo cargado.
+
+    Returns:
+        bytes: El JSON del lead.
+    """
+    return LEAD_ADAPTER.dump_json(
+        LEAD_ADAPTER.validate_python(db_lead, from_attributes=True)
+    )
+
+
+@measure_serialization
+def serialize_leads(db_leads: Sequence[DBLead]) -> bytes:
+    """
+    Serializa una lista de leads como un array JSON según el schema Lead.
+
+    Args:
+        db_leads (Sequence[DBLead]): Los leads con su grafo cargado.
+
+    Returns:
+        bytes: El JSON de la lista.
+    """
+    return LEAD_LIST_ADAPTER.dump_json(
+        LEAD_LIST_ADAPTER.validate_python(db_leads, from_attributes=True)
+    )
+
+
+@measure_serialization
+def serialize_lead_summaries(rows: Sequence[Row]) -> bytes:
+    """
+    Serializa filas de la vista resumida como un array JSON según el schema LeadSummary.
+
+    Las filas ya tienen exactamente las columnas del schema, por lo que se codifican
+    con orjson sin crear modelos.
+
+    Args:
+        rows (Sequence[Row]): Filas con las columnas de LEAD_SUMMARY_COLUMNS.
+
+    Returns:
+        bytes: El JSON de la lista.
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+@measure_serialization
+def serialize_lead_rows(leads: Sequence[LeadRow]) -> bytes:
+    """
+    Serializa una lista de LeadRow como un array JSON según el schema Lead.
+
+    Los LeadRow ya tienen los campos y tipos del schema, por lo que se codifican con
+    orjson sin validarlos con pydantic.
+
+    Args:
+        leads (Sequence[LeadRow]): Los leads leídos con read_all_lead_rows.
+
+    Returns:
+        bytes: El JSON de la lista, igual al de serialize_leads.
+    """
+    return orjson.dumps(leads)
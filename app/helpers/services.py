@@ -1,129 +1,669 @@
 from .repositories import (
     LeadRepository,
+    LeadRowRepository,
     CarreraRepository,
     InscripcionMateriaRepository,
     CursadoRepository,
+    IdempotencyRepository,
     MateriaRepository,
+    StatsRepository,
+    normalize_email,
 )
+from ..config import settings
+from .catalog_cache import LRUCache
+from .response_cache import LeadResponseCache, lead_response_cache
+from .serialization import serialize_lead
+from .bulk import InvalidLine, format_validation_error
+from .export import encode_partitions
+from .idempotency import build_idempotency_record, is_expired, request_fingerprint
+from .pagination import decode_cursor, encode_cursor
+from typing import Any, Iterator
+import re
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from ..db.models import DBCursado, DBInscripcionMateria, DBLead
-from ..db.schemas import Lead, LeadCreate, InscripcionMateriaCreate, CursadoCreate
+from ..db.models import (
+    DBCarrera,
+    DBCursado,
+    DBIdempotencyKey,
+    DBInscripcionMateria,
+    DBLead,
+    DBMateria,
+)
+from ..db.rows import LeadRow
+from ..db.schemas import (
+    BulkLeadResult,
+    LeadCreate,
+    CursadoCreate,
+    DuplicateLeadException,
+    IdempotencyKeyReuseException,
+    LeadFilters,
+    NotFoundException,
+)
 from fastapi import Query
 
+# Los mensajes de integridad de MySQL, PostgreSQL y SQLite nombran la tabla del índice
+# único o la tabla a la que apunta la clave foránea que falló
+CATALOG_CONFLICT = re.compile(
+    rf"\b({DBCarrera.__tablename__}|{DBMateria.__tablename__})\b"
+)
+
 
 class LeadService:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self, db: Session, response_cache: LeadResponseCache = lead_response_cache
+    ) -> None:
         """
         Inicializa el servicio con los repositorios necesarios.
 
         Args:
             db (Session): La sesión de la base de datos.
+            response_cache (LeadResponseCache): Cache de las respuestas de read_lead_json.
+                Default el cache configurado en settings.
         """
+        self.db = db
+        self.response_cache = response_cache
         self.lead_repository = LeadRepository(db)
+        self.lead_row_repository = LeadRowRepository(db)
         self.carrera_repository = CarreraRepository(db)
         self.materia_repository = MateriaRepository(db)
         self.cursado_repository = CursadoRepository(db)
         self.inscripcion_materia_repository = InscripcionMateriaRepository(db)
+        self.stats_repository = StatsRepository(db)
+        self.idempotency_repository = IdempotencyRepository(db)
 
-    def create_lead(self, lead: LeadCreate) -> DBLead:
+    def create_lead(
+        self,
+        lead: LeadCreate,
+        idempotency_key: str | None = None,
+        request_hash: str | None = None,
+    ) -> DBLead:
         """
-        Crea un nuevo lead en la base de datos y agrega sus cursados e inscripciones si existen.
+        Crea un nuevo lead en la base de datos junto con sus cursados e inscripciones.
+
+        Toda la creación ocurre en una única transacción: las carreras y materias se
+        resuelven con el cache del catálogo y una consulta por tabla para las que no
+        están, las faltantes se insertan en bloque y el lead, sus cursados e
+        inscripciones se insertan en un solo flush. Si algo falla no queda ningún
+        registro parcial. Con STATS_SUMMARY, las tablas de resumen se actualizan en la
+        misma transacción.
+
+        Si la transacción falla por integridad, se quitan del cache las claves usadas.
+        Sólo se reintenta, una vez, si el error es del catálogo (ver
+        is_catalog_conflict), por ejemplo porque un insert concurrente creó la misma
+        carrera o porque el cache tenía un ID que ya no existe; cualquier otro, como una
+        Idempotency-Key repetida, se propaga sin reintentar.
 
         Args:
             lead (LeadCreate): Los datos del lead a ser creado.
+            idempotency_key (str | None): Si se indica, la respuesta se guarda con esta
+                clave en la misma transacción (ver create_lead_idempotent). Default None
+            request_hash (str | None): La huella de la solicitud, junto con
+                idempotency_key. Default None
 
         Returns:
             DBLead: El objeto DBLead creado y guardado en la base de datos.
+
+        Raises:
+            DuplicateLeadException: Si LEAD_DEDUP está activado y el lead ya existe.
         """
-        db_lead = self.lead_repository.create_db_lead(
-            DBLead(
-                nombre=lead.nombre,
-                apellido=lead.apellido,
-                email=lead.email,
-                direccion=lead.direccion,
-                tel=lead.tel,
+        duplicate_id = self.find_duplicate_ids([lead])[0]
+        if duplicate_id is not None:
+            raise DuplicateLeadException(
+                f"Lead duplicates lead {duplicate_id}.", duplicate_id
             )
+        for intento in range(2):
+            try:
+                carrera_ids, materia_ids = self.resolve_catalog(lead)
+                db_lead = self.build_lead(lead, carrera_ids, materia_ids)
+                self.db.add(db_lead)
+                if settings.stats_summary:
+                    self.stats_repository.increment_summary(
+                        *self.summary_keys(db_lead.cursados)
+                    )
+                if idempotency_key is not None:
+                    self.db.flush()
+                    self.idempotency_repository.create_record(
+                        build_idempotency_record(
+                            idempotency_key, request_hash, db_lead.lead_id
+                        )
+                    )
+                self.db.commit()
+            except IntegrityError as error:
+                self.db.rollback()
+                self.invalidate_catalog(
+                    lead, self.carrera_repository.cache, self.materia_repository.cache
+                )
+                if intento or not self.is_catalog_conflict(error):
+                    raise
+            except Exception:
+                self.db.rollback()
+                raise
+            else:
+                return db_lead
+
+    def create_lead_idempotent(
+        self, lead: LeadCreate, idempotency_key: str
+    ) -> tuple[DBIdempotencyKey, bool]:
+        """
+        Crea un lead con un header Idempotency-Key: si la clave ya tiene una respuesta
+        guardada (y vigente) se devuelve esa respuesta sin volver a escribir; si no, se
+        crea el lead y su respuesta se guarda en la misma transacción. Si un reintento
+        concurrente con la misma clave confirma primero, el insert de la clave falla y
+        se devuelve la respuesta de ese reintento.
+
+        Args:
+            lead (LeadCreate): Los datos del lead a ser creado.
+            idempotency_key (str): El header Idempotency-Key.
+
+        Returns:
+            tuple[DBIdempotencyKey, bool]: La respuesta guardada y si es una repetición.
+
+        Raises:
+            IdempotencyKeyReuseException: Si la clave ya se usó con otro cuerpo.
+            DuplicateLeadException: Si LEAD_DEDUP está activado y el lead ya existe.
+        """
+        request_hash = request_fingerprint(lead)
+        record = self.read_idempotency_record(idempotency_key, request_hash)
+        if record is not None:
+            return record, True
+        try:
+            self.create_lead(lead, idempotency_key, request_hash)
+        except IntegrityError:
+            record = self.read_idempotency_record(idempotency_key, request_hash)
+            if record is None:
+                raise
+            return record, True
+        return self.idempotency_repository.read_record(idempotency_key), False
+
+    def read_idempotency_record(
+        self, idempotency_key: str, request_hash: str
+    ) -> DBIdempotencyKey | None:
+        """
+        Lee la respuesta guardada de una Idempotency-Key. Un registro vencido se borra y
+        se trata como inexistente.
+
+        Args:
+            idempotency_key (str): La clave.
+            request_hash (str): La huella de la solicitud actual.
+
+        Returns:
+            DBIdempotencyKey | None: El registro vigente, o None.
+
+        Raises:
+            IdempotencyKeyReuseException: Si la clave se guardó con otra huella.
+        """
+        record = self.idempotency_repository.read_record(idempotency_key)
+        if record is None:
+            return None
+        if is_expired(record, settings.idempotency_ttl):
+            self.idempotency_repository.delete_record(record)
+            return None
+        if record.request_hash != request_hash:
+            raise IdempotencyKeyReuseException(
+                "Idempotency-Key was already used with a different request body."
+            )
+        return record
+
+    def find_duplicate_ids(self, leads: list[LeadCreate]) -> list[int | None]:
+        """
+        Busca, según LEAD_DEDUP, los leads existentes que duplican a cada lead.
+
+        Args:
+            leads (list[LeadCreate]): Los leads a crear.
+
+        Returns:
+            list[int | None]: Para cada lead, el lead_id del primer lead existente con
+                su email normalizado (o su teléfono, con "email_tel"), o None.
+        """
+        emails, tels = self.dedup_keys(leads, settings.lead_dedup)
+        rows = self.lead_repository.find_duplicates(emails, tels)
+        return self.match_duplicates(leads, rows, settings.lead_dedup)
+
+    @staticmethod
+    def dedup_keys(leads: list[LeadCreate], policy: str) -> tuple[set[str], set[str]]:
+        """
+        Obtiene los emails normalizados y teléfonos a buscar según la política.
+
+        Args:
+            leads (list[LeadCreate]): Los leads a crear.
+            policy (str): "off", "email" o "email_tel".
+
+        Returns:
+            tuple[set[str], set[str]]: Los emails y los teléfonos.
+        """
+        if policy == "off":
+            return set(), set()
+        emails = {normalize_email(lead.email) for lead in leads if lead.email}
+        tels = set()
+        if policy == "email_tel":
+            tels = {str(lead.tel) for lead in leads if lead.tel is not None}
+        return emails, tels
+
+    @staticmethod
+    def match_duplicates(
+        leads: list[LeadCreate], rows: list[Row], policy: str
+    ) -> list[int | None]:
+        """
+        Asocia cada lead con el primer lead existente que lo duplica.
+
+        Args:
+            leads (list[LeadCreate]): Los leads a crear.
+            rows (list[Row]): Las filas de LeadRepository.find_duplicates.
+            policy (str): "off", "email" o "email_tel".
+
+        Returns:
+            list[int | None]: Para cada lead, el lead_id duplicado o None.
+        """
+        por_email: dict[str, int] = {}
+        por_tel: dict[str, int] = {}
+        for lead_id, email, tel in rows:
+            if email is not None:
+                por_email.setdefault(email, lead_id)
+            if tel is not None:
+                por_tel.setdefault(str(tel), lead_id)
+        duplicados = []
+        for lead in leads:
+            duplicate_id = None
+            if lead.email:
+                duplicate_id = por_email.get(normalize_email(lead.email))
+            if duplicate_id is None and policy == "email_tel" and lead.tel is not None:
+                duplicate_id = por_tel.get(str(lead.tel))
+            duplicados.append(duplicate_id)
+        return duplicados
+
+    def resolve_catalog(
+        self, lead: LeadCreate
+    ) -> tuple[dict[str, int], dict[tuple[int, str], int]]:
+        """
+        Obtiene los IDs de las carreras y materias de un lead, creando las faltantes sin
+        confirmar la transacción.
+
+        Args:
+            lead (LeadCreate): Los datos del lead.
+
+        Returns:
+            tuple[dict[str, int], dict[tuple[int, str], int]]: Los IDs de carreras por
+                nombre y de materias por (carrera_id, nombre).
+        """
+        carrera_ids = self.carrera_repository.read_or_create_carrera_ids(
+            cursado.carrera.nombre for cursado in lead.cursados
         )
-        # Agregar cursados con carrera y materias
-        if len(lead.cursados) > 0:
-            for cursado in lead.cursados:
-                self.add_cursado(db_lead.lead_id, cursado)
-        return db_lead
+        materia_ids = self.materia_repository.read_or_create_materia_ids(
+            (carrera_ids[cursado.carrera.nombre], inscripcion.materia.nombre)
+            for cursado in lead.cursados
+            for inscripcion in cursado.inscripciones
+        )
+        return carrera_ids, materia_ids
 
-    def add_cursado(self, lead_id: int, cursado: CursadoCreate) -> DBCursado:
+    @staticmethod
+    def is_catalog_conflict(error: IntegrityError) -> bool:
         """
-        Agrega un nuevo cursado para un lead específico.
+        Indica si un error de integridad viene del catálogo: un índice único de
+        carreras o materias, o una clave foránea hacia ellas.
 
         Args:
-            lead_id (int): El ID del lead.
-            cursado (CursadoCreate): Los datos del cursado a ser agregado.
+            error (IntegrityError): El error.
 
         Returns:
-            DBCursado: El objeto DBCursado creado y guardado en la base de datos.
+            bool: True si reintentar con el catálogo releído puede resolverlo.
+        """
+        return CATALOG_CONFLICT.search(str(error.orig)) is not None
+
+    @staticmethod
+    def invalidate_catalog(
+        lead: LeadCreate,
+        carreras: LRUCache[str],
+        materias: LRUCache[tuple[int, str]],
+    ) -> None:
+        """
+        Quita de los caches del catálogo las carreras y materias de un lead.
+
+        Args:
+            lead (LeadCreate): Los datos del lead.
+            carreras (LRUCache[str]): Cache de IDs de carreras por nombre.
+            materias (LRUCache[tuple[int, str]]): Cache de IDs de materias por (carrera_id, nombre).
         """
-        db_carrera = self.carrera_repository.read_or_create_carrera(
-            cursado.carrera.nombre
+        nombres = {cursado.carrera.nombre for cursado in lead.cursados}
+        carrera_ids = carreras.get_many(nombres, record_stats=False)
+        carreras.invalidate(nombres)
+        materias.invalidate(
+            (carrera_ids[cursado.carrera.nombre], inscripcion.materia.nombre)
+            for cursado in lead.cursados
+            if cursado.carrera.nombre in carrera_ids
+            for inscripcion in cursado.inscripciones
         )
-        db_cursado = self.cursado_repository.create_cursado(
-            DBCursado(
-                año_cursado=cursado.año_cursado,
-                carrera_id=db_carrera.carrera_id,
-                lead_id=lead_id,
-                universidad=cursado.universidad,
-            )
+
+    @classmethod
+    def build_lead(
+        cls,
+        lead: LeadCreate,
+        carrera_ids: dict[str, int],
+        materia_ids: dict[tuple[int, str], int],
+    ) -> DBLead:
+        """
+        Arma el grafo DBLead -> DBCursado -> DBInscripcionMateria de un lead a partir de
+        los IDs del catálogo ya resueltos.
+
+        Args:
+            lead (LeadCreate): Los datos del lead a ser armado.
+            carrera_ids (dict[str, int]): IDs de carreras por nombre.
+            materia_ids (dict[tuple[int, str], int]): IDs de materias por (carrera_id, nombre).
+
+        Returns:
+            DBLead: El objeto DBLead pendiente de ser agregado a la sesión.
+        """
+        return DBLead(
+            nombre=lead.nombre,
+            apellido=lead.apellido,
+            email=lead.email,
+            direccion=lead.direccion,
+            tel=lead.tel,
+            cursados=[
+                cls.build_cursado(
+                    cursado, carrera_ids[cursado.carrera.nombre], materia_ids
+                )
+                for cursado in lead.cursados
+            ],
         )
-        for inscripcion in cursado.inscripciones:
-            db_materia = self.materia_repository.read_or_create_materia(
-                inscripcion.materia.nombre, db_carrera.carrera_id
-            )
-            self.add_inscripcion_materia(
-                lead_id,
-                db_materia.materia_id,
-                db_carrera.carrera_id,
-                db_cursado.año_cursado,
-                inscripcion,
-            )
-        return db_cursado
 
-    def add_inscripcion_materia(
-        self,
-        lead_id: int,
-        materia_id: int,
+    @staticmethod
+    def build_cursado(
+        cursado: CursadoCreate,
         carrera_id: int,
-        año_cursado: int,
-        inscripcion: InscripcionMateriaCreate,
-    ) -> DBInscripcionMateria:
+        materia_ids: dict[tuple[int, str], int],
+    ) -> DBCursado:
+        """
+        Arma un cursado con sus inscripciones a partir de los IDs del catálogo ya resueltos.
+
+        Args:
+            cursado (CursadoCreate): Los datos del cursado.
+            carrera_id (int): El ID de la carrera del cursado.
+            materia_ids (dict[tuple[int, str], int]): IDs de materias por (carrera_id, nombre).
+
+        Returns:
+            DBCursado: El objeto DBCursado pendiente de ser insertado.
+        """
+        return DBCursado(
+            año_cursado=cursado.año_cursado,
+            carrera_id=carrera_id,
+            universidad=cursado.universidad,
+            inscripciones=[
+                DBInscripcionMateria(
+                    materia_id=materia_ids[(carrera_id, inscripcion.materia.nombre)],
+                    veces_cursada=inscripcion.veces_cursada,
+                )
+                for inscripcion in cursado.inscripciones
+            ],
+        )
+
+    @staticmethod
+    def summary_keys(
+        cursados: list[DBCursado],
+    ) -> tuple[list[tuple[int, int]], list[tuple[int, int, int, int]]]:
         """
-        Agrega una nueva inscripción de materia para un lead específico.
+        Obtiene las claves de las tablas de resumen de los cursados armados por
+        build_cursado.
 
         Args:
-            lead_id (int): El ID del lead.
-            materia_id (int): El ID de la materia.
-            carrera_id (int): El ID de la carrera.
-            año_cursado (int): El año de cursado.
-            inscripcion (InscripcionMateriaCreate): Los datos de la inscripción a ser agregada.
+            cursados (list[DBCursado]): Los cursados, con sus inscripciones.
 
         Returns:
-            DBInscripcionMateria: El objeto DBInscripcionMateria creado y guardado en la base de datos.
+            tuple[list[tuple[int, int]], list[tuple[int, int, int, int]]]: Los pares
+                (carrera_id, año_cursado) y las tuplas (carrera_id, materia_id,
+                año_cursado, veces_cursada), para StatsRepository.increment_summary.
         """
-        return self.inscripcion_materia_repository.create_inscripcion_materia(
-            DBInscripcionMateria(
-                año_cursado=año_cursado,
-                carrera_id=carrera_id,
-                lead_id=lead_id,
-                materia_id=materia_id,
-                veces_cursada=inscripcion.veces_cursada,
+        return (
+            [(cursado.carrera_id, cursado.año_cursado) for cursado in cursados],
+            [
+                (
+                    cursado.carrera_id,
+                    inscripcion.materia_id,
+                    cursado.año_cursado,
+                    inscripcion.veces_cursada,
+                )
+                for cursado in cursados
+                for inscripcion in cursado.inscripciones
+            ],
+        )
+
+    def create_leads_bulk(
+        self, items: list[Any], batch_size: int
+    ) -> list[BulkLeadResult]:
+        """
+        Crea un lote grande de leads, validando e insertando por bloques.
+
+        Cada bloque de batch_size ítems se valida, descarta los duplicados según
+        LEAD_DEDUP, resuelve las carreras y materias con
+        el cache del catálogo, inserta leads, cursados e inscripciones con
+        sentencias por lote y se confirma en su propia transacción. Si el insert de un
+        bloque falla, se reintentan sus leads de a uno para aislar los errores.
+
+        Args:
+            items (list[Any]): Los ítems sin validar, por ejemplo de parse_bulk_body.
+            batch_size (int): Cantidad de ítems por bloque.
+
+        Returns:
+            list[BulkLeadResult]: Un resultado por ítem, con su lead_id o su error.
+        """
+        results = []
+
+        for start in range(0, len(items), batch_size):
+            valid = []
+            for index, item in enumerate(items[start : start + batch_size], start):
+                if isinstance(item, InvalidLine):
+                    results.append(BulkLeadResult(index=index, error=item.error))
+                    continue
+                try:
+                    valid.append((index, LeadCreate.model_validate(item)))
+                except ValidationError as e:
+                    error = format_validation_error(e)
+                    results.append(BulkLeadResult(index=index, error=error))
+            valid = self.reject_duplicates(valid, results)
+            if not valid:
+                continue
+
+            try:
+                lead_ids = self.insert_leads_batch([lead for _, lead in valid])
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                results.extend(self.create_leads_one_by_one(valid))
+                continue
+            results.extend(
+                BulkLeadResult(index=index, lead_id=lead_id)
+                for (index, _), lead_id in zip(valid, lead_ids)
             )
+
+        results.sort(key=lambda result: result.index)
+        return results
+
+    def reject_duplicates(
+        self, leads: list[tuple[int, LeadCreate]], results: list[BulkLeadResult]
+    ) -> list[tuple[int, LeadCreate]]:
+        """
+        Descarta, según LEAD_DEDUP, los leads de un bloque que duplican a un lead
+        existente o a uno anterior del mismo bloque, registrando su error.
+
+        Args:
+            leads (list[tuple[int, LeadCreate]]): Los leads validados con su índice en la carga.
+            results (list[BulkLeadResult]): Donde se agregan los errores.
+
+        Returns:
+            list[tuple[int, LeadCreate]]: Los leads no duplicados.
+        """
+        policy = settings.lead_dedup
+        if policy == "off":
+            return leads
+        duplicate_ids = self.find_duplicate_ids([lead for _, lead in leads])
+        vistos: dict[tuple[str, str], int] = {}
+        unicos = []
+        for (index, lead), duplicate_id in zip(leads, duplicate_ids):
+            claves = self.dedup_keys([lead], policy)
+            claves = [("email", email) for email in claves[0]] + [
+                ("tel", tel) for tel in claves[1]
+            ]
+            if duplicate_id is not None:
+                error = f"Lead duplicates lead {duplicate_id}."
+            elif any(clave in vistos for clave in claves):
+                anterior = next(vistos[clave] for clave in claves if clave in vistos)
+                error = f"Lead duplicates item {anterior}."
+            else:
+                vistos.update((clave, index) for clave in claves)
+                unicos.append((index, lead))
+                continue
+            results.append(BulkLeadResult(index=index, error=error))
+        return unicos
+
+    def insert_leads_batch(self, leads: list[LeadCreate]) -> list[int]:
+        """
+        Inserta un bloque de leads con sus cursados e inscripciones, sin confirmar.
+
+        Args:
+            leads (list[LeadCreate]): Los leads ya validados.
+
+        Returns:
+            list[int]: Los lead_id asignados, en el mismo orden que leads.
+        """
+        carrera_ids = self.carrera_repository.read_or_create_carrera_ids(
+            cursado.carrera.nombre for lead in leads for cursado in lead.cursados
+        )
+        materia_ids = self.materia_repository.read_or_create_materia_ids(
+            (carrera_ids[cursado.carrera.nombre], inscripcion.materia.nombre)
+            for lead in leads
+            for cursado in lead.cursados
+            for inscripcion in cursado.inscripciones
         )
 
-    def read_all_leads(self, limit: Query, offset: Query) -> list[DBLead]:
+        db_leads = self.lead_repository.bulk_create_db_leads(
+            [
+                DBLead(
+                    nombre=lead.nombre,
+                    apellido=lead.apellido,
+                    email=lead.email,
+                    direccion=lead.direccion,
+                    tel=lead.tel,
+                )
+                for lead in leads
+            ]
+        )
+        lead_ids = [db_lead.lead_id for db_lead in db_leads]
+
+        cursados = []
+        inscripciones = []
+        for lead_id, lead in zip(lead_ids, leads):
+            for cursado in lead.cursados:
+                carrera_id = carrera_ids[cursado.carrera.nombre]
+                cursados.append(
+                    {
+                        "año_cursado": cursado.año_cursado,
+                        "carrera_id": carrera_id,
+                        "lead_id": lead_id,
+                        "universidad": cursado.universidad,
+                    }
+                )
+                inscripciones.extend(
+                    {
+                        "año_cursado": cursado.año_cursado,
+                        "carrera_id": carrera_id,
+                        "lead_id": lead_id,
+                        "materia_id": materia_ids[
+                            (carrera_id, inscripcion.materia.nombre)
+                        ],
+                        "veces_cursada": inscripcion.veces_cursada,
+                    }
+                    for inscripcion in cursado.inscripciones
+                )
+        self.cursado_repository.bulk_insert_cursados(cursados)
+        self.inscripcion_materia_repository.bulk_insert_inscripciones(inscripciones)
+        if settings.stats_summary:
+            self.stats_repository.increment_summary(
+                (
+                    (cursado["carrera_id"], cursado["año_cursado"])
+                    for cursado in cursados
+                ),
+                (
+                    (
+                        inscripcion["carrera_id"],
+                        inscripcion["materia_id"],
+                        inscripcion["año_cursado"],
+                        inscripcion["veces_cursada"],
+                    )
+                    for inscripcion in inscripciones
+                ),
+            )
+        return lead_ids
+
+    def create_leads_one_by_one(
+        self, leads: list[tuple[int, LeadCreate]]
+    ) -> list[BulkLeadResult]:
+        """
+        Crea leads de a uno, cada uno en su propia transacción, registrando los errores.
+
+        Args:
+            leads (list[tuple[int, LeadCreate]]): Los leads validados con su índice en la carga.
+
+        Returns:
+            list[BulkLeadResult]: Un resultado por lead, con su lead_id o su error.
+        """
+        results = []
+        for index, lead in leads:
+            try:
+                lead_id = self.create_lead(lead).lead_id
+            except Exception as e:
+                results.append(BulkLeadResult(index=index, error=str(e)))
+            else:
+                results.append(BulkLeadResult(index=index, lead_id=lead_id))
+        return results
+
+    def read_all_leads(
+        self,
+        limit: Query,
+        offset: Query,
+        cursor: str | None = None,
+        view: str = "full",
+        filters: LeadFilters | None = None,
+    ) -> tuple[list[DBLead] | list[LeadRow] | list[Row], str | None]:
         """
-        Lee todos los leads de la base de datos.
+        Lee una página de leads de la base de datos.
+
+        Args:
+            limit (Query): Número máximo de resultados a devolver.
+            offset (Query): Número de resultados a saltar desde el inicio.
+            cursor (str | None): Cursor opaco devuelto por la página anterior. Default None
+            view (str): "full" para los leads completos (DBLead, o LeadRow si
+                LEAD_READ_MODEL es "rows") o "summary" para las filas de la vista
+                resumida (LeadSummary). Default "full"
+            filters (LeadFilters | None): Filtros sobre los leads. El cursor sigue
+                siendo el último lead_id, por lo que sirve con los mismos filtros. Default None
 
         Returns:
-            list[DBLead]: Lista de todos los objetos DBLead en la base de datos.
+            tuple[list[DBLead] | list[LeadRow] | list[Row], str | None]: Los leads de
+                la página y el cursor de la página siguiente, o None si no hay más
+                resultados.
+
+        Raises:
+            NotFoundException: Si el cursor no es válido o se combina con offset.
         """
-        return self.lead_repository.read_all_db_leads(limit=limit, offset=offset)
+        after_lead_id = None
+        if cursor is not None:
+            if offset:
+                raise NotFoundException("Cursor and offset cannot be combined.")
+            after_lead_id = decode_cursor(cursor)
+        if view == "summary":
+            read_page = self.lead_repository.read_all_db_lead_summaries
+        elif settings.lead_read_model == "rows":
+            read_page = self.lead_row_repository.read_all_lead_rows
+        else:
+            read_page = self.lead_repository.read_all_db_leads
+        leads = read_page(
+            limit=limit, offset=offset, after_lead_id=after_lead_id, filters=filters
+        )
+        next_cursor = None
+        if leads and len(leads) == limit:
+            next_cursor = encode_cursor(leads[-1].lead_id)
+        return leads, next_cursor
 
     def read_lead(self, lead_id: int) -> DBLead:
         """
@@ -136,3 +676,82 @@ class LeadService:
             DBLead: El objeto DBLead con el ID especificado.
         """
         return self.lead_repository.read_db_lead(lead_id)
+
+    def read_lead_json(self, lead_id: int) -> bytes:
+        """
+        Lee un lead específico serializado como JSON, pasando por el cache de respuestas.
+
+        Args:
+            lead_id (int): El ID del lead a ser leído.
+
+        Returns:
+            bytes: El lead serializado según el schema Lead.
+
+        Raises:
+            NotFoundException: Si no se encuentra un lead con el ID proporcionado.
+        """
+        body = self.response_cache.get(lead_id)
+        if body is None:
+            body = serialize_lead(self.read_lead(lead_id))
+            self.response_cache.set(lead_id, body)
+        return body
+
+    def export_leads(self, export_format: str, batch_size: int) -> Iterator[str]:
+        """
+        Exporta todos los leads como texto en el formato indicado, por bloques.
+
+        Args:
+            export_format (str): "ndjson" o "csv".
+            batch_size (int): Cantidad de filas leídas y codificadas por bloque.
+
+        Returns:
+            Iterator[str]: Los bloques de texto de la exportación.
+        """
+        return encode_partitions(
+            export_format, self.lead_repository.stream_lead_rows(batch_size)
+        )
+
+
+class StatsService:
+    def __init__(self, db: Session) -> None:
+        """
+        Inicializa el servicio de estadísticas.
+
+        Args:
+            db (Session): La sesión de la base de datos.
+        """
+        self.db = db
+        self.stats_repository = StatsRepository(db)
+
+    def read_stats(self, dimension: str) -> list[Row]:
+        """
+        Lee las estadísticas de cursados e inscripciones agrupadas por una dimensión.
+
+        Con STATS_SUMMARY se leen las tablas de resumen, por lo que el costo depende de
+        la cantidad de carreras, materias o años y no de la cantidad de leads; sin él se
+        agrupan cursados e inscripciones con GROUP BY.
+
+        Args:
+            dimension (str): "carreras", "materias" o "years".
+
+        Returns:
+            list[Row]: Una fila por valor de la dimensión, con las columnas de
+                CarreraStats, MateriaStats o YearStats.
+        """
+        read = {
+            "carreras": self.stats_repository.read_carrera_stats,
+            "materias": self.stats_repository.read_materia_stats,
+            "years": self.stats_repository.read_year_stats,
+        }[dimension]
+        return read(summary=settings.stats_summary)
+
+    def rebuild_summary(self) -> None:
+        """
+        Recalcula y confirma las tablas de resumen desde cursados e inscripciones.
+        """
+        try:
+            self.stats_repository.rebuild_summary()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
@@ -1,13 +1,121 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI
-from .routers.leads import router as leads_router
+from fastapi.concurrency import run_in_threadpool
+from .config import settings
+from .db.connection import Database
+from .db.schemas import BulkLeadResult, LeadCreate
+from .helpers.catalog_cache import catalog_cache
+from .helpers.ingest import FlushFunction, ingest_queue
+from .helpers.logs import RequestIdMiddleware, configure_logging
+from .helpers.read_your_writes import ReadYourWritesMiddleware
+from .helpers.request_metrics import (
+    InstrumentedORJSONResponse,
+    RequestMetricsMiddleware,
+)
+from .routers.metrics import router as metrics_router
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+# Con ASYNC_DB se sirve la variante asíncrona de los endpoints (AsyncEngine y AsyncSession)
+if settings.async_db:
+    from .db.async_connection import async_production_database
+    from .helpers.async_services import AsyncLeadService
+    from .routers.async_leads import router as leads_router
+    from .routers.async_stats import router as stats_router
+else:
+    from .db.connection import production_database
+    from .helpers.services import LeadService
+    from .routers.leads import router as leads_router
+    from .routers.stats import router as stats_router
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+async def warm_catalog_cache(database: Database) -> None:
+    """
+    Carga el catálogo de carreras y materias en el cache del proceso.
+
+    Args:
+        database (Database | AsyncDatabase): La base de la aplicación.
+    """
+    if settings.async_db:
+        async with database.sessionmaker() as db:
+            await db.run_sync(catalog_cache.warm)
+    else:
+
+        def warm() -> None:
+            with database.sessionmaker() as db:
+                catalog_cache.warm(db)
+
+        await run_in_threadpool(warm)
+
+
+def ingest_flush(database: Database) -> FlushFunction:
+    """
+    Arma la función con la que el thread de la cola de ingesta inserta cada lote, con
+    el camino de carga bulk.
+
+    Args:
+        database (Database | AsyncDatabase): La base de la aplicación.
+
+    Returns:
+        FlushFunction: La función que inserta un lote de leads en su propia sesión.
+    """
+    if settings.async_db:
+        # La AsyncSession debe usarse en el event loop de la aplicación
+        loop = asyncio.get_running_loop()
+
+        async def insert(leads: list[LeadCreate]) -> list[BulkLeadResult]:
+            async with database.sessionmaker() as db:
+                return await AsyncLeadService(db).create_leads_bulk(leads, len(leads))
+
+        return lambda leads: asyncio.run_coroutine_threadsafe(
+            insert(leads), loop
+        ).result()
+
+    def flush(leads: list[LeadCreate]) -> list[BulkLeadResult]:
+        with database.sessionmaker() as db:
+            return LeadService(db).create_leads_bulk(leads, len(leads))
+
+    return flush
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Cada worker arma su engine al arrancar, no al importar la aplicación
+    if settings.async_db:
+        database = async_production_database()
+    else:
+        database = production_database()
+    app.state.database = database
+    # Un cache frío sólo cuesta consultas de más, así que un error no impide arrancar
+    try:
+        await warm_catalog_cache(database)
+    except Exception:
+        logger.warning("Could not warm the catalog cache.", exc_info=True)
+    if settings.ingest_queue:
+        ingest_queue.start(ingest_flush(database))
+    yield
+    if settings.ingest_queue:
+        # Inserta lo que quedó encolado; en modo async el lote usa este mismo loop
+        await run_in_threadpool(ingest_queue.stop)
+    if settings.async_db:
+        await database.dispose()
+    else:
+        database.dispose()
+
+
+# Las respuestas que no arman su propio JSON se codifican con orjson
+app = FastAPI(default_response_class=InstrumentedORJSONResponse, lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(leads_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
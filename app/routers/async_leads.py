@@ -0,0 +1,303 @@
+from fastapi import APIRouter, Header, HTTPException, Request, Response, Query
+from fastapi.params import Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.schemas import (
+    BulkLeadReturn,
+    DuplicateLeadException,
+    IdempotencyKeyReuseException,
+    IngestQueueFullException,
+    Lead,
+    LeadCreate,
+    LeadFilters,
+    LeadReturn,
+    LeadSummary,
+    LeadTicket,
+    NotFoundException,
+    TicketStatus,
+)
+from ..db.async_connection import get_async_db, get_async_sessionmaker
+from ..config import settings
+from typing import AsyncIterator, Callable, List, Annotated, Literal
+from ..helpers.bulk import parse_bulk_body
+from ..helpers.export import EXPORT_MEDIA_TYPES
+from ..helpers.ingest import ingest_queue
+from ..helpers.response_cache import conditional_json_response
+from ..helpers.serialization import (
+    serialize_lead_rows,
+    serialize_lead_summaries,
+    serialize_leads,
+)
+from ..helpers.async_services import AsyncLeadService
+import logging
+
+"""Variante asíncrona de leads.py, con los mismos endpoints sobre AsyncLeadService. Se usa en lugar de leads.py cuando ASYNC_DB está habilitado."""
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/leads")
+
+
+@router.get("/", response_model=List[Lead] | List[LeadSummary])
+async def get_leads(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    limit: Annotated[
+        int | None, Query(description="Número máximo de resultados a devolver")
+    ] = 10,
+    offset: Annotated[
+        int | None, Query(description="Número de resultados a saltar desde el inicio")
+    ] = 0,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description="Cursor opaco devuelto en X-Next-Cursor por la página anterior"
+        ),
+    ] = None,
+    view: Annotated[
+        Literal["full", "summary"],
+        Query(
+            description="full: leads con sus cursados; summary: sólo lead_id, nombre, apellido y email"
+        ),
+    ] = "full",
+    filters: LeadFilters = Depends(),
+) -> Response:
+    """
+    Obtiene todos los leads de la base de datos, ordenados por lead_id.
+
+    Si hay una página siguiente, su cursor se devuelve en el header X-Next-Cursor. El
+    JSON se arma con serialize_leads, sin el jsonable_encoder de FastAPI, o con
+    serialize_lead_rows si LEAD_READ_MODEL es "rows". Con view=summary se leen y
+    devuelven sólo las columnas de LeadSummary.
+
+    Los filtros (email, prefijo de apellido, carrera, materia, rango de año_cursado,
+    universidad y búsqueda q sobre nombre/apellido) se aplican en la consulta SQL; ver
+    filter_leads.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        Response: El JSON de la lista de objetos Lead o LeadSummary.
+    """
+    lead_service = AsyncLeadService(db)
+    try:
+        leads, next_cursor = await lead_service.read_all_leads(
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            view=view,
+            filters=filters,
+        )
+    except NotFoundException as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    if view == "summary":
+        serialize = serialize_lead_summaries
+    elif settings.lead_read_model == "rows":
+        serialize = serialize_lead_rows
+    else:
+        serialize = serialize_leads
+    response = Response(serialize(leads), media_type="application/json")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/export")
+async def export_leads(
+    request: Request,
+    sessionmaker: Callable[[], AsyncSession] = Depends(get_async_sessionmaker),
+    export_format: Annotated[
+        Literal["ndjson", "csv"],
+        Query(alias="format", description="Formato de la exportación"),
+    ] = "ndjson",
+) -> StreamingResponse:
+    """
+    Exporta todos los leads, una fila por inscripción, como NDJSON o CSV.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        sessionmaker (Callable[[], AsyncSession]): La fábrica de sesiones, inyectada
+            por FastAPI.
+        export_format (str): "ndjson" o "csv".
+
+    Returns:
+        StreamingResponse: El contenido de la exportación.
+    """
+
+    # La sesión de get_async_db se cierra antes de enviar el cuerpo, así que la
+    # exportación abre la suya mientras lo genera; sigue siendo una RoutingSession que
+    # lee de las réplicas.
+    async def content() -> AsyncIterator[str]:
+        async with sessionmaker() as export_db:
+            async for chunk in AsyncLeadService(export_db).export_leads(
+                export_format, settings.export_batch_size
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="leads.{export_format}"'
+        },
+    )
+
+
+@router.get("/tickets/{ticket_id}")
+async def get_ticket(ticket_id: str) -> TicketStatus:
+    """
+    Obtiene el estado de un lead encolado por POST /leads con INGEST_QUEUE.
+
+    Args:
+        ticket_id (str): El ID del ticket devuelto al encolar el lead.
+
+    Returns:
+        TicketStatus: El estado ("queued", "done" o "failed"), con el lead_id o el error.
+
+    Raises:
+        HTTPException: 404 si el ticket no existe o ya se descartó.
+    """
+    ticket = ingest_queue.ticket(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found.")
+    return ticket
+
+
+@router.get("/{lead_id}", response_model=Lead)
+async def get_lead(
+    request: Request, lead_id: int, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Obtiene un lead específico por su ID.
+
+    La respuesta se sirve desde el cache de respuestas cuando está disponible y lleva
+    un ETag; si coincide con el If-None-Match de la solicitud se responde 304.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        lead_id (int): El ID del lead a obtener.
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        Response: El JSON del Lead con el ID especificado, o un 304.
+    """
+    lead_service = AsyncLeadService(db)
+    try:
+        body = await lead_service.read_lead_json(lead_id)
+    except NotFoundException as e:
+        raise HTTPException(status_code=404, detail=e.message) from e
+    return conditional_json_response(request, body)
+
+
+@router.post("/")
+async def add_lead(
+    request: Request,
+    lead_data: LeadCreate,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Annotated[
+        str | None,
+        Header(
+            max_length=255,
+            description="Clave para que los reintentos de la solicitud no creen otro lead",
+        ),
+    ] = None,
+) -> LeadReturn:
+    """
+    Agrega un nuevo lead a la base de datos.
+
+    Con un header Idempotency-Key, la respuesta se guarda junto con el lead y los
+    reintentos con la misma clave y el mismo cuerpo la reciben sin volver a crear el
+    lead, con el header Idempotent-Replayed.
+
+    Con INGEST_QUEUE (y sin Idempotency-Key) el lead validado se encola y se responde
+    202 con un ticket, consultable en GET /leads/tickets/{ticket_id}; LEAD_DEDUP se
+    aplica al insertarlo y un duplicado deja el ticket en "failed".
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        lead_data (LeadCreate): Los datos del lead a ser creado.
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+        idempotency_key (str | None): El header Idempotency-Key.
+
+    Returns:
+        Lead: El objeto Lead creado.
+
+    Raises:
+        HTTPException: 409 si LEAD_DEDUP detecta un lead duplicado, 422 si la
+            Idempotency-Key ya se usó con otro cuerpo, 503 si la cola de ingesta está
+            llena, o 400 si ocurre otro error al crear el lead.
+    """
+    if settings.ingest_queue and idempotency_key is None:
+        try:
+            ticket_id = ingest_queue.submit(lead_data)
+        except IngestQueueFullException as e:
+            raise HTTPException(
+                status_code=503, detail=e.message, headers={"Retry-After": "1"}
+            ) from e
+        return ORJSONResponse(
+            LeadTicket(ticket_id=ticket_id).model_dump(),
+            status_code=202,
+            headers={"Location": f"/leads/tickets/{ticket_id}"},
+        )
+    lead_service = AsyncLeadService(db)
+    try:
+        if idempotency_key is not None:
+            record, replayed = await lead_service.create_lead_idempotent(
+                lead_data, idempotency_key
+            )
+        else:
+            new_lead = await lead_service.create_lead(lead_data)
+    except DuplicateLeadException as e:
+        raise HTTPException(
+            status_code=409, detail={"message": e.message, "lead_id": e.lead_id}
+        ) from e
+    except IdempotencyKeyReuseException as e:
+        raise HTTPException(status_code=422, detail=e.message) from e
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if idempotency_key is not None:
+        return Response(
+            record.response_body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"} if replayed else None,
+        )
+    return LeadReturn(lead_id=new_lead.lead_id)
+
+
+@router.post("/bulk")
+async def add_leads_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    batch_size: Annotated[
+        int,
+        Query(ge=1, le=10000, description="Cantidad de leads por lote de inserción"),
+    ] = settings.bulk_batch_size,
+) -> BulkLeadReturn:
+    """
+    Agrega un lote de leads a la base de datos, como array JSON o NDJSON.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+        batch_size (int): Cantidad de leads por lote de inserción.
+
+    Returns:
+        BulkLeadReturn: El resultado de cada ítem, con su lead_id o su error.
+
+    Raises:
+        HTTPException: Si el cuerpo no es un array JSON ni NDJSON.
+    """
+    body = await request.body()
+    try:
+        items = parse_bulk_body(body, request.headers.get("content-type"))
+    except NotFoundException as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    lead_service = AsyncLeadService(db)
+    results = await lead_service.create_leads_bulk(items, batch_size)
+    created = sum(result.lead_id is not None for result in results)
+    return BulkLeadReturn(
+        created=created, failed=len(results) - created, results=results
+    )
@@ -0,0 +1,66 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.schemas import CarreraStats, MateriaStats, YearStats
+from ..db.async_connection import get_async_db
+from ..helpers.async_services import AsyncStatsService
+from typing import List
+
+"""Variante asíncrona de stats.py, con los mismos endpoints sobre AsyncStatsService."""
+
+router = APIRouter(prefix="/stats")
+
+
+@router.get("/carreras", response_model=List[CarreraStats])
+async def get_carrera_stats(db: AsyncSession = Depends(get_async_db)) -> list:
+    """
+    Obtiene la cantidad de cursados e inscripciones y el promedio de veces_cursada de
+    cada carrera.
+
+    Args:
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada CarreraStats por carrera, ordenadas por carrera_id.
+    """
+    return await AsyncStatsService(db).read_stats("carreras")
+
+
+@router.get("/materias", response_model=List[MateriaStats])
+async def get_materia_stats(db: AsyncSession = Depends(get_async_db)) -> list:
+    """
+    Obtiene la cantidad de inscripciones y el promedio de veces_cursada de cada materia.
+
+    Args:
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada MateriaStats por materia, ordenadas por materia_id.
+    """
+    return await AsyncStatsService(db).read_stats("materias")
+
+
+@router.get("/years", response_model=List[YearStats])
+async def get_year_stats(db: AsyncSession = Depends(get_async_db)) -> list:
+    """
+    Obtiene la cantidad de cursados e inscripciones y el promedio de veces_cursada de
+    cada año de cursado.
+
+    Args:
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada YearStats por año, ordenadas por año_cursado.
+    """
+    return await AsyncStatsService(db).read_stats("years")
+
+
+@router.post("/rebuild", status_code=204)
+async def rebuild_stats_summary(db: AsyncSession = Depends(get_async_db)) -> None:
+    """
+    Recalcula las tablas de resumen desde cursados e inscripciones.
+
+    Args:
+        db (AsyncSession): La sesión de la base de datos, inyectada por FastAPI.
+    """
+    await AsyncStatsService(db).rebuild_summary()
@@ -1,9 +1,34 @@
-from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import APIRouter, Header, HTTPException, Request, Response, Query
 from fastapi.params import Depends
 from sqlalchemy.orm import Session
-from ..db.schemas import Lead, LeadCreate, LeadReturn, NotFoundException
-from ..db.connection import get_db
-from typing import List, Annotated
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from ..db.schemas import (
+    BulkLeadReturn,
+    DuplicateLeadException,
+    IdempotencyKeyReuseException,
+    IngestQueueFullException,
+    Lead,
+    LeadCreate,
+    LeadFilters,
+    LeadReturn,
+    LeadSummary,
+    LeadTicket,
+    NotFoundException,
+    TicketStatus,
+)
+from ..db.connection import get_db, get_sessionmaker
+from ..config import settings
+from typing import Callable, Iterator, List, Annotated, Literal
+from ..helpers.bulk import parse_bulk_body
+from ..helpers.export import EXPORT_MEDIA_TYPES
+from ..helpers.ingest import ingest_queue
+from ..helpers.response_cache import conditional_json_response
+from ..helpers.serialization import (
+    serialize_lead_rows,
+    serialize_lead_summaries,
+    serialize_leads,
+)
 from ..helpers.services import LeadService
 import logging
 
@@ -12,7 +37,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/leads")
 
 
-@router.get("/")
+@router.get("/", response_model=List[Lead] | List[LeadSummary])
 def get_leads(
     request: Request,
     db: Session = Depends(get_db),
@@ -22,68 +47,260 @@ def get_leads(
     offset: Annotated[
         int | None, Query(description="Número de resultados a saltar desde el inicio")
     ] = 0,
-) -> List[Lead]:
+    cursor: Annotated[
+        str | None,
+        Query(
+            description="Cursor opaco devuelto en X-Next-Cursor por la página anterior"
+        ),
+    ] = None,
+    view: Annotated[
+        Literal["full", "summary"],
+        Query(
+            description="full: leads con sus cursados; summary: sólo lead_id, nombre, apellido y email"
+        ),
+    ] = "full",
+    filters: LeadFilters = Depends(),
+) -> Response:
     """
-    Obtiene todos los leads de la base de datos.
+    Obtiene todos los leads de la base de datos, ordenados por lead_id.
+
+    Si hay una página siguiente, su cursor se devuelve en el header X-Next-Cursor. El
+    JSON se arma con serialize_leads, sin el jsonable_encoder de FastAPI, o con
+    serialize_lead_rows si LEAD_READ_MODEL es "rows". Con view=summary se leen y
+    devuelven sólo las columnas de LeadSummary.
+
+    Los filtros (email, prefijo de apellido, carrera, materia, rango de año_cursado,
+    universidad y búsqueda q sobre nombre/apellido) se aplican en la consulta SQL; ver
+    filter_leads.
 
     Args:
         request (Request): El objeto de la solicitud.
         db (Session): La sesión de la base de datos, inyectada por FastAPI.
 
     Returns:
-        List[Lead]: Una lista de objetos Lead.
+        Response: El JSON de la lista de objetos Lead o LeadSummary.
     """
     lead_service = LeadService(db)
     try:
-        leads = lead_service.read_all_leads(limit=limit, offset=offset)
+        leads, next_cursor = lead_service.read_all_leads(
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            view=view,
+            filters=filters,
+        )
     except NotFoundException as e:
         raise HTTPException(status_code=400, detail=e.message) from e
-    return leads
+    if view == "summary":
+        serialize = serialize_lead_summaries
+    elif settings.lead_read_model == "rows":
+        serialize = serialize_lead_rows
+    else:
+        serialize = serialize_leads
+    response = Response(serialize(leads), media_type="application/json")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/export")
+def export_leads(
+    request: Request,
+    sessionmaker: Callable[[], Session] = Depends(get_sessionmaker),
+    export_format: Annotated[
+        Literal["ndjson", "csv"],
+        Query(alias="format", description="Formato de la exportación"),
+    ] = "ndjson",
+) -> StreamingResponse:
+    """
+    Exporta todos los leads, una fila por inscripción, como NDJSON o CSV.
+
+    La respuesta se genera a medida que se lee la base con un cursor del lado del
+    servidor, por lo que la memoria usada no depende de la cantidad de leads.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        sessionmaker (Callable[[], Session]): La fábrica de sesiones, inyectada por
+            FastAPI.
+        export_format (str): "ndjson" o "csv".
+
+    Returns:
+        StreamingResponse: El contenido de la exportación.
+    """
+
+    # La sesión de get_db se cierra antes de enviar el cuerpo, así que la exportación
+    # abre la suya mientras lo genera; sigue siendo una RoutingSession que lee de las
+    # réplicas.
+    def content() -> Iterator[str]:
+        with sessionmaker() as export_db:
+            yield from LeadService(export_db).export_leads(
+                export_format, settings.export_batch_size
+            )
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="leads.{export_format}"'
+        },
+    )
+
+
+@router.get("/tickets/{ticket_id}")
+def get_ticket(ticket_id: str) -> TicketStatus:
+    """
+    Obtiene el estado de un lead encolado por POST /leads con INGEST_QUEUE.
+
+    Args:
+        ticket_id (str): El ID del ticket devuelto al encolar el lead.
+
+    Returns:
+        TicketStatus: El estado ("queued", "done" o "failed"), con el lead_id o el error.
+
+    Raises:
+        HTTPException: 404 si el ticket no existe o ya se descartó.
+    """
+    ticket = ingest_queue.ticket(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found.")
+    return ticket
 
 
-@router.get("/{lead_id}")
-def get_lead(request: Request, lead_id: int, db: Session = Depends(get_db)) -> Lead:
+@router.get("/{lead_id}", response_model=Lead)
+def get_lead(request: Request, lead_id: int, db: Session = Depends(get_db)) -> Response:
     """
     Obtiene un lead específico por su ID.
 
+    La respuesta se sirve desde el cache de respuestas cuando está disponible y lleva
+    un ETag; si coincide con el If-None-Match de la solicitud se responde 304.
+
     Args:
         request (Request): El objeto de la solicitud.
         lead_id (int): El ID del lead a obtener.
         db (Session): La sesión de la base de datos, inyectada por FastAPI.
 
     Returns:
-        Lead: El objeto Lead con el ID especificado.
+        Response: El JSON del Lead con el ID especificado, o un 304.
     """
     lead_service = LeadService(db)
     try:
-        db_lead = lead_service.read_lead(lead_id)
+        body = lead_service.read_lead_json(lead_id)
     except NotFoundException as e:
         raise HTTPException(status_code=404, detail=e.message) from e
-    return db_lead
+    return conditional_json_response(request, body)
 
 
 @router.post("/")
 def add_lead(
-    request: Request, lead_data: LeadCreate, db: Session = Depends(get_db)
+    request: Request,
+    lead_data: LeadCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Annotated[
+        str | None,
+        Header(
+            max_length=255,
+            description="Clave para que los reintentos de la solicitud no creen otro lead",
+        ),
+    ] = None,
 ) -> LeadReturn:
     """
     Agrega un nuevo lead a la base de datos.
 
+    Con un header Idempotency-Key, la respuesta se guarda junto con el lead y los
+    reintentos con la misma clave y el mismo cuerpo la reciben sin volver a crear el
+    lead, con el header Idempotent-Replayed.
+
+    Con INGEST_QUEUE (y sin Idempotency-Key) el lead validado se encola y se responde
+    202 con un ticket, consultable en GET /leads/tickets/{ticket_id}; LEAD_DEDUP se
+    aplica al insertarlo y un duplicado deja el ticket en "failed".
+
     Args:
         request (Request): El objeto de la solicitud.
         lead_data (LeadCreate): Los datos del lead a ser creado.
         db (Session): La sesión de la base de datos, inyectada por FastAPI.
+        idempotency_key (str | None): El header Idempotency-Key.
 
     Returns:
         Lead: El objeto Lead creado.
 
     Raises:
-        HTTPException: Si ocurre un error al crear el lead.
+        HTTPException: 409 si LEAD_DEDUP detecta un lead duplicado, 422 si la
+            Idempotency-Key ya se usó con otro cuerpo, 503 si la cola de ingesta está
+            llena, o 400 si ocurre otro error al crear el lead.
     """
+    if settings.ingest_queue and idempotency_key is None:
+        try:
+            ticket_id = ingest_queue.submit(lead_data)
+        except IngestQueueFullException as e:
+            raise HTTPException(
+                status_code=503, detail=e.message, headers={"Retry-After": "1"}
+            ) from e
+        return ORJSONResponse(
+            LeadTicket(ticket_id=ticket_id).model_dump(),
+            status_code=202,
+            headers={"Location": f"/leads/tickets/{ticket_id}"},
+        )
     lead_service = LeadService(db)
     try:
-        new_lead = lead_service.create_lead(lead_data)
+        if idempotency_key is not None:
+            record, replayed = lead_service.create_lead_idempotent(
+                lead_data, idempotency_key
+            )
+        else:
+            new_lead = lead_service.create_lead(lead_data)
+    except DuplicateLeadException as e:
+        raise HTTPException(
+            status_code=409, detail={"message": e.message, "lead_id": e.lead_id}
+        ) from e
+    except IdempotencyKeyReuseException as e:
+        raise HTTPException(status_code=422, detail=e.message) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    logger.debug(f"{type(new_lead.lead_id)}")
-    return LeadReturn(**new_lead.__dict__)
+    if idempotency_key is not None:
+        return Response(
+            record.response_body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"} if replayed else None,
+        )
+    return LeadReturn(lead_id=new_lead.lead_id)
+
+
+@router.post("/bulk")
+async def add_leads_bulk(
+    request: Request,
+    db: Session = Depends(get_db),
+    batch_size: Annotated[
+        int,
+        Query(ge=1, le=10000, description="Cantidad de leads por lote de inserción"),
+    ] = settings.bulk_batch_size,
+) -> BulkLeadReturn:
+    """
+    Agrega un lote de leads a la base de datos.
+
+    El cuerpo puede ser un array JSON de LeadCreate o NDJSON (Content-Type
+    application/x-ndjson), con un LeadCreate por línea. Los ítems inválidos no
+    interrumpen la carga: se informan en el resultado junto a su índice.
+
+    Args:
+        request (Request): El objeto de la solicitud.
+        db (Session): La sesión de la base de datos, inyectada por FastAPI.
+        batch_size (int): Cantidad de leads por lote de inserción.
+
+    Returns:
+        BulkLeadReturn: El resultado de cada ítem, con su lead_id o su error.
+
+    Raises:
+        HTTPException: Si el cuerpo no es un array JSON ni NDJSON.
+    """
+    body = await request.body()
+    try:
+        items = parse_bulk_body(body, request.headers.get("content-type"))
+    except NotFoundException as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    lead_service = LeadService(db)
+    results = await run_in_threadpool(lead_service.create_leads_bulk, items, batch_size)
+    created = sum(result.lead_id is not None for result in results)
+    return BulkLeadReturn(
+        created=created, failed=len(results) - created, results=results
+    )
@@ -0,0 +1,95 @@
+from typing import Annotated
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import PlainTextResponse
+from ..config import settings
+from ..db.profiler import query_profiler
+from ..helpers.catalog_cache import catalog_cache
+from ..helpers.request_metrics import request_metrics
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_request_metrics() -> PlainTextResponse:
+    """
+    Exporta las métricas por ruta en el formato de texto de Prometheus: requests,
+    duración, tiempo en la base, sentencias, filas, serialización y presupuestos de
+    sentencias superados.
+
+    Returns:
+        PlainTextResponse: Las métricas, para que las recolecte Prometheus.
+    """
+    return PlainTextResponse(
+        request_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get("/pool")
+def get_pool_metrics(request: Request) -> dict:
+    """
+    Obtiene el estado y las métricas del pool de conexiones de producción.
+
+    Returns:
+        dict: Conexiones prestadas, overflow, contadores de eventos e histograma de
+            latencia de checkout.
+    """
+    pool = request.app.state.database.engine.pool
+    return pool.metrics.snapshot(pool)
+
+
+@router.get("/replicas")
+def get_replica_metrics(request: Request) -> dict:
+    """
+    Obtiene el estado de las réplicas de lectura de REPLICA_URLS.
+
+    Returns:
+        dict: Para cada réplica, si está en la rotación, las lecturas que recibió y
+            sus fallos, y las lecturas que fueron a la base principal por no haber
+            réplicas disponibles.
+    """
+    replicas = request.app.state.database.replicas
+    if replicas is None:
+        return {"replicas": [], "fallbacks": 0}
+    return {"replicas": replicas.snapshot(), "fallbacks": replicas.fallbacks}
+
+
+@router.get("/catalog-cache")
+def get_catalog_cache_metrics() -> dict:
+    """
+    Obtiene el tamaño y los aciertos y fallos del cache del catálogo.
+
+    Returns:
+        dict: Las estadísticas de los caches de carreras y de materias.
+    """
+    return catalog_cache.stats()
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: Annotated[
+        int, Query(ge=1, le=1000, description="Cantidad de sentencias a devolver")
+    ] = 20,
+) -> dict:
+    """
+    Obtiene las sentencias lentas registradas con SLOW_QUERY_LOG, de mayor a menor
+    tiempo total.
+
+    Returns:
+        dict: Si el registro está habilitado, el umbral, las sentencias descartadas
+            por superar SLOW_QUERY_MAX_STATEMENTS y las sentencias con su método de
+            origen, tiempos y EXPLAIN.
+    """
+    return {
+        "enabled": settings.slow_query_log,
+        "threshold_seconds": query_profiler.threshold,
+        "dropped": query_profiler.dropped,
+        "queries": query_profiler.top(limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_queries() -> None:
+    """
+    Descarta las sentencias lentas registradas.
+    """
+    query_profiler.clear()
@@ -0,0 +1,65 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+from sqlalchemy.orm import Session
+from ..db.schemas import CarreraStats, MateriaStats, YearStats
+from ..db.connection import get_db
+from ..helpers.services import StatsService
+from typing import List
+
+router = APIRouter(prefix="/stats")
+
+
+@router.get("/carreras", response_model=List[CarreraStats])
+def get_carrera_stats(db: Session = Depends(get_db)) -> list:
+    """
+    Obtiene la cantidad de cursados e inscripciones y el promedio de veces_cursada de
+    cada carrera.
+
+    Args:
+        db (Session): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada CarreraStats por carrera, ordenadas por carrera_id.
+    """
+    return StatsService(db).read_stats("carreras")
+
+
+@router.get("/materias", response_model=List[MateriaStats])
+def get_materia_stats(db: Session = Depends(get_db)) -> list:
+    """
+    Obtiene la cantidad de inscripciones y el promedio de veces_cursada de cada materia.
+
+    Args:
+        db (Session): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada MateriaStats por materia, ordenadas por materia_id.
+    """
+    return StatsService(db).read_stats("materias")
+
+
+@router.get("/years", response_model=List[YearStats])
+def get_year_stats(db: Session = Depends(get_db)) -> list:
+    """
+    Obtiene la cantidad de cursados e inscripciones y el promedio de veces_cursada de
+    cada año de cursado.
+
+    Args:
+        db (Session): La sesión de la base de datos, inyectada por FastAPI.
+
+    Returns:
+        list: Una entrada YearStats por año, ordenadas por año_cursado.
+    """
+    return StatsService(db).read_stats("years")
+
+
+@router.post("/rebuild", status_code=204)
+def rebuild_stats_summary(db: Session = Depends(get_db)) -> None:
+    """
+    Recalcula las tablas de resumen desde cursados e inscripciones. Se usa al activar
+    STATS_SUMMARY sobre datos cargados sin él.
+
+    Args:
+        db (Session): La sesión de la base de datos, inyectada por FastAPI.
+    """
+    StatsService(db).rebuild_summary()
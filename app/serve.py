@@ -0,0 +1,88 @@
+import argparse
+import logging
+import os
+from typing import Optional, Sequence
+import uvicorn
+from .config import settings
+from .db.pool import worker_pool_limits
+from .helpers.logs import configure_logging
+
+"""Punto de entrada de producción: python -m app.serve [--workers N] [--host HOST] [--port PORT]. Levanta N procesos de uvicorn (uvloop y httptools) sobre el mismo socket; al recibir SIGTERM cada worker deja de aceptar conexiones, espera a los requests en curso hasta GRACEFUL_SHUTDOWN_TIMEOUT segundos y ejecuta el cierre del lifespan (vacía la cola de ingesta y cierra el pool)."""
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count(workers: Optional[int] = None) -> int:
+    """
+    Cantidad de workers a levantar.
+
+    Args:
+        workers (int | None): La indicada con --workers, si la hay.
+
+    Returns:
+        int: workers, WEB_CONCURRENCY o la cantidad de CPUs, en ese orden.
+    """
+    return workers or settings.web_concurrency or os.cpu_count() or 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Levanta la aplicación con varios workers de uvicorn."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=80)
+    parser.add_argument(
+        "--workers", type=int, help="Default: WEB_CONCURRENCY o uno por CPU"
+    )
+    # Detrás de un balanceador, mayor que el timeout de conexiones ociosas de éste
+    parser.add_argument("--timeout-keep-alive", type=int, default=5)
+    parser.add_argument(
+        "--graceful-shutdown-timeout",
+        type=int,
+        default=settings.graceful_shutdown_timeout,
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    workers = worker_count(args.workers)
+    # La cola de ingesta, sus tickets y su spool son del proceso: con varios workers un
+    # ticket se consultaría en otro worker y todos reencolarían el mismo spool
+    if workers > 1 and (settings.ingest_queue or settings.ingest_spool_path):
+        parser.error(
+            "INGEST_QUEUE and INGEST_SPOOL_PATH require a single worker (--workers 1)"
+        )
+    if settings.db_max_connections is not None:
+        try:
+            pool_size, max_overflow = worker_pool_limits(
+                settings.db_max_connections,
+                workers,
+                settings.db_pool_size,
+                settings.db_max_overflow,
+            )
+        except ValueError as error:
+            parser.error(str(error))
+        logger.info(
+            "Starting %d workers with pool_size=%d and max_overflow=%d each.",
+            workers,
+            pool_size,
+            max_overflow,
+        )
+    # Los workers son procesos nuevos que leen Settings del entorno: así cada uno
+    # dimensiona su pool con la cantidad real de workers
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=args.timeout_keep_alive,
+        timeout_graceful_shutdown=args.graceful_shutdown_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
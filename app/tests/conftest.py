@@ -0,0 +1,160 @@
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, ContextManager, Generator, Iterator
+from fastapi.testclient import TestClient
+from sqlalchemy import Connection, StaticPool, event
+from sqlalchemy.orm import Session
+from ..db.connection import Database, get_db, get_sessionmaker
+from ..db.models import Base
+from ..helpers.catalog_cache import catalog_cache
+from ..helpers.response_cache import lead_response_cache
+from ..main import app
+import pytest
+
+"""Base de datos de los tests: una SQLite en memoria por proceso, con el esquema creado una sola vez, y cada test dentro de una transacción que se deshace al terminar. Los commits de la aplicación confirman SAVEPOINTs de esa transacción, así que los tests no dejan estado ni comparten archivos y pueden correr en paralelo con pytest-xdist (cada worker es un proceso con su propia base)."""
+
+
+@pytest.fixture(scope="session")
+def database() -> Generator[Database, None, None]:
+    database = Database(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    engine = database.engine
+
+    # pysqlite abre y cierra transacciones por su cuenta, y un COMMIT implícito
+    # liberaría los SAVEPOINTs: las transacciones las emite SQLAlchemy
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(connection: Connection) -> None:
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield database
+    finally:
+        database.dispose()
+
+
+@pytest.fixture
+def connection(database: Database) -> Generator[Connection, None, None]:
+    connection = database.engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        # Los IDs cacheados apuntan a filas que ya no existen
+        catalog_cache.clear()
+        lead_response_cache.clear()
+
+
+@pytest.fixture
+def session_factory(
+    database: Database, connection: Connection
+) -> Callable[..., Session]:
+    # Cada sesión trabaja en un SAVEPOINT: su commit y su rollback no salen del test
+    return partial(
+        database.sessionmaker, bind=connection, join_transaction_mode="create_savepoint"
+    )
+
+
+@pytest.fixture
+def db_session(
+    session_factory: Callable[..., Session],
+) -> Generator[Session, None, None]:
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def override_get_db(session_factory: Callable[..., Session]) -> Callable:
+    """Dependencia que reemplaza a get_db con sesiones sobre la base del test."""
+
+    def override_get_db() -> Iterator[Session]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return override_get_db
+
+
+@pytest.fixture
+def client(
+    session_factory: Callable[..., Session], override_get_db: Callable
+) -> Generator[TestClient, None, None]:
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_sessionmaker] = lambda: session_factory
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_sessionmaker, None)
+
+
+@pytest.fixture
+def make_lead() -> Callable[..., dict]:
+    def make_lead(
+        nombre: str = "Ana",
+        apellido: str = "Gomez",
+        email: str | None = "ana@example.com",
+        tel: int | None = 1234,
+        carrera: str = "Medicina",
+        año: int = 2024,
+        universidad: str | None = "UBA",
+        materias: dict[str, int] | None = None,
+    ) -> dict:
+        """Cuerpo de POST /leads con un cursado; materias va de nombre a veces_cursada."""
+        if materias is None:
+            materias = {"Anatomía": 1}
+        return {
+            "nombre": nombre,
+            "apellido": apellido,
+            "email": email,
+            "direccion": None,
+            "tel": tel,
+            "cursados": [
+                {
+                    "año_cursado": año,
+                    "carrera": {"nombre": carrera},
+                    "universidad": universidad,
+                    "inscripciones": [
+                        {"materia": {"nombre": materia}, "veces_cursada": veces}
+                        for materia, veces in materias.items()
+                    ],
+                }
+            ],
+        }
+
+    return make_lead
+
+
+@pytest.fixture
+def count_queries(database: Database) -> Callable[[], ContextManager[list[str]]]:
+    @contextmanager
+    def count_queries() -> Iterator[list[str]]:
+        """Cuenta las sentencias SQL ejecutadas contra la base de test."""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args) -> None:
+            # Los SAVEPOINTs son del aislamiento de los tests, no de la aplicación
+            if "SAVEPOINT" not in statement:
+                statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(
+                database.engine, "before_cursor_execute", before_cursor_execute
+            )
+
+    return count_queries
@@ -1,54 +1,12 @@
-from typing import Generator
-from sqlalchemy import create_engine, StaticPool
-from sqlalchemy.orm import sessionmaker, Session
-from fastapi.testclient import TestClient
-from ..main import app
-from ..db.connection import get_db, test_engine, session_test
-from ..db.models import Base
-import pytest
+import csv
+import io
+import json
 import logging
+from ..config import settings
 
 logger = logging.getLogger(__name__)
 
 
-# Setup in-memory sqlite db
-# DATABASE_URL = "sqlite:///:memory:"
-# engine = create_engine(
-#     DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
-# )
-# TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-# override dependency in app fastapi
-def override_get_db():
-    try:
-        db = session_test()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
-
-# Setup test client
-client = TestClient(app)
-
-
-@pytest.fixture(scope="module", autouse=True)
-def setup_and_teardown() -> Generator[Session, None, None]:
-    # create table in db
-    Base.metadata.create_all(bind=test_engine)
-    # create session
-    session = session_test()
-    try:
-        yield session
-    finally:
-        # Drop all tables after tests are done
-        Base.metadata.drop_all(bind=test_engine)
-        # Remove the session to ensure it's properly closed
-        session_test.remove()
-
-
 INPUT = {
     "nombre": "Lionel",
     "apellido": "Messi",
@@ -70,7 +28,7 @@ INPUT = {
 
 
 # Test cases
-def test_get_all_leads():
+def test_get_all_leads(client):
     # first create lead
     response = client.post("/leads", json=INPUT)
     assert response.status_code == 200
@@ -82,7 +40,7 @@ def test_get_all_leads():
     assert len(response.json()) > 0
 
 
-def test_get_one_lead():
+def test_get_one_lead(client):
     # first create lead
     response = client.post("/leads", json=INPUT)
     assert response.status_code == 200
@@ -96,7 +54,7 @@ def test_get_one_lead():
     assert lead["apellido"] == "Messi"
 
 
-def test_create_lead():
+def test_create_lead(client):
     response = client.post("/leads", json=INPUT)
     assert response.status_code == 200
 
@@ -105,10 +63,11 @@ def test_create_lead():
     assert "lead_id" in lead
 
 
-def test_api_pagination():
-    # first create lead in case there's none
-    response = client.post("/leads", json=INPUT)
-    assert response.status_code == 200
+def test_api_pagination(client):
+    # Cada test empieza con la base vacía: hacen falta dos leads para el offset 1
+    for _ in range(2):
+        response = client.post("/leads", json=INPUT)
+        assert response.status_code == 200
 
     response = client.get("/leads")
     total_leads = len(response.json())
@@ -126,7 +85,7 @@ def test_api_pagination():
     assert len(response.json()) == 0
 
 
-def test_create_lead_missing_fields():
+def test_create_lead_missing_fields(client):
     response = client.post(
         "/leads",
         json={
@@ -136,7 +95,7 @@ def test_create_lead_missing_fields():
     assert response.status_code == 422  # Unprocessable Entity
 
 
-def test_create_lead_empty_cursados():
+def test_create_lead_empty_cursados(client):
     response = client.post(
         "/leads",
         json={
@@ -153,13 +112,13 @@ def test_create_lead_empty_cursados():
     assert "lead_id" in response.json()
 
 
-def test_get_nonexistent_lead():
+def test_get_nonexistent_lead(client):
     response = client.get("/leads/9999")
     assert response.status_code == 404  # Not Found
     assert response.json()["detail"] == "Lead with id 9999 not found."
 
 
-def test_invalid_pagination_params():
+def test_invalid_pagination_params(client):
     response = client.get("/leads", params={"limit": -1, "offset": 0})
     assert response.status_code == 400  # Unprocessable Entity
     assert response.json()["detail"] == "Illegal limit/offset value. Only numbers >= 0."
@@ -167,3 +126,261 @@ def test_invalid_pagination_params():
     response = client.get("/leads", params={"limit": 1, "offset": -1})
     assert response.status_code == 400  # Unprocessable Entity
     assert response.json()["detail"] == "Illegal limit/offset value. Only numbers >= 0."
+
+
+def test_get_leads_fixed_query_count(client, count_queries):
+    for _ in range(5):
+        response = client.post("/leads", json=INPUT)
+        assert response.status_code == 200
+
+    query_counts = []
+    for limit in (1, 5):
+        with count_queries() as statements:
+            response = client.get("/leads", params={"limit": limit})
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        assert response.json()[0]["cursados"][0]["inscripciones"]
+        query_counts.append(len(statements))
+
+    # leads, cursados + carreras, inscripciones + materias
+    assert query_counts == [3, 3]
+
+
+def test_get_one_lead_fixed_query_count(client, count_queries):
+    response = client.post("/leads", json=INPUT)
+    lead_id = response.json()["lead_id"]
+
+    with count_queries() as statements:
+        response = client.get(f"/leads/{lead_id}")
+    assert response.status_code == 200
+    assert len(response.json()["cursados"][0]["inscripciones"]) == 2
+    assert len(statements) == 3
+
+
+def test_api_cursor_pagination(client):
+    for _ in range(3):
+        response = client.post("/leads", json=INPUT)
+        assert response.status_code == 200
+
+    all_ids = [lead["lead_id"] for lead in client.get("/leads?limit=1000").json()]
+    assert all_ids == sorted(all_ids)
+
+    seen = []
+    response = client.get("/leads", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen.extend(lead["lead_id"] for lead in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        response = client.get("/leads", params={"limit": 2, "cursor": next_cursor})
+    assert seen == all_ids
+
+
+def test_get_leads_summary_view(client, count_queries):
+    for _ in range(3):
+        response = client.post("/leads", json=INPUT)
+        assert response.status_code == 200
+    full = client.get("/leads", params={"limit": 2}).json()
+
+    with count_queries() as statements:
+        response = client.get("/leads", params={"limit": 2, "view": "summary"})
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert response.json() == [
+        {key: lead[key] for key in ("lead_id", "nombre", "apellido", "email")}
+        for lead in full
+    ]
+
+    next_cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        "/leads", params={"limit": 2, "view": "summary", "cursor": next_cursor}
+    )
+    assert response.json()[0]["lead_id"] > full[-1]["lead_id"]
+
+    response = client.get("/leads", params={"view": "compact"})
+    assert response.status_code == 422
+
+
+def test_get_leads_row_read_model(client, count_queries, monkeypatch):
+    # Un cursado con una inscripción: el orden de las relaciones ORM no está definido
+    cursado = {
+        **INPUT["cursados"][0],
+        "inscripciones": INPUT["cursados"][0]["inscripciones"][:1],
+    }
+    for _ in range(3):
+        response = client.post("/leads", json={**INPUT, "cursados": [cursado]})
+        assert response.status_code == 200
+    client.post("/leads", json={**INPUT, "cursados": []})
+    orm = client.get("/leads", params={"limit": 3})
+
+    monkeypatch.setattr(settings, "lead_read_model", "rows")
+    with count_queries() as statements:
+        rows = client.get("/leads", params={"limit": 3})
+    assert rows.status_code == 200
+    # Leads, cursados, carreras, inscripciones y materias en una sola consulta
+    assert len(statements) == 1
+    assert rows.json() == orm.json()
+    assert rows.headers["X-Next-Cursor"] == orm.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/leads", params={"limit": 3, "cursor": rows.headers["X-Next-Cursor"]}
+    )
+    assert response.json()[0]["cursados"] == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_leads_filters(client):
+    def lead(nombre, apellido, email, carrera, año, universidad, materias):
+        return {
+            **INPUT,
+            "nombre": nombre,
+            "apellido": apellido,
+            "email": email,
+            "cursados": [
+                {
+                    "año_cursado": año,
+                    "carrera": {"nombre": carrera},
+                    "universidad": universidad,
+                    "inscripciones": [
+                        {"materia": {"nombre": materia}, "veces_cursada": 1}
+                        for materia in materias
+                    ],
+                }
+            ],
+        }
+
+    leads = [
+        lead("Ana", "Gomez_", "ana@filtros.com", "Medicina", 2019, "UBA", ["Anatomía"]),
+        lead("Juan", "Gomez", "juan@filtros.com", "Medicina", 2022, "UNC", ["Física"]),
+        lead("Gonzalo", "Perez", "gonza@filtros.com", "Derecho", 2022, "UBA", []),
+    ]
+    ids = []
+    for data in leads:
+        response = client.post("/leads", json=data)
+        assert response.status_code == 200
+        ids.append(response.json()["lead_id"])
+
+    def filtered(**params):
+        response = client.get("/leads", params={"limit": 1000, **params})
+        assert response.status_code == 200
+        return [lead["lead_id"] for lead in response.json() if lead["lead_id"] in ids]
+
+    assert filtered(email="juan@filtros.com") == [ids[1]]
+    assert filtered(apellido="Gom") == [ids[0], ids[1]]
+    # El prefijo se escapa: "_" no es un comodín
+    assert filtered(apellido="Gomez_") == [ids[0]]
+    assert filtered(carrera="Medicina") == [ids[0], ids[1]]
+    assert filtered(materia="Física") == [ids[1]]
+    assert filtered(año_desde=2020, año_hasta=2022) == [ids[1], ids[2]]
+    assert filtered(universidad="UBA") == [ids[0], ids[2]]
+    assert filtered(carrera="Medicina", universidad="UBA") == [ids[0]]
+    # Las condiciones de cursado se cumplen en un mismo cursado
+    assert filtered(materia="Anatomía", año_desde=2020) == []
+    assert filtered(q="Go") == [ids[0], ids[1], ids[2]]
+    assert filtered(q="Juan", view="summary") == [ids[1]]
+
+    response = client.get("/leads", params={"carrera": "Medicina", "limit": 1})
+    assert [lead["lead_id"] for lead in response.json()] == [ids[0]]
+    response = client.get(
+        "/leads",
+        params={
+            "carrera": "Medicina",
+            "limit": 1,
+            "cursor": response.headers["X-Next-Cursor"],
+        },
+    )
+    assert [lead["lead_id"] for lead in response.json()] == [ids[1]]
+
+    response = client.get("/leads", params={"año_desde": "dos mil"})
+    assert response.status_code == 422
+
+
+def test_invalid_cursor_params(client):
+    response = client.get("/leads", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Illegal cursor value."
+
+    response = client.post("/leads", json=INPUT)
+    response = client.get("/leads", params={"limit": 1})
+    next_cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/leads", params={"cursor": next_cursor, "offset": 1})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor and offset cannot be combined."
+
+
+def test_bulk_create_leads_json(client):
+    duplicated_cursado = {**INPUT, "cursados": INPUT["cursados"] * 2}
+    items = [INPUT, {"nombre": "Jane"}, duplicated_cursado, INPUT]
+    response = client.post("/leads/bulk", params={"batch_size": 2}, json=items)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    results = data["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[1]["lead_id"] is None and "apellido" in results[1]["error"]
+    assert results[2]["lead_id"] is None and results[2]["error"]
+
+    for result in (results[0], results[3]):
+        response = client.get(f"/leads/{result['lead_id']}")
+        assert response.status_code == 200
+        cursado = response.json()["cursados"][0]
+        assert cursado["carrera"] == INPUT["cursados"][0]["carrera"]
+        assert sorted(
+            inscripcion["materia"]["nombre"] for inscripcion in cursado["inscripciones"]
+        ) == sorted(
+            inscripcion["materia"]["nombre"]
+            for inscripcion in INPUT["cursados"][0]["inscripciones"]
+        )
+
+
+def test_bulk_create_leads_ndjson(client):
+    body = "\n".join([json.dumps(INPUT), "{not json", "", json.dumps(INPUT)])
+    response = client.post(
+        "/leads/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert data["results"][1]["error"].startswith("Invalid JSON line")
+
+
+def test_bulk_create_leads_invalid_body(client):
+    response = client.post("/leads/bulk", json={"nombre": "Jane"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Bulk body must be a JSON array or NDJSON."
+
+
+def test_export_leads_ndjson(client):
+    response = client.post("/leads", json=INPUT)
+    lead_id = response.json()["lead_id"]
+
+    response = client.get("/leads/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    lead_rows = [row for row in rows if row["lead_id"] == lead_id]
+    assert len(lead_rows) == 2
+    assert {row["materia"] for row in lead_rows} == {"Mathematics", "Cienciaasasds"}
+    assert all(row["carrera"] == "Engineering" for row in lead_rows)
+    assert [row["lead_id"] for row in rows] == sorted(row["lead_id"] for row in rows)
+
+
+def test_export_leads_csv(client):
+    response = client.post("/leads", json=INPUT)
+    lead_id = response.json()["lead_id"]
+
+    response = client.get("/leads/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    lead_rows = [row for row in rows if row["lead_id"] == str(lead_id)]
+    assert len(lead_rows) == 2
+    assert lead_rows[0]["apellido"] == "Messi"
+
+    response = client.get("/leads/export", params={"format": "xml"})
+    assert response.status_code == 422
@@ -0,0 +1,161 @@
+from typing import Generator
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, NullPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from ..config import settings
+from ..db.async_connection import get_async_sessionmaker
+from ..db.models import Base
+from ..helpers.catalog_cache import catalog_cache
+from ..helpers.response_cache import lead_response_cache
+from ..routers.async_leads import router as async_leads_router
+from ..routers.async_stats import router as async_stats_router
+import pytest
+
+
+# Se usa un archivo en lugar de una base en memoria: TestClient corre la app en su
+# propio event loop, y NullPool evita compartir conexiones aiosqlite entre loops.
+@pytest.fixture(scope="module")
+def client(tmp_path_factory) -> Generator[TestClient, None, None]:
+    path = tmp_path_factory.mktemp("async") / "test_async.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=NullPool
+    )
+    AsyncTestSessionLocal = async_sessionmaker(
+        autoflush=False, expire_on_commit=False, bind=async_engine
+    )
+
+    app = FastAPI()
+    app.include_router(async_leads_router)
+    app.include_router(async_stats_router)
+    app.dependency_overrides[get_async_sessionmaker] = lambda: AsyncTestSessionLocal
+    try:
+        yield TestClient(app)
+    finally:
+        Base.metadata.drop_all(bind=sync_engine)
+        sync_engine.dispose()
+        catalog_cache.clear()
+        lead_response_cache.clear()
+
+
+INPUT = {
+    "nombre": "Lionel",
+    "apellido": "Messi",
+    "email": "lionel.messi@example.com",
+    "direccion": "Calle nro",
+    "tel": 12345678,
+    "cursados": [
+        {
+            "año_cursado": 2024,
+            "carrera": {"nombre": "Engineering"},
+            "universidad": "University A",
+            "inscripciones": [
+                {"materia": {"nombre": "Mathematics"}, "veces_cursada": 1},
+                {"materia": {"nombre": "Physics"}, "veces_cursada": 2},
+            ],
+        }
+    ],
+}
+
+
+def test_create_and_get_lead(client):
+    response = client.post("/leads/", json=INPUT)
+    assert response.status_code == 200
+    lead_id = response.json()["lead_id"]
+
+    response = client.get(f"/leads/{lead_id}")
+    assert response.status_code == 200
+    lead = response.json()
+    assert lead["nombre"] == "Lionel"
+    assert len(lead["cursados"][0]["inscripciones"]) == 2
+
+
+def test_get_nonexistent_lead(client):
+    response = client.get("/leads/9999")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Lead with id 9999 not found."
+
+
+def test_create_lead_is_atomic(client):
+    response = client.post("/leads/", json={**INPUT, "cursados": INPUT["cursados"] * 2})
+    assert response.status_code == 400
+
+
+def test_cursor_pagination(client):
+    for _ in range(3):
+        client.post("/leads/", json=INPUT)
+    all_ids = [lead["lead_id"] for lead in client.get("/leads/?limit=1000").json()]
+
+    seen = []
+    response = client.get("/leads/", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen.extend(lead["lead_id"] for lead in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        response = client.get("/leads/", params={"limit": 2, "cursor": next_cursor})
+    assert seen == all_ids == sorted(all_ids)
+
+
+def test_row_read_model(client, monkeypatch):
+    # Un cursado con una inscripción: el orden de las relaciones ORM no está definido
+    cursado = {
+        **INPUT["cursados"][0],
+        "inscripciones": INPUT["cursados"][0]["inscripciones"][:1],
+    }
+    # La base es compartida por el módulo: se leen sólo los leads de este test
+    params = {"limit": 10, "email": "rows@example.com"}
+    for _ in range(2):
+        lead = {**INPUT, "email": params["email"], "cursados": [cursado]}
+        client.post("/leads/", json=lead)
+    orm = client.get("/leads/", params=params).json()
+    monkeypatch.setattr(settings, "lead_read_model", "rows")
+    assert len(orm) == 2
+    assert client.get("/leads/", params=params).json() == orm
+
+
+def test_summary_view(client):
+    client.post("/leads/", json=INPUT)
+    response = client.get("/leads/", params={"limit": 1, "view": "summary"})
+    assert response.status_code == 200
+    assert set(response.json()[0]) == {"lead_id", "nombre", "apellido", "email"}
+
+
+def test_bulk_and_export(client):
+    response = client.post("/leads/bulk", json=[INPUT, {"nombre": "Jane"}, INPUT])
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert response.json()["failed"] == 1
+
+    response = client.get("/leads/export", params={"format": "csv"})
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("lead_id,nombre,apellido")
+    assert len(lines) > 4
+
+
+def test_stats_summary(client, monkeypatch):
+    live = client.get("/stats/carreras").json()
+    monkeypatch.setattr(settings, "stats_summary", True)
+    assert client.post("/stats/rebuild").status_code == 204
+    assert client.get("/stats/carreras").json() == live
+
+    assert client.post("/leads/", json=INPUT).status_code == 200
+    summary = client.get("/stats/carreras").json()
+    monkeypatch.setattr(settings, "stats_summary", False)
+    assert summary == client.get("/stats/carreras").json()
+    assert sum(carrera["cursados"] for carrera in summary) == sum(
+        carrera["cursados"] for carrera in live
+    ) + len(INPUT["cursados"])
+
+
+def test_idempotency_key(client):
+    headers = {"Idempotency-Key": "async-form-1"}
+    first = client.post("/leads/", json=INPUT, headers=headers)
+    retry = client.post("/leads/", json=INPUT, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
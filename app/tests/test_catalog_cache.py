@@ -0,0 +1,159 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+from ..db.models import DBCarrera, DBMateria
+from ..db.schemas import LeadCreate
+from ..helpers.catalog_cache import LRUCache, catalog_cache
+from ..helpers.repositories import CarreraRepository, MateriaRepository
+from ..helpers.services import LeadService
+from ..main import app
+import pytest
+
+INPUT = {
+    "nombre": "Lionel",
+    "apellido": "Messi",
+    "email": "lionel.messi@example.com",
+    "direccion": "Calle nro",
+    "tel": 12345678,
+    "cursados": [
+        {
+            "año_cursado": 2024,
+            "carrera": {"nombre": "Engineering"},
+            "universidad": "University A",
+            "inscripciones": [
+                {"materia": {"nombre": "Mathematics"}, "veces_cursada": 1},
+                {"materia": {"nombre": "Physics"}, "veces_cursada": 2},
+            ],
+        }
+    ],
+}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put_many([("a", 1), ("b", 2)])
+    assert cache.get_many(["a"]) == {"a": 1}
+    cache.put_many([("c", 3)])
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+
+def test_created_ids_are_cached_only_after_commit(db_session):
+    cache = LRUCache(maxsize=10)
+    repository = CarreraRepository(db_session, cache=cache)
+
+    repository.read_or_create_carrera_ids(["Engineering"])
+    assert cache.get_many(["Engineering"]) == {}
+    db_session.rollback()
+    db_session.commit()
+    assert cache.get_many(["Engineering"]) == {}
+
+    carrera_ids = repository.read_or_create_carrera_ids(["Engineering"])
+    db_session.commit()
+    assert cache.get_many(["Engineering"]) == carrera_ids
+
+
+def test_create_lead_uses_cached_catalog(db_session, count_queries):
+    lead_service = LeadService(db_session)
+    lead_data = LeadCreate(**INPUT)
+    lead_service.create_lead(lead_data)
+    with count_queries() as statements:
+        lead_service.create_lead(lead_data)
+    stats = catalog_cache.stats()
+
+    # El segundo lead sólo inserta lead, cursados e inscripciones
+    assert not any("carreras" in s or "materias" in s for s in statements)
+    assert stats["carreras"]["hits"] == 1
+    assert stats["materias"]["hits"] == 2
+
+
+def test_failed_create_lead_invalidates_catalog(db_session):
+    lead_service = LeadService(db_session)
+    lead_service.create_lead(LeadCreate(**INPUT))
+    assert catalog_cache.stats()["carreras"]["size"] == 1
+
+    # Dos cursados con la misma clave primaria hacen fallar el insert
+    with pytest.raises(Exception):
+        lead_service.create_lead(
+            LeadCreate(**{**INPUT, "cursados": INPUT["cursados"] * 2})
+        )
+    assert catalog_cache.stats()["carreras"]["size"] == 0
+    assert catalog_cache.stats()["materias"]["size"] == 0
+
+
+def test_case_variants_are_distinct_catalog_names(db_session):
+    carreras = CarreraRepository(db_session, cache=LRUCache(10))
+    materias = MateriaRepository(db_session, cache=LRUCache(10))
+    carrera_id = carreras.read_or_create_carrera_ids(["Engineering"])["Engineering"]
+    materias.read_or_create_materia_ids([(carrera_id, "Physics")])
+    db_session.commit()
+
+    # Cada nombre pedido tiene su propia clave, aunque sólo difiera en mayúsculas
+    carrera_ids = carreras.read_or_create_carrera_ids(["engineering", "Engineering"])
+    assert carrera_ids["Engineering"] == carrera_id
+    assert carrera_ids["engineering"] != carrera_id
+    materia_ids = materias.read_or_create_materia_ids(
+        [(carrera_id, "physics"), (carrera_id, "Physics")]
+    )
+    assert len(set(materia_ids.values())) == 2
+
+    lead = LeadService(db_session).create_lead(
+        LeadCreate(
+            **{
+                **INPUT,
+                "cursados": [
+                    {**INPUT["cursados"][0], "carrera": {"nombre": "ENGINEERING"}}
+                ],
+            }
+        )
+    )
+    assert lead.cursados[0].carrera.nombre == "ENGINEERING"
+
+
+@pytest.mark.parametrize("model", [DBCarrera, DBMateria])
+def test_catalog_names_compare_as_binary_on_mysql(model):
+    # En MySQL los constraints únicos deben comparar los nombres como Python
+    ddl = str(CreateTable(model.__table__).compile(dialect=mysql.dialect()))
+    assert "nombre VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_0900_bin" in ddl
+
+
+@pytest.mark.parametrize(
+    "message, retried",
+    [
+        ("UNIQUE constraint failed: carreras.nombre", True),
+        (
+            "Duplicate entry '7-Algebra' for key 'materias.uq_materias_carrera_nombre'",
+            True,
+        ),
+        ("UNIQUE constraint failed: idempotency_keys.key", False),
+    ],
+)
+def test_create_lead_retries_only_catalog_conflicts(
+    db_session, monkeypatch, message, retried
+):
+    lead_service = LeadService(db_session)
+    resolve = lead_service.resolve_catalog
+    attempts = []
+
+    def resolve_with_conflict(lead):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise IntegrityError("INSERT", {}, Exception(message))
+        return resolve(lead)
+
+    monkeypatch.setattr(lead_service, "resolve_catalog", resolve_with_conflict)
+    if retried:
+        assert lead_service.create_lead(LeadCreate(**INPUT)).lead_id is not None
+        assert len(attempts) == 2
+    else:
+        with pytest.raises(IntegrityError):
+            lead_service.create_lead(LeadCreate(**INPUT))
+        assert len(attempts) == 1
+
+
+def test_catalog_cache_metrics_endpoint():
+    response = TestClient(app).get("/metrics/catalog-cache")
+    assert response.status_code == 200
+    assert set(response.json()) == {"carreras", "materias"}
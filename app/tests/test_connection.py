@@ -0,0 +1,52 @@
+from sqlalchemy import create_engine, inspect, text
+from ..config import settings
+from ..db import bootstrap, connection
+from ..db.connection import Database, production_database
+from ..db.pool import InstrumentedQueuePool
+from ..db.profiler import QueryProfiler
+
+
+def test_database_builds_engine_on_first_use(tmp_path):
+    path = tmp_path / "lazy.db"
+    database = Database(f"sqlite:///{path}")
+    database.dispose()
+    assert database._engine is None
+    assert not path.exists()
+
+    with database.sessionmaker() as db:
+        assert db.execute(text("SELECT 1")).scalar() == 1
+    assert path.exists()
+    assert database.engine is database.sessionmaker.kw["bind"]
+    database.dispose()
+
+
+def test_production_database_uses_settings(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    monkeypatch.setattr(settings, "slow_query_log", True)
+    profiler = QueryProfiler(threshold=0, explain=False, max_statements=10)
+    monkeypatch.setattr(connection, "query_profiler", profiler)
+    database = production_database()
+    assert database.url == url
+    assert isinstance(database.engine.pool, InstrumentedQueuePool)
+    with database.engine.connect() as db:
+        db.execute(text("SELECT 1"))
+    assert profiler.top(1)
+    database.dispose()
+
+
+def test_bootstrap_creates_schema(tmp_path):
+    migrated = f"sqlite:///{tmp_path / 'migrated.db'}"
+    created = f"sqlite:///{tmp_path / 'created.db'}"
+    bootstrap.main(["--url", migrated])
+    bootstrap.main(["--url", created, "--create-all"])
+
+    for url in (migrated, created):
+        engine = create_engine(url)
+        assert {"leads", "carreras", "materias"} <= set(
+            inspect(engine).get_table_names()
+        )
+        engine.dispose()
+    engine = create_engine(migrated)
+    assert "alembic_version" in inspect(engine).get_table_names()
+    engine.dispose()
@@ -1,38 +1,45 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-from ..db.models import Base, DBLead
-from ..db.connection import session_test, test_engine
-from ..helpers.repositories import LeadRepository
+from typing import List
+import json
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from ..config import Settings
+from ..db.models import DBCarrera, DBLead, DBMateria
+from ..db.schemas import Lead, LeadCreate, LeadFilters
+from ..db.rows import group_lead_rows
+from ..helpers.repositories import (
+    LeadRepository,
+    LeadRowRepository,
+    filter_leads,
+    insert_ignore_statement,
+)
+from ..helpers.serialization import (
+    serialize_lead,
+    serialize_lead_rows,
+    serialize_leads,
+)
+from ..helpers.services import LeadService
 import pytest
 
-
-@pytest.fixture(scope="function")
-def setup_database() -> Generator[Session, None, None]:
-    # create table in db
-    Base.metadata.create_all(bind=test_engine)
-
-    try:
-        yield test_engine
-
-    finally:
-        # Drop all tables after tests are done
-        Base.metadata.drop_all(bind=test_engine)
-        session_test.remove()
-
-
-@pytest.fixture(scope="function")
-def db_session(setup_database: Session) -> Generator[Session, None, None]:
-    """Yield a new database session for a test."""
-    connection = setup_database.connect()
-    transaction = connection.begin()
-    session = session_test(bind=connection)
-
-    try:
-        yield session
-    finally:
-        session.close()
-        transaction.rollback()
-        connection.close()
+INPUT = {
+    "nombre": "Lionel",
+    "apellido": "Messi",
+    "email": "lionel.messi@example.com",
+    "direccion": "Calle nro",
+    "tel": 12345678,
+    "cursados": [
+        {
+            "año_cursado": 2024,
+            "carrera": {"nombre": "Engineering"},
+            "universidad": "University A",
+            "inscripciones": [
+                {"materia": {"nombre": "Mathematics"}, "veces_cursada": 1},
+                {"materia": {"nombre": "Physics"}, "veces_cursada": 2},
+            ],
+        }
+    ],
+}
 
 
 # TESTS
@@ -88,3 +95,150 @@ def test_get_all_leads(db_session):
     assert len(leads) == 2
     assert any(lead.nombre == "Lionel" for lead in leads)
     assert any(lead.nombre == "Lautaro" for lead in leads)
+
+
+def test_service_create_lead_reuses_catalog(db_session):
+    lead_service = LeadService(db_session)
+    lead_data = LeadCreate(**INPUT)
+    first = lead_service.create_lead(lead_data)
+    second = lead_service.create_lead(lead_data)
+
+    assert first.lead_id != second.lead_id
+    assert len(db_session.execute(select(DBCarrera)).scalars().all()) == 1
+    assert len(db_session.execute(select(DBMateria)).scalars().all()) == 2
+    assert len(second.cursados) == 1
+    assert len(second.cursados[0].inscripciones) == 2
+
+
+def test_service_create_lead_is_atomic(db_session):
+    lead_service = LeadService(db_session)
+    # Dos cursados con la misma clave primaria hacen fallar el insert
+    lead_data = LeadCreate(**{**INPUT, "cursados": INPUT["cursados"] * 2})
+    with pytest.raises(Exception):
+        lead_service.create_lead(lead_data)
+
+    assert db_session.execute(select(DBLead)).scalars().all() == []
+    assert db_session.execute(select(DBCarrera)).scalars().all() == []
+
+
+def test_insert_ignore_skips_existing_rows(db_session):
+    stmt = insert_ignore_statement(
+        db_session.get_bind().dialect, DBCarrera.__table__, ["nombre"]
+    )
+    db_session.execute(stmt, [{"nombre": "Engineering"}])
+    db_session.execute(stmt, [{"nombre": "Engineering"}, {"nombre": "Medicine"}])
+
+    nombres = db_session.execute(select(DBCarrera.nombre)).scalars().all()
+    assert sorted(nombres) == ["Engineering", "Medicine"]
+
+
+def test_serialize_leads_matches_fastapi_encoding(db_session):
+    db_lead = LeadService(db_session).create_lead(LeadCreate(**INPUT))
+    db_lead = LeadRepository(db_session).read_db_lead(db_lead.lead_id)
+
+    expected = jsonable_encoder(
+        TypeAdapter(List[Lead]).validate_python([db_lead], from_attributes=True)
+    )
+    assert json.loads(serialize_leads([db_lead])) == expected
+    assert json.loads(serialize_lead(db_lead)) == expected[0]
+
+
+def sorted_graph(leads: list[dict]) -> list[dict]:
+    # Las relaciones ORM no tienen orden; LeadRow ordena cursados e inscripciones
+    for lead in leads:
+        lead["cursados"].sort(key=lambda c: (c["año_cursado"], c["carrera"]["nombre"]))
+        for cursado in lead["cursados"]:
+            cursado["inscripciones"].sort(key=lambda i: i["materia"]["nombre"])
+    return leads
+
+
+def test_lead_rows_match_orm_serialization(db_session):
+    lead_service = LeadService(db_session)
+    lead_service.create_lead(LeadCreate(**INPUT))
+    lead_service.create_lead(LeadCreate(**{**INPUT, "tel": None, "cursados": []}))
+    lead_service.create_lead(
+        LeadCreate(
+            **{
+                **INPUT,
+                "cursados": [
+                    *INPUT["cursados"],
+                    {**INPUT["cursados"][0], "año_cursado": 2023, "inscripciones": []},
+                    {
+                        "año_cursado": 2024,
+                        "carrera": {"nombre": "Medicine"},
+                        "universidad": None,
+                        "inscripciones": [
+                            {"materia": {"nombre": "Anatomy"}, "veces_cursada": 3}
+                        ],
+                    },
+                ],
+            }
+        )
+    )
+
+    for page in (
+        {"limit": 10, "offset": 0},
+        {"limit": 2, "offset": 1},
+        {"limit": 10, "offset": 0, "after_lead_id": 1},
+        {"limit": 10, "offset": 0, "filters": LeadFilters(carrera="Medicine")},
+    ):
+        db_leads = LeadRepository(db_session).read_all_db_leads(**page)
+        rows = LeadRowRepository(db_session).read_all_lead_rows(**page)
+        assert [row.lead_id for row in rows] == [lead.lead_id for lead in db_leads]
+        assert sorted_graph(json.loads(serialize_lead_rows(rows))) == sorted_graph(
+            json.loads(serialize_leads(db_leads))
+        )
+
+
+def test_group_lead_rows_shares_names():
+    rows = [
+        (
+            1,
+            "Ana",
+            "Gomez",
+            None,
+            None,
+            "123",
+            2024,
+            1,
+            "UBA",
+            "Medicina",
+            "Anatomía",
+            1,
+        ),
+        (1, "Ana", "Gomez", None, None, "123", 2024, 1, "UBA", "Medicina", "Física", 2),
+        (2, "Luis", "Paz", None, None, None, 2023, 1, None, "Medicina", None, None),
+        (3, "Eva", "Sosa", None, None, None, None, None, None, None, None, None),
+    ]
+    ana, luis, eva = group_lead_rows(rows)
+    assert ana.tel == 123
+    assert [i.materia.nombre for i in ana.cursados[0].inscripciones] == [
+        "Anatomía",
+        "Física",
+    ]
+    assert luis.cursados[0].inscripciones == []
+    assert luis.cursados[0].carrera is ana.cursados[0].carrera
+    assert eva.cursados == []
+
+
+def test_filter_leads_fulltext_only_on_mysql():
+    filters = LeadFilters(q="Lionel")
+    mysql_dialect = mysql.dialect()
+    stmt = filter_leads(select(DBLead.lead_id), filters, mysql_dialect, "fulltext")
+    assert "MATCH (leads.nombre, leads.apellido) AGAINST" in str(
+        stmt.compile(dialect=mysql_dialect)
+    )
+
+    sqlite_dialect = sqlite.dialect()
+    stmt = filter_leads(select(DBLead.lead_id), filters, sqlite_dialect, "fulltext")
+    assert "LIKE" in str(stmt.compile(dialect=sqlite_dialect))
+
+
+def test_unknown_search_mode_fails_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(lead_search_mode="full_text")
+
+
+def test_unknown_read_model_fails_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(lead_read_model="row")
@@ -0,0 +1,156 @@
+from sqlalchemy import func, select
+from pydantic import ValidationError
+from ..config import Settings, settings
+from ..db.models import DBLead
+from ..db.schemas import IdempotencyKeyReuseException, LeadCreate
+from ..helpers.services import LeadService
+import pytest
+
+
+def count_leads(session_factory) -> int:
+    with session_factory() as db:
+        return db.execute(select(func.count()).select_from(DBLead)).scalar()
+
+
+def test_idempotency_key_replays_response(client, session_factory, make_lead):
+    headers = {"Idempotency-Key": "form-123"}
+    first = client.post("/leads/", json=make_lead(), headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/leads/", json=make_lead(), headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert count_leads(session_factory) == 1
+
+    other = client.post("/leads/", json=make_lead(), headers={"Idempotency-Key": "x"})
+    assert other.json()["lead_id"] != first.json()["lead_id"]
+
+
+def test_idempotency_key_reused_with_other_body(client, make_lead):
+    headers = {"Idempotency-Key": "form-123"}
+    assert client.post("/leads/", json=make_lead(), headers=headers).status_code == 200
+    response = client.post(
+        "/leads/", json=make_lead(email="otro@example.com"), headers=headers
+    )
+    assert response.status_code == 422
+
+
+def test_idempotency_key_expires(client, session_factory, monkeypatch, make_lead):
+    headers = {"Idempotency-Key": "form-123"}
+    first = client.post("/leads/", json=make_lead(), headers=headers)
+    monkeypatch.setattr(settings, "idempotency_ttl", 0)
+    retry = client.post("/leads/", json=make_lead(), headers=headers)
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+    assert retry.json()["lead_id"] != first.json()["lead_id"]
+    assert count_leads(session_factory) == 2
+
+
+def test_concurrent_retry_returns_the_stored_response(
+    session_factory, monkeypatch, make_lead
+):
+    lead = LeadCreate.model_validate(make_lead())
+    with session_factory() as db:
+        first, replayed = LeadService(db).create_lead_idempotent(lead, "form-123")
+        lead_id = first.response_body
+        assert not replayed
+
+    # El reintento no ve la clave al empezar, como si la otra solicitud confirmara
+    # entre su lectura y su insert
+    with session_factory() as db:
+        service = LeadService(db)
+        read = service.read_idempotency_record
+        calls = []
+
+        def read_after_race(key, request_hash):
+            calls.append(key)
+            return None if len(calls) == 1 else read(key, request_hash)
+
+        monkeypatch.setattr(service, "read_idempotency_record", read_after_race)
+        resolve = service.resolve_catalog
+        attempts = []
+        monkeypatch.setattr(
+            service, "resolve_catalog", lambda lead: attempts.append(1) or resolve(lead)
+        )
+        record, replayed = service.create_lead_idempotent(lead, "form-123")
+        assert replayed
+        assert record.response_body == lead_id
+        # La clave repetida no es un conflicto del catálogo: no se reintenta el insert
+        assert len(attempts) == 1
+    assert count_leads(session_factory) == 1
+
+
+def test_concurrent_reuse_with_another_body_is_rejected(
+    session_factory, monkeypatch, make_lead
+):
+    with session_factory() as db:
+        LeadService(db).create_lead_idempotent(
+            LeadCreate.model_validate(make_lead()), "form-123"
+        )
+
+    with session_factory() as db:
+        service = LeadService(db)
+        read = service.read_idempotency_record
+        calls = []
+
+        def read_after_race(key, request_hash):
+            calls.append(key)
+            return None if len(calls) == 1 else read(key, request_hash)
+
+        monkeypatch.setattr(service, "read_idempotency_record", read_after_race)
+        with pytest.raises(IdempotencyKeyReuseException):
+            service.create_lead_idempotent(
+                LeadCreate.model_validate(make_lead(email="otra@example.com")),
+                "form-123",
+            )
+    assert count_leads(session_factory) == 1
+
+
+def test_dedup_by_normalized_email(client, monkeypatch, make_lead):
+    monkeypatch.setattr(settings, "lead_dedup", "email")
+    lead_id = client.post("/leads/", json=make_lead()).json()["lead_id"]
+
+    response = client.post("/leads/", json=make_lead(email="  ANA@example.com "))
+    assert response.status_code == 409
+    assert response.json()["detail"]["lead_id"] == lead_id
+
+    # Con "email" el teléfono no cuenta
+    response = client.post("/leads/", json=make_lead(email="otra@example.com"))
+    assert response.status_code == 200
+
+
+def test_dedup_by_email_or_tel(client, monkeypatch, make_lead):
+    monkeypatch.setattr(settings, "lead_dedup", "email_tel")
+    lead_id = client.post("/leads/", json=make_lead()).json()["lead_id"]
+    response = client.post("/leads/", json=make_lead(email="otra@example.com"))
+    assert response.status_code == 409
+    assert response.json()["detail"]["lead_id"] == lead_id
+    response = client.post("/leads/", json=make_lead(email=None, tel=None))
+    assert response.status_code == 200
+
+
+def test_unknown_dedup_policy_fails_at_startup():
+    # Un valor mal escrito no debe activar la detección por email en silencio
+    with pytest.raises(ValidationError):
+        Settings(lead_dedup="emial")
+
+
+def test_dedup_bulk(client, monkeypatch, make_lead):
+    monkeypatch.setattr(settings, "lead_dedup", "email")
+    lead_id = client.post("/leads/", json=make_lead()).json()["lead_id"]
+    response = client.post(
+        "/leads/bulk",
+        json=[
+            make_lead(email="Ana@Example.com"),
+            make_lead(email="b@example.com"),
+            make_lead(email="B@example.com "),
+        ],
+    )
+    body = response.json()
+    assert (body["created"], body["failed"]) == (1, 2)
+    results = body["results"]
+    assert results[0]["error"] == f"Lead duplicates lead {lead_id}."
+    assert results[1]["lead_id"] is not None
+    assert results[2]["error"] == "Lead duplicates item 1."
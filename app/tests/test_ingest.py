@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from ..config import settings
+from ..db.models import DBLead
+from ..db.schemas import BulkLeadResult, IngestQueueFullException, LeadCreate
+from ..helpers.ingest import IngestQueue
+from ..helpers.services import LeadService
+from ..routers import leads
+import pytest
+
+
+def make_lead(nombre: str = "Ana") -> LeadCreate:
+    return LeadCreate.model_validate(
+        {
+            "nombre": nombre,
+            "apellido": "Gomez",
+            "email": f"{nombre.lower()}@example.com",
+            "direccion": None,
+            "tel": 1234,
+            "cursados": [
+                {
+                    "año_cursado": 2024,
+                    "carrera": {"nombre": "Medicina"},
+                    "universidad": "UBA",
+                    "inscripciones": [
+                        {"materia": {"nombre": "Anatomía"}, "veces_cursada": 1}
+                    ],
+                }
+            ],
+        }
+    )
+
+
+class RecordingFlush:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.released = threading.Event()
+        self.released.set()
+
+    def __call__(self, leads: list[LeadCreate]) -> list[BulkLeadResult]:
+        self.released.wait()
+        self.batches.append([lead.nombre for lead in leads])
+        return [
+            BulkLeadResult(index=index, lead_id=len(self.batches) * 100 + index)
+            for index in range(len(leads))
+        ]
+
+
+def wait_for(ticket_status, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not ticket_status():
+        assert time.monotonic() < deadline, "timed out waiting for the ingest queue"
+        time.sleep(0.01)
+
+
+def test_queue_inserts_in_batches():
+    flush = RecordingFlush()
+    flush.released.clear()
+    queue = IngestQueue(maxsize=100, batch_size=3, flush_interval=0.05)
+    queue.start(flush)
+    try:
+        ticket_ids = [queue.submit(make_lead(f"Lead{n}")) for n in range(7)]
+        assert queue.ticket(ticket_ids[0]).status == "queued"
+        flush.released.set()
+        wait_for(lambda: queue.ticket(ticket_ids[-1]).status == "done")
+    finally:
+        queue.stop()
+
+    assert sum(flush.batches, []) == [f"Lead{n}" for n in range(7)]
+    assert all(len(batch) <= 3 for batch in flush.batches)
+    assert queue.ticket(ticket_ids[0]).lead_id == 100
+
+
+def test_queue_full_rejects_submissions():
+    queue = IngestQueue(maxsize=2, batch_size=10, flush_interval=0.05)
+    queue.submit(make_lead())
+    queue.submit(make_lead())
+    with pytest.raises(IngestQueueFullException):
+        queue.submit(make_lead())
+    assert queue.qsize() == 2
+
+
+def test_failed_batch_marks_tickets_failed():
+    def flush(leads: list[LeadCreate]) -> list[BulkLeadResult]:
+        raise RuntimeError("database is down")
+
+    queue = IngestQueue(maxsize=10, batch_size=10, flush_interval=0.01)
+    queue.start(flush)
+    try:
+        ticket_id = queue.submit(make_lead())
+        wait_for(lambda: queue.ticket(ticket_id).status != "queued")
+    finally:
+        queue.stop()
+    assert queue.ticket(ticket_id).status == "failed"
+    assert queue.ticket(ticket_id).error == "database is down"
+
+
+def test_spool_replays_pending_leads(tmp_path):
+    spool_path = str(tmp_path / "ingest.ndjson")
+    flush = RecordingFlush()
+
+    # Un proceso que encola dos leads y termina antes de insertarlos
+    crashed = IngestQueue(10, 10, 0.01, spool_path)
+    crashed._spool = open(spool_path, "ab")
+    pending = [crashed.submit(make_lead("Ana")), crashed.submit(make_lead("Luis"))]
+    crashed._spool.close()
+
+    restarted = IngestQueue(10, 10, 0.01, spool_path)
+    restarted.start(flush)
+    try:
+        wait_for(
+            lambda: all(
+                (ticket := restarted.ticket(ticket_id)) and ticket.status == "done"
+                for ticket_id in pending
+            )
+        )
+    finally:
+        restarted.stop()
+    assert flush.batches == [["Ana", "Luis"]]
+    # Sin pendientes, el spool queda vacío y un nuevo inicio no reinserta nada
+    assert (tmp_path / "ingest.ndjson").read_bytes() == b""
+
+
+def test_spool_survives_a_crash_while_rewriting(tmp_path, monkeypatch):
+    spool_path = str(tmp_path / "ingest.ndjson")
+    crashed = IngestQueue(10, 10, 0.01, spool_path)
+    crashed._spool = open(spool_path, "ab")
+    crashed.submit(make_lead("Ana"))
+    crashed._spool.close()
+    original = (tmp_path / "ingest.ndjson").read_bytes()
+
+    def crash(*args) -> None:
+        raise OSError("disk full")
+
+    # Una caída antes de reemplazar el spool no pierde los leads pendientes
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        IngestQueue(10, 10, 0.01, spool_path).start(RecordingFlush())
+    assert (tmp_path / "ingest.ndjson").read_bytes() == original
+    assert os.listdir(tmp_path) == ["ingest.ndjson"]
+
+
+def test_post_lead_with_ingest_queue(database, session_factory, monkeypatch):
+    def flush(leads: list[LeadCreate]) -> list[BulkLeadResult]:
+        with session_factory() as db:
+            return LeadService(db).create_leads_bulk(leads, len(leads))
+
+    queue = IngestQueue(maxsize=10, batch_size=10, flush_interval=0.01)
+    monkeypatch.setattr(settings, "ingest_queue", True)
+    monkeypatch.setattr(leads, "ingest_queue", queue)
+    app = FastAPI()
+    app.include_router(leads.router)
+    app.state.database = database
+    client = TestClient(app)
+
+    queue.start(flush)
+    try:
+        response = client.post("/leads/", json=make_lead().model_dump())
+        assert response.status_code == 202
+        ticket_id = response.json()["ticket_id"]
+        assert response.headers["Location"] == f"/leads/tickets/{ticket_id}"
+        wait_for(
+            lambda: client.get(f"/leads/tickets/{ticket_id}").json()["status"]
+            != "queued"
+        )
+    finally:
+        queue.stop()
+
+    ticket = client.get(f"/leads/tickets/{ticket_id}").json()
+    assert ticket["status"] == "done"
+    with session_factory() as db:
+        lead = db.get(DBLead, ticket["lead_id"])
+        assert lead.nombre == "Ana"
+        assert db.execute(select(func.count()).select_from(DBLead)).scalar() == 1
+    assert client.get("/leads/tickets/unknown").status_code == 404
+
+
+def test_post_lead_with_full_ingest_queue(database, monkeypatch):
+    queue = IngestQueue(maxsize=1, batch_size=10, flush_interval=0.01)
+    monkeypatch.setattr(settings, "ingest_queue", True)
+    monkeypatch.setattr(leads, "ingest_queue", queue)
+    app = FastAPI()
+    app.include_router(leads.router)
+    app.state.database = database
+    client = TestClient(app)
+
+    assert client.post("/leads/", json=make_lead().model_dump()).status_code == 202
+    response = client.post("/leads/", json=make_lead().model_dump())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
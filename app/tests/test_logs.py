@@ -0,0 +1,74 @@
+import io
+import logging
+import queue
+from logging.handlers import QueueListener
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from ..config import Settings
+from ..helpers.logs import (
+    DebugSamplingFilter,
+    JsonFormatter,
+    LocalQueueHandler,
+    RequestIdFilter,
+    RequestIdMiddleware,
+)
+
+
+def test_queue_pipeline_writes_json_with_request_id():
+    output = io.StringIO()
+    stream = logging.StreamHandler(output)
+    stream.setFormatter(JsonFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = LocalQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter(0))
+    listener = QueueListener(records, stream)
+    logger = logging.getLogger("app.tests.logs")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/")
+    def index() -> str:
+        logger.debug("sampled out %s", "debug")
+        logger.info("lead %d created", 7)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+        return "ok"
+
+    listener.start()
+    try:
+        response = TestClient(app).get("/", headers={"X-Request-ID": "req-1"})
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+        logger.propagate = True
+
+    assert response.headers["X-Request-ID"] == "req-1"
+    entries = [orjson.loads(line) for line in output.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == ["lead 7 created", "failed"]
+    assert {entry["request_id"] for entry in entries} == {"req-1"}
+    assert entries[0]["level"] == "INFO"
+    assert "ValueError: boom" in entries[1]["exception"]
+
+
+def test_request_id_is_generated():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+    app.get("/")(lambda: "ok")
+    client = TestClient(app)
+    first = client.get("/").headers["X-Request-ID"]
+    second = client.get("/").headers["X-Request-ID"]
+    assert len(first) == 32 and first != second
+
+
+def test_unknown_log_format_fails_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(log_format="jsno")
@@ -0,0 +1,53 @@
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+import pytest
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+@pytest.fixture(scope="function")
+def database(tmp_path) -> tuple[Config, str]:
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    return config, url
+
+
+def test_migrations_match_models(database):
+    config, url = database
+    command.upgrade(config, "head")
+
+    # Falla con AutogenerateDiffsDetected si el esquema migrado difiere de los modelos
+    command.check(config)
+
+    engine = create_engine(url)
+
+    command.downgrade(config, "base")
+    with engine.connect() as connection:
+        assert (
+            connection.execute(
+                text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'alembic_version'"
+                )
+            ).all()
+            == []
+        )
+    engine.dispose()
+
+
+def test_lookup_indexes_migration_rejects_duplicates(database):
+    config, url = database
+    command.upgrade(config, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO carreras (nombre) VALUES ('Engineering'), ('Engineering')"
+            )
+        )
+    engine.dispose()
+
+    with pytest.raises(RuntimeError, match="Duplicate rows in carreras"):
+        command.upgrade(config, "head")
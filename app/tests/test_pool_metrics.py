@@ -0,0 +1,70 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from fastapi.testclient import TestClient
+from ..config import settings
+from ..db.pool import InstrumentedQueuePool, pool_options, worker_pool_limits
+from ..main import app
+import pytest
+
+
+def test_pool_metrics_track_checkouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    first = engine.connect()
+    second = engine.connect()
+    snapshot = engine.pool.metrics.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow"] == 1
+    assert snapshot["checkouts"] == 2
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    first.execute(text("SELECT 1"))
+    first.close()
+    second.close()
+    snapshot = engine.pool.metrics.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkins"] == 2
+    assert snapshot["timeouts"] == 1
+    latency = snapshot["checkout_latency_seconds"]
+    assert latency["count"] == 3
+    assert latency["buckets"]["+Inf"] == 3
+    assert latency["max"] >= 0.05
+    engine.dispose()
+
+
+def test_get_pool_metrics_endpoint(tmp_path, monkeypatch):
+    # El lifespan arma el engine de la aplicación con la URL vigente al arrancar
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{tmp_path / 'app.db'}")
+    with TestClient(app) as client:
+        response = client.get("/metrics/pool")
+        assert response.status_code == 200
+        assert {"checked_out", "overflow", "checkout_latency_seconds"} <= set(
+            response.json()
+        )
+        assert isinstance(app.state.database.engine.pool, InstrumentedQueuePool)
+
+
+def test_worker_pool_limits_split_the_budget():
+    assert worker_pool_limits(100, 4, 5, 10) == (5, 10)
+    assert worker_pool_limits(40, 4, 5, 10) == (5, 5)
+    assert worker_pool_limits(12, 4, 5, 10) == (3, 0)
+    # Sin límite en QueuePool: se usa la parte entera del worker
+    assert worker_pool_limits(40, 4, 0, -1) == (10, 0)
+    assert worker_pool_limits(40, 4, 5, -1) == (5, 5)
+    with pytest.raises(ValueError):
+        worker_pool_limits(3, 4, 5, 10)
+
+
+def test_pool_options_with_connection_budget(monkeypatch):
+    monkeypatch.setattr(settings, "db_max_connections", 30)
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    options = pool_options()
+    assert (options["pool_size"], options["max_overflow"]) == (5, 2)
+    assert 4 * (options["pool_size"] + options["max_overflow"]) <= 30
@@ -0,0 +1,100 @@
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from ..db.connection import Database
+from ..db.models import Base
+from ..db.profiler import QueryProfiler, query_profiler
+from ..helpers.async_repositories import AsyncLeadRepository
+from ..helpers.repositories import LeadRepository
+from ..main import app
+
+
+def test_slow_queries_are_tagged_and_explained(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiler.db'}")
+    Base.metadata.create_all(bind=engine)
+    profiler = QueryProfiler(threshold=0, explain=True, max_statements=100)
+    profiler.install(engine)
+
+    with Session(engine) as db:
+        for _ in range(3):
+            LeadRepository(db).read_all_db_leads(limit=10, offset=0)
+
+    queries = profiler.top(100)
+    callers = {query["caller"] for query in queries}
+    assert "LeadRepository.read_all_db_leads" in callers
+    slowest = queries[0]
+    assert slowest["count"] == 3
+    assert slowest["total_seconds"] >= slowest["max_seconds"] > 0
+    assert slowest["statement"].lstrip().upper().startswith("SELECT")
+    # EXPLAIN QUERY PLAN de SQLite: una fila por paso del plan
+    assert slowest["explain"] and all(len(row) == 4 for row in slowest["explain"])
+    engine.dispose()
+
+
+def test_routing_sessions_are_tagged_with_the_repository(tmp_path):
+    urls = [f"sqlite:///{tmp_path / name}.db" for name in ("primary", "replica")]
+    database = Database(urls[0], replica_urls=urls[1:])
+    for target in (database, *database.replicas.replicas):
+        Base.metadata.create_all(bind=target.engine)
+    profiler = QueryProfiler(threshold=0, explain=False, max_statements=100)
+    for target in (database, *database.replicas.replicas):
+        profiler.install(target.engine)
+
+    with database.sessionmaker() as db:
+        LeadRepository(db).read_all_db_leads(limit=10, offset=0)
+        LeadRepository(db).find_duplicates({"ana@example.com"}, set())
+
+    callers = {query["caller"] for query in profiler.top(100)}
+    assert "LeadRepository.read_all_db_leads" in callers
+    assert "LeadRepository.find_duplicates" in callers
+    assert not any(caller.startswith("RoutingSession") for caller in callers)
+    database.dispose()
+
+
+def test_threshold_and_max_statements(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiler.db'}")
+    Base.metadata.create_all(bind=engine)
+    fast = QueryProfiler(threshold=60, explain=True, max_statements=100)
+    fast.install(engine)
+    bounded = QueryProfiler(threshold=0, explain=False, max_statements=1)
+    bounded.install(engine)
+
+    with Session(engine) as db:
+        LeadRepository(db).read_all_db_leads(limit=10, offset=0)
+        LeadRepository(db).read_all_db_lead_summaries(limit=10, offset=0)
+
+    assert fast.top(10) == []
+    assert len(bounded.top(10)) == 1
+    assert bounded.top(10)[0]["explain"] is None
+    assert bounded.dropped >= 1
+    engine.dispose()
+
+
+def test_async_queries_are_tagged(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profiler.db'}")
+    profiler = QueryProfiler(threshold=0, explain=True, max_statements=100)
+    profiler.install(engine.sync_engine)
+
+    async def run() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            await AsyncLeadRepository(db).read_all_db_leads(limit=10, offset=0)
+        await engine.dispose()
+
+    asyncio.run(run())
+    callers = {query["caller"] for query in profiler.top(100)}
+    assert "AsyncLeadRepository.read_all_db_leads" in callers
+
+
+def test_slow_queries_endpoint():
+    client = TestClient(app)
+    response = client.get("/metrics/slow-queries", params={"limit": 5})
+    assert response.status_code == 200
+    assert {"enabled", "threshold_seconds", "dropped", "queries"} <= set(
+        response.json()
+    )
+    assert client.delete("/metrics/slow-queries").status_code == 204
+    assert query_profiler.top(5) == []
@@ -0,0 +1,126 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from ..config import settings
+from ..db.connection import Database
+from ..db.models import Base, DBLead
+from ..helpers.catalog_cache import catalog_cache
+from ..helpers.repositories import LeadRepository
+from ..helpers.response_cache import lead_response_cache
+from ..main import app
+import pytest
+
+
+def lead(nombre: str) -> DBLead:
+    return DBLead(
+        nombre=nombre,
+        apellido="Messi",
+        email=f"{nombre.lower()}@example.com",
+        direccion="Calle nro",
+        tel=12345678,
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    # Una base principal y dos réplicas con datos distintos para saber quién respondió
+    urls = [f"sqlite:///{tmp_path / name}.db" for name in ("primary", "one", "two")]
+    database = Database(urls[0], replica_urls=urls[1:])
+    for target in (database, *database.replicas.replicas):
+        Base.metadata.create_all(bind=target.engine)
+    for target, nombre in zip(database.replicas.replicas, ("One", "Two")):
+        with target.sessionmaker() as db:
+            LeadRepository(db).create_db_lead(lead(nombre))
+    try:
+        yield database
+    finally:
+        database.dispose()
+
+
+def read_name(database: Database, lead_id: int) -> str:
+    # Una sesión por lectura: el identity map devolvería el objeto ya cargado
+    with database.sessionmaker() as db:
+        return LeadRepository(db).read_db_lead(lead_id).nombre
+
+
+def test_reads_round_robin_over_replicas(database):
+    names = [read_name(database, 1) for _ in range(4)]
+    assert names == ["One", "Two", "One", "Two"]
+    assert [replica["reads"] for replica in database.replicas.snapshot()] == [2, 2]
+
+
+def test_writes_go_to_the_primary(database):
+    with database.sessionmaker() as db:
+        created = LeadRepository(db).create_db_lead(lead("Primary"))
+        assert created.nombre == "Primary"
+        assert db.execute(select(DBLead.nombre)).scalars().all() == ["Primary"]
+    for replica in database.replicas.replicas:
+        with replica.sessionmaker() as db:
+            assert db.execute(select(func.count(DBLead.lead_id))).scalar() == 1
+
+
+def test_primary_reads_skip_the_replicas(database):
+    with database.sessionmaker() as db:
+        LeadRepository(db).create_db_lead(lead("Primary"))
+    with database.sessionmaker(primary_reads=True) as db:
+        assert LeadRepository(db).read_db_lead(1).nombre == "Primary"
+    assert [replica["reads"] for replica in database.replicas.snapshot()] == [0, 0]
+
+
+def test_failed_replica_falls_back_to_the_primary(tmp_path, database, monkeypatch):
+    monkeypatch.setattr(settings, "replica_retry_interval", 60)
+    # SQLite no puede abrir un archivo en un directorio que no existe
+    dead = Database(f"sqlite:///{tmp_path / 'missing' / 'dead.db'}")
+    database.replicas.replicas[0] = dead
+    with database.sessionmaker() as db:
+        LeadRepository(db).create_db_lead(lead("Primary"))
+    names = [read_name(database, 1) for _ in range(3)]
+    # La réplica caída queda fuera de la rotación después del primer fallo
+    assert names == ["Primary", "Two", "Two"]
+    dead_snapshot, healthy_snapshot = database.replicas.snapshot()
+    assert not dead_snapshot["healthy"] and dead_snapshot["failures"] == 1
+    assert healthy_snapshot["healthy"] and healthy_snapshot["reads"] == 2
+    assert database.replicas.fallbacks == 1
+
+
+def test_write_sets_primary_reads_cookie(tmp_path, monkeypatch):
+    primary = f"sqlite:///{tmp_path / 'primary.db'}"
+    replica = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setattr(settings, "database_url", primary)
+    monkeypatch.setattr(settings, "replica_urls", [replica])
+    monkeypatch.setattr(settings, "replica_read_your_writes", 5)
+    try:
+        with TestClient(app) as client:
+            database = app.state.database
+            for target in (database, *database.replicas.replicas):
+                Base.metadata.create_all(bind=target.engine)
+
+            response = client.post(
+                "/leads",
+                json={
+                    "nombre": "Lionel",
+                    "apellido": "Messi",
+                    "email": "lionel.messi@example.com",
+                    "direccion": "Calle nro",
+                    "tel": 12345678,
+                    "cursados": [],
+                },
+            )
+            assert response.status_code == 200
+            assert "Max-Age=5" in response.headers["set-cookie"]
+            lead_id = response.json()["lead_id"]
+            # Con la cookie la lectura ve el lead recién creado en la principal
+            assert client.get(f"/leads/{lead_id}").status_code == 200
+
+            client.cookies.clear()
+            lead_response_cache.clear()
+            assert client.get(f"/leads/{lead_id}").status_code == 404
+            assert "set-cookie" not in client.get("/leads").headers
+            # La exportación abre su propia sesión, que también lee de la réplica
+            reads = client.get("/metrics/replicas").json()["replicas"][0]["reads"]
+            assert client.get("/leads/export").text == ""
+            metrics = client.get("/metrics/replicas").json()
+            assert metrics["replicas"][0]["reads"] > reads >= 1
+            assert metrics["replicas"][0]["url"] == replica
+    finally:
+        catalog_cache.clear()
+        lead_response_cache.clear()
@@ -0,0 +1,87 @@
+import re
+from typing import Generator
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ..config import settings
+from ..db.connection import get_db
+from ..helpers.request_metrics import (
+    InstrumentedORJSONResponse,
+    RequestMetricsMiddleware,
+    request_metrics,
+)
+from ..routers.leads import router as leads_router
+from ..routers.metrics import router as metrics_router
+import pytest
+
+
+@pytest.fixture
+def client(override_get_db) -> Generator[TestClient, None, None]:
+    app = FastAPI(default_response_class=InstrumentedORJSONResponse)
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(leads_router)
+    app.include_router(metrics_router)
+    app.dependency_overrides[get_db] = override_get_db
+    request_metrics.clear()
+    try:
+        yield TestClient(app)
+    finally:
+        request_metrics.clear()
+
+
+def metric(body: str, name: str, method: str, route: str, status: int) -> float:
+    labels = f'method="{method}",route="{route}",status="{status}"'
+    match = re.search(rf"^{name}\{{{re.escape(labels)}\}} (\S+)$", body, re.M)
+    assert match, f"{name} for {method} {route} not found"
+    return float(match.group(1))
+
+
+def test_metrics_per_route(client, make_lead):
+    assert client.post("/leads/", json=make_lead()).status_code == 200
+    for _ in range(2):
+        assert client.get("/leads/?limit=5").status_code == 200
+    assert client.get("/leads/999").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert metric(body, "http_requests_total", "GET", "/leads/", 200) == 2
+    assert metric(body, "http_request_db_statements_total", "GET", "/leads/", 200) > 0
+    assert metric(body, "http_request_db_seconds_total", "GET", "/leads/", 200) > 0
+    assert (
+        metric(body, "http_request_serialization_seconds_total", "GET", "/leads/", 200)
+        > 0
+    )
+    assert metric(body, "http_requests_total", "GET", "/leads/{lead_id}", 404) == 1
+    assert (
+        metric(body, "http_request_duration_seconds_count", "POST", "/leads/", 200) == 1
+    )
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/leads/",'
+        'status="200",le="+Inf"} 2' in body
+    )
+
+
+def test_server_timing_header(client, monkeypatch):
+    assert "Server-Timing" not in client.get("/leads/").headers
+    monkeypatch.setattr(settings, "server_timing", True)
+    header = client.get("/leads/").headers["Server-Timing"]
+    assert re.fullmatch(
+        r'total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+',
+        header,
+    )
+
+
+def test_query_budget_warning(client, make_lead, monkeypatch, caplog):
+    client.post("/leads/", json=make_lead())
+    monkeypatch.setattr(settings, "query_budget", 1)
+    monkeypatch.setattr(settings, "query_budgets", {"GET /leads/{lead_id}": 0})
+    client.get("/leads/1")
+    assert "over its budget" not in caplog.text
+
+    client.get("/leads/")
+    assert "GET /leads/ ran" in caplog.text
+    body = client.get("/metrics").text
+    assert (
+        metric(body, "http_request_query_budget_exceeded_total", "GET", "/leads/", 200)
+        == 1
+    )
@@ -0,0 +1,110 @@
+import fnmatch
+import time
+from ..db.models import DBLead
+from ..helpers.response_cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    lead_response_cache,
+)
+import pytest
+
+INPUT = {
+    "nombre": "Lionel",
+    "apellido": "Messi",
+    "email": "lionel.messi@example.com",
+    "direccion": "Calle nro",
+    "tel": 12345678,
+    "cursados": [
+        {
+            "año_cursado": 2024,
+            "carrera": {"nombre": "Engineering"},
+            "universidad": "University A",
+            "inscripciones": [
+                {"materia": {"nombre": "Mathematics"}, "veces_cursada": 1},
+            ],
+        }
+    ],
+}
+
+
+class FakeRedis:
+    """Cliente en memoria con el subconjunto de redis-py que usa RedisCacheBackend."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, name: str) -> bytes | None:
+        expires_at, value = self.data.get(name, (0, None))
+        return value if expires_at > time.monotonic() else None
+
+    def set(self, name: str, value: bytes, px: int) -> None:
+        self.data[name] = (time.monotonic() + px / 1000, value)
+
+    def delete(self, *names: str) -> None:
+        for name in names:
+            self.data.pop(name, None)
+
+    def scan_iter(self, match: str) -> list[str]:
+        return [name for name in self.data if fnmatch.fnmatch(name, match)]
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [MemoryCacheBackend(maxsize=2), RedisCacheBackend(FakeRedis())],
+    ids=["memory", "redis"],
+)
+def test_cache_backend(backend):
+    backend.set("a", b"1", ttl=60)
+    backend.set("b", b"2", ttl=0.01)
+    assert backend.get("a") == b"1"
+    time.sleep(0.02)
+    assert backend.get("b") is None
+
+    backend.delete(["a", "missing"])
+    assert backend.get("a") is None
+    backend.set("c", b"3", ttl=60)
+    backend.clear()
+    assert backend.get("c") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(maxsize=2)
+    backend.set("a", b"1", ttl=60)
+    backend.set("b", b"2", ttl=60)
+    backend.get("a")
+    backend.set("c", b"3", ttl=60)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+
+def test_get_lead_etag(client):
+    lead_id = client.post("/leads", json=INPUT).json()["lead_id"]
+
+    response = client.get(f"/leads/{lead_id}")
+    assert response.status_code == 200
+    assert response.json()["nombre"] == "Lionel"
+    etag = response.headers["etag"]
+
+    response = client.get(f"/leads/{lead_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = client.get(f"/leads/{lead_id}", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_get_lead_invalidated_on_write(client, session_factory):
+    lead_id = client.post("/leads", json=INPUT).json()["lead_id"]
+    etag = client.get(f"/leads/{lead_id}").headers["etag"]
+    assert lead_response_cache.get(lead_id) is not None
+
+    with session_factory() as db:
+        db.get(DBLead, lead_id).nombre = "Leo"
+        db.commit()
+    assert lead_response_cache.get(lead_id) is None
+
+    response = client.get(f"/leads/{lead_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["nombre"] == "Leo"
+    assert response.headers["etag"] != etag
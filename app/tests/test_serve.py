@@ -0,0 +1,57 @@
+import os
+import uvicorn
+from ..config import settings
+from .. import serve
+import pytest
+
+
+@pytest.fixture
+def uvicorn_run(monkeypatch) -> dict:
+    calls = {}
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kwargs: calls.update(kwargs))
+    monkeypatch.setattr(serve, "configure_logging", lambda: None)
+    # serve.main escribe WEB_CONCURRENCY; setenv hace que se restaure al terminar
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    return calls
+
+
+def test_serve_runs_workers(uvicorn_run, monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", None)
+    serve.main(["--workers", "3", "--port", "8080"])
+    assert uvicorn_run["workers"] == 3
+    assert uvicorn_run["port"] == 8080
+    assert (uvicorn_run["loop"], uvicorn_run["http"]) == ("uvloop", "httptools")
+    assert (
+        uvicorn_run["timeout_graceful_shutdown"] == settings.graceful_shutdown_timeout
+    )
+    # Los workers leen la cantidad de workers del entorno para dimensionar su pool
+    assert os.environ["WEB_CONCURRENCY"] == "3"
+
+
+def test_serve_defaults_to_web_concurrency(uvicorn_run, monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 2)
+    serve.main([])
+    assert uvicorn_run["workers"] == 2
+
+
+def test_serve_rejects_a_budget_below_one_connection_per_worker(
+    uvicorn_run, monkeypatch
+):
+    monkeypatch.setattr(settings, "db_max_connections", 2)
+    with pytest.raises(SystemExit):
+        serve.main(["--workers", "4"])
+    assert uvicorn_run == {}
+
+
+@pytest.mark.parametrize(
+    "setting, value", [("ingest_queue", True), ("ingest_spool_path", "spool.ndjson")]
+)
+def test_serve_rejects_the_ingest_queue_with_several_workers(
+    uvicorn_run, monkeypatch, setting, value
+):
+    monkeypatch.setattr(settings, setting, value)
+    with pytest.raises(SystemExit):
+        serve.main(["--workers", "2"])
+    assert uvicorn_run == {}
+    serve.main(["--workers", "1"])
+    assert uvicorn_run["workers"] == 1
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+from ..config import settings
+import pytest
+
+
+@pytest.fixture
+def leads(make_lead) -> list[dict]:
+    return [
+        make_lead(
+            email="lead0@example.com",
+            año=2023,
+            materias={"Anatomía": 1, "Física": 3},
+        ),
+        make_lead(email="lead1@example.com", materias={"Anatomía": 2}),
+        make_lead(email="lead2@example.com", carrera="Derecho", materias={}),
+    ]
+
+
+def all_stats(client: TestClient) -> dict:
+    stats = {}
+    for dimension in ("carreras", "materias", "years"):
+        response = client.get(f"/stats/{dimension}")
+        assert response.status_code == 200
+        stats[dimension] = response.json()
+    return stats
+
+
+def test_stats_group_by(client, leads):
+    for lead in leads:
+        assert client.post("/leads/", json=lead).status_code == 200
+
+    stats = all_stats(client)
+    assert [
+        (c["carrera"], c["cursados"], c["inscripciones"], c["promedio_veces_cursada"])
+        for c in stats["carreras"]
+    ] == [("Medicina", 2, 3, 2.0), ("Derecho", 1, 0, None)]
+    # Las materias nuevas de un lead se insertan en un orden arbitrario
+    assert sorted(
+        (m["materia"], m["carrera"], m["inscripciones"], m["promedio_veces_cursada"])
+        for m in stats["materias"]
+    ) == [("Anatomía", "Medicina", 2, 1.5), ("Física", "Medicina", 1, 3.0)]
+    assert [
+        (y["año_cursado"], y["cursados"], y["inscripciones"]) for y in stats["years"]
+    ] == [(2023, 1, 2), (2024, 2, 1)]
+
+
+def test_stats_summary_matches_group_by(client, leads, make_lead, monkeypatch):
+    monkeypatch.setattr(settings, "stats_summary", True)
+    for lead in leads[:2]:
+        assert client.post("/leads/", json=lead).status_code == 200
+    response = client.post(
+        "/leads/bulk",
+        json=[
+            leads[2],
+            make_lead(
+                email="lead3@example.com", carrera="Derecho", materias={"Civil": 4}
+            ),
+        ],
+    )
+    assert response.json()["created"] == 2
+    summary = all_stats(client)
+
+    monkeypatch.setattr(settings, "stats_summary", False)
+    assert summary == all_stats(client)
+
+
+def test_stats_summary_rebuild(client, leads, monkeypatch):
+    # Leads cargados con el resumen desactivado no se reflejan hasta el rebuild
+    for lead in leads:
+        assert client.post("/leads/", json=lead).status_code == 200
+    live = all_stats(client)
+
+    monkeypatch.setattr(settings, "stats_summary", True)
+    assert all_stats(client)["years"] == []
+    assert client.post("/stats/rebuild").status_code == 204
+    assert all_stats(client) == live
@@ -0,0 +1,68 @@
+"""
+Compara leads/seg cargando N leads con un POST /leads por lead contra un único
+POST /leads/bulk, sobre un archivo SQLite temporal (cada commit se escribe a disco).
+
+Uso: python -m benchmarks.bench_bulk_ingest [--leads N] [--batch-size B]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from app.db.connection import get_db
+from app.main import app
+
+from .common import file_engine, make_lead, session_factory
+
+
+def client_for_fresh_db(directory: str, name: str) -> TestClient:
+    SessionLocal = session_factory(file_engine(os.path.join(directory, name)))
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    # Se silencia el logging para no medirlo
+    logging.getLogger().setLevel(logging.WARNING)
+
+    payload = [make_lead(n).model_dump(mode="json") for n in range(args.leads)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = client_for_fresh_db(directory, "loop.db")
+        start = time.perf_counter()
+        for lead in payload:
+            assert client.post("/leads/", json=lead).status_code == 200
+        loop_rate = args.leads / (time.perf_counter() - start)
+
+        client = client_for_fresh_db(directory, "bulk.db")
+        start = time.perf_counter()
+        response = client.post(
+            "/leads/bulk", params={"batch_size": args.batch_size}, json=payload
+        )
+        bulk_rate = args.leads / (time.perf_counter() - start)
+        assert response.json()["created"] == args.leads
+
+    print(f"POST /leads loop: {loop_rate:9.1f} leads/s")
+    print(f"POST /leads/bulk: {bulk_rate:9.1f} leads/s ({bulk_rate / loop_rate:.1f}x)")
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Mide el arranque en frío de un worker: el import de app.main en un intérprete nuevo y
+el tiempo desde lanzar uvicorn hasta que responde GET / y hasta la primera respuesta de
+GET /leads/{lead_id}, sobre un archivo SQLite ya migrado.
+
+Cada proceso se lanza con el directorio de trabajo en una carpeta temporal, para
+detectar si el arranque escribe archivos (como el ./test.db que creaba el import de
+app.db.connection).
+
+Uso: python -m benchmarks.bench_cold_start [--runs N] [--json resultados.json]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .common import file_engine, make_lead, session_factory
+from .results import write_results
+
+REPO = Path(__file__).resolve().parents[1]
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def environment(path: str) -> dict:
+    return {
+        **os.environ,
+        "PYTHONPATH": str(REPO),
+        "DATABASE_URL": f"sqlite:///{path}",
+        "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{path}",
+    }
+
+
+def measure_import(path: str, cwd: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=cwd,
+        env=environment(path),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_startup(path: str, cwd: str, port: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=cwd,
+        env=environment(path),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # Un solo cliente: httpx.get arma un contexto SSL por llamada (~40 ms de CPU), que
+    # competiría con el arranque del servidor
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited, is port {port} in use?")
+            try:
+                client.get("/")
+                break
+            except httpx.TransportError:
+                time.sleep(0.005)
+        ready = time.perf_counter() - start
+        response = client.get("/leads/1")
+        assert response.status_code == 200, response.text
+        first_read = time.perf_counter() - start
+    finally:
+        client.close()
+        server.terminate()
+        server.wait()
+    return ready, first_read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--json", help="Archivo de resultados (- para stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cold_start.db")
+        engine = file_engine(path)
+        with session_factory(engine)() as db:
+            from app.helpers.services import LeadService
+
+            LeadService(db).create_lead(make_lead(0))
+        engine.dispose()
+
+        cwd = os.path.join(directory, "cwd")
+        os.mkdir(cwd)
+        imports = [measure_import(path, cwd) for _ in range(args.runs)]
+        startups = [measure_startup(path, cwd, args.port) for _ in range(args.runs)]
+        written = sorted(os.listdir(cwd))
+
+    results = {
+        "import app.main": {"median_ms": round(statistics.median(imports) * 1000, 1)},
+        "uvicorn ready": {
+            "median_ms": round(statistics.median(s[0] for s in startups) * 1000, 1)
+        },
+        "first GET /leads/{lead_id}": {
+            "median_ms": round(statistics.median(s[1] for s in startups) * 1000, 1)
+        },
+    }
+    for name, result in results.items():
+        print(f"{name:>28}: {result['median_ms']:8.1f} ms")
+    print(f"files written in the working directory: {written or 'none'}")
+    if args.json:
+        write_results(args.json, "cold_start", {"runs": args.runs}, results)
+
+
+if __name__ == "__main__":
+    main()
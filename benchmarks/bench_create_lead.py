@@ -0,0 +1,120 @@
+"""
+Cuenta sentencias SQL y tiempo por POST /leads con el camino anterior (un commit por
+entidad) y con el camino de una sola transacción de LeadService.create_lead.
+
+Uso: python -m benchmarks.bench_create_lead [--leads N] [--cursados C] [--materias M]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    DBCarrera,
+    DBCursado,
+    DBInscripcionMateria,
+    DBLead,
+    DBMateria,
+)
+from app.db.schemas import LeadCreate
+from app.helpers.repositories import (
+    CursadoRepository,
+    InscripcionMateriaRepository,
+    LeadRepository,
+)
+from app.helpers.services import LeadService
+
+from .common import count_statements, make_lead, memory_engine, session_factory
+
+
+def legacy_read_or_create(db: Session, model: type, **values) -> object:
+    """Lee la carrera o materia con esos valores o la crea con su propio commit."""
+    instance = db.execute(select(model).filter_by(**values)).scalar()
+    if instance is None:
+        instance = model(**values)
+        db.add(instance)
+        db.commit()
+        db.refresh(instance)
+    return instance
+
+
+def legacy_create_lead(db: Session, lead: LeadCreate) -> DBLead:
+    """Reproduce la creación anterior: commit y refresh después de cada entidad."""
+    db_lead = LeadRepository(db).create_db_lead(
+        DBLead(
+            nombre=lead.nombre,
+            apellido=lead.apellido,
+            email=lead.email,
+            direccion=lead.direccion,
+            tel=lead.tel,
+        )
+    )
+    for cursado in lead.cursados:
+        db_carrera = legacy_read_or_create(db, DBCarrera, nombre=cursado.carrera.nombre)
+        db_cursado = CursadoRepository(db).create_cursado(
+            DBCursado(
+                año_cursado=cursado.año_cursado,
+                carrera_id=db_carrera.carrera_id,
+                lead_id=db_lead.lead_id,
+                universidad=cursado.universidad,
+            )
+        )
+        for inscripcion in cursado.inscripciones:
+            db_materia = legacy_read_or_create(
+                db,
+                DBMateria,
+                nombre=inscripcion.materia.nombre,
+                carrera_id=db_carrera.carrera_id,
+            )
+            InscripcionMateriaRepository(db).create_inscripcion_materia(
+                DBInscripcionMateria(
+                    año_cursado=db_cursado.año_cursado,
+                    carrera_id=db_carrera.carrera_id,
+                    lead_id=db_lead.lead_id,
+                    materia_id=db_materia.materia_id,
+                    veces_cursada=inscripcion.veces_cursada,
+                )
+            )
+    return db_lead
+
+
+def unit_of_work_create_lead(db: Session, lead: LeadCreate) -> DBLead:
+    return LeadService(db).create_lead(lead)
+
+
+def run(create, leads: list[LeadCreate]) -> tuple[float, float]:
+    engine = memory_engine()
+    SessionLocal = session_factory(engine)
+    # El primer lead crea el catálogo; se mide el caso estable con catálogo existente.
+    with SessionLocal() as db:
+        create(db, leads[0]).lead_id
+    start = time.perf_counter()
+    with count_statements(engine) as counter:
+        for lead in leads[1:]:
+            with SessionLocal() as db:
+                create(db, lead).lead_id
+    elapsed = time.perf_counter() - start
+    n = len(leads) - 1
+    return counter.count / n, elapsed / n * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=200)
+    parser.add_argument("--cursados", type=int, default=3)
+    parser.add_argument("--materias", type=int, default=8)
+    args = parser.parse_args()
+
+    leads = [make_lead(n, args.cursados, args.materias) for n in range(args.leads + 1)]
+    for name, create in (
+        ("legacy", legacy_create_lead),
+        ("unit_of_work", unit_of_work_create_lead),
+    ):
+        statements, ms = run(create, leads)
+        print(f"{name:>14}: {statements:6.1f} statements/lead  {ms:7.3f} ms/lead")
+
+
+if __name__ == "__main__":
+    main()
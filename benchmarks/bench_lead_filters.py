@@ -0,0 +1,165 @@
+"""
+Mide los filtros de GET /leads (filter_leads) sobre una base SQLite con N leads, un
+cursado y 4 inscripciones por lead (6N filas en total), antes y después de la migración
+0003 que agrega los índices de apellido, materias.nombre y cursados.universidad.
+
+Cada consulta pide la primera página (view=summary) de un filtro selectivo, como hace
+GET /leads. El índice FULLTEXT de nombre/apellido sólo existe en MySQL; en SQLite q se
+resuelve por prefijo.
+
+Uso: python -m benchmarks.bench_lead_filters [--leads N] [--limit L]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, insert
+
+from app.db.models import (
+    DBCarrera,
+    DBCursado,
+    DBInscripcionMateria,
+    DBLead,
+    DBMateria,
+)
+from app.db.schemas import LeadFilters
+from app.helpers.repositories import LeadRepository
+
+from .common import session_factory
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+SEED_BATCH = 50_000
+CARRERAS = 200
+MATERIAS = 50
+UNIVERSIDADES = 500
+
+
+def seed(engine: Engine, leads: int) -> None:
+    rng = random.Random(0)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(DBCarrera), [{"nombre": f"Carrera {c}"} for c in range(CARRERAS)]
+        )
+        connection.execute(
+            insert(DBMateria),
+            [
+                {"carrera_id": c + 1, "nombre": f"Materia {c}-{m}"}
+                for c in range(CARRERAS)
+                for m in range(MATERIAS)
+            ],
+        )
+        for start in range(0, leads, SEED_BATCH):
+            batch = range(start, min(start + SEED_BATCH, leads))
+            cursados = [
+                {
+                    "lead_id": n + 1,
+                    "carrera_id": rng.randrange(CARRERAS) + 1,
+                    "año_cursado": 2000 + n % 25,
+                    "universidad": f"Universidad {rng.randrange(UNIVERSIDADES)}",
+                }
+                for n in batch
+            ]
+            connection.execute(
+                insert(DBLead),
+                [
+                    {
+                        "nombre": f"Nombre{n}",
+                        "apellido": f"Apellido{n}",
+                        "email": f"lead{n}@example.com",
+                        "tel": 1000000 + n,
+                    }
+                    for n in batch
+                ],
+            )
+            connection.execute(insert(DBCursado), cursados)
+            connection.execute(
+                insert(DBInscripcionMateria),
+                [
+                    {
+                        **{k: c[k] for k in ("lead_id", "carrera_id", "año_cursado")},
+                        "materia_id": (c["carrera_id"] - 1) * MATERIAS + m + 1,
+                        "veces_cursada": 1,
+                    }
+                    for c in cursados
+                    for m in rng.sample(range(MATERIAS), 4)
+                ],
+            )
+
+
+def cases(leads: int) -> dict[str, LeadFilters]:
+    n = leads // 2
+    return {
+        "email": LeadFilters(email=f"lead{n}@example.com"),
+        "apellido prefix": LeadFilters(apellido=f"Apellido{n}"),
+        "q prefix": LeadFilters(q=f"Nombre{n}"),
+        "carrera": LeadFilters(carrera="Carrera 7"),
+        "materia": LeadFilters(materia="Materia 7-3"),
+        "universidad": LeadFilters(universidad="Universidad 42"),
+        "carrera + año range": LeadFilters(
+            carrera="Carrera 7", año_desde=2010, año_hasta=2012
+        ),
+    }
+
+
+def measure(engine: Engine, args: argparse.Namespace) -> dict[str, float]:
+    SessionLocal = session_factory(engine)
+    results = {}
+    with SessionLocal() as db:
+        repository = LeadRepository(db)
+        for name, filters in cases(args.leads).items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = repository.read_all_db_lead_summaries(
+                    limit=args.limit, offset=0, filters=filters
+                )
+            results[name] = (time.perf_counter() - start) / args.repeat * 1000
+            assert rows, name
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'filters.db')}"
+        config = Config(ALEMBIC_INI)
+        config.set_main_option("sqlalchemy.url", url)
+        command.upgrade(config, "0002")
+        engine = create_engine(url)
+
+        start = time.perf_counter()
+        seed(engine, args.leads)
+        print(
+            f"seed: {args.leads} leads, {6 * args.leads} rows in "
+            f"{time.perf_counter() - start:.1f} s"
+        )
+
+        before = measure(engine, args)
+        start = time.perf_counter()
+        command.upgrade(config, "head")
+        print(f"migration 0002 -> 0003: {time.perf_counter() - start:.1f} s")
+        after = measure(engine, args)
+
+        for name in before:
+            print(
+                f"{name:>20}: {before[name]:9.3f} ms -> {after[name]:8.3f} ms"
+                f"  ({before[name] / after[name]:.0f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Mide el throughput de GET /leads/{lead_id} y POST /leads según la configuración del
+logging: el basicConfig(level=DEBUG) anterior (handler sincrónico, bibliotecas en
+DEBUG) contra la configuración de app.helpers.logs a INFO y a DEBUG, con y sin
+muestreo de los registros DEBUG.
+
+Los requests se envían en serie por ASGI (httpx.ASGITransport), con los middlewares de
+la aplicación, sobre una base SQLite en memoria. Los registros se escriben en un
+archivo temporal.
+
+Uso: python -m benchmarks.bench_logging [--requests N]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+import httpx
+from fastapi import FastAPI
+
+from app.db.connection import get_db
+from app.helpers.catalog_cache import catalog_cache
+from app.helpers.logs import (
+    LIBRARY_LOGGERS,
+    TEXT_FORMAT,
+    DebugSamplingFilter,
+    LocalQueueHandler,
+    RequestIdFilter,
+    RequestIdMiddleware,
+)
+from app.helpers.request_metrics import (
+    InstrumentedORJSONResponse,
+    RequestMetricsMiddleware,
+)
+from app.helpers.response_cache import lead_response_cache
+from app.routers.leads import router as leads_router
+
+from .common import make_lead, memory_engine, session_factory
+
+CONFIGURATIONS = {
+    "basicConfig DEBUG (antes)": dict(level="DEBUG", library="DEBUG", queued=False),
+    "queue INFO": dict(level="INFO", library="WARNING", queued=True),
+    "queue DEBUG": dict(level="DEBUG", library="WARNING", queued=True),
+    "queue DEBUG, muestreo 1%": dict(
+        level="DEBUG", library="WARNING", queued=True, sample_rate=0.01
+    ),
+}
+
+
+def configure(
+    path: str, level: str, library: str, queued: bool, sample_rate: float = 1
+) -> QueueListener | None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(library)
+
+    output = logging.FileHandler(path)
+    output.setFormatter(logging.Formatter(TEXT_FORMAT))
+    output.addFilter(RequestIdFilter())
+    if not queued:
+        root.addHandler(output)
+        return None
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = LocalQueueHandler(records)
+    handler.addFilter(RequestIdFilter())
+    if sample_rate < 1:
+        handler.addFilter(DebugSamplingFilter(sample_rate))
+    root.addHandler(handler)
+    listener = QueueListener(records, output)
+    listener.start()
+    return listener
+
+
+def build_app() -> FastAPI:
+    SessionLocal = session_factory(memory_engine())
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI(default_response_class=InstrumentedORJSONResponse)
+    app.add_middleware(RequestMetricsMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    app.include_router(leads_router)
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        body = make_lead(0, cursados=1, materias=2).model_dump()
+        lead_id = (await c.post("/leads/", json=body)).json()["lead_id"]
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await c.get(f"/leads/{lead_id}")
+            assert response.status_code == 200
+        reads = requests / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for n in range(1, requests + 1):
+            body = make_lead(n, cursados=1, materias=2).model_dump()
+            response = await c.post("/leads/", json=body)
+            assert response.status_code == 200
+        creates = requests / (time.perf_counter() - start)
+    return reads, creates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, options in CONFIGURATIONS.items():
+            path = os.path.join(directory, "bench.log")
+            listener = configure(path, **options)
+            reads, creates = asyncio.run(measure(build_app(), args.requests))
+            if listener is not None:
+                listener.stop()
+            configure(os.devnull, "WARNING", "WARNING", queued=False)
+            catalog_cache.clear()
+            lead_response_cache.clear()
+            print(
+                f"{name:>26}: GET {reads:7.0f} req/s, POST {creates:6.0f} req/s, "
+                f"log {os.path.getsize(path) / 1e6:6.1f} MB"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
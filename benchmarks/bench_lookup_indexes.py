@@ -0,0 +1,160 @@
+"""
+Mide las búsquedas por igualdad sobre leads.email, carreras.nombre y
+materias.(carrera_id, nombre) en una base SQLite con N leads, antes y después de la
+migración 0002 que agrega sus índices y constraints únicos. También mide el tiempo de
+la migración y la resolución del catálogo con insert_ignore_statement.
+
+Uso: python -m benchmarks.bench_lookup_indexes [--leads N] [--carreras C] [--materias M]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, create_engine, insert, select
+
+from app.db.models import DBCarrera, DBLead, DBMateria
+from app.helpers.catalog_cache import LRUCache
+from app.helpers.repositories import CarreraRepository, MateriaRepository
+
+from .common import session_factory
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+SEED_BATCH = 50_000
+
+
+def seed(engine: Engine, leads: int, carreras: int, materias: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            insert(DBCarrera), [{"nombre": f"Carrera {c}"} for c in range(carreras)]
+        )
+        connection.execute(
+            insert(DBMateria),
+            [
+                {"carrera_id": c + 1, "nombre": f"Materia {m}"}
+                for c in range(carreras)
+                for m in range(materias)
+            ],
+        )
+        for start in range(0, leads, SEED_BATCH):
+            connection.execute(
+                insert(DBLead),
+                [
+                    {
+                        "nombre": f"Nombre{n}",
+                        "apellido": f"Apellido{n}",
+                        "email": f"lead{n}@example.com",
+                        "tel": 1000000 + n,
+                    }
+                    for n in range(start, min(start + SEED_BATCH, leads))
+                ],
+            )
+
+
+def per_call_ms(fn: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def measure(engine: Engine, args: argparse.Namespace, calls: int) -> dict[str, float]:
+    rng = random.Random(0)
+    SessionLocal = session_factory(engine)
+    with SessionLocal() as db:
+        results = {
+            "leads.email": per_call_ms(
+                lambda: db.execute(
+                    select(DBLead.lead_id).where(
+                        DBLead.email == f"lead{rng.randrange(args.leads)}@example.com"
+                    )
+                ).all(),
+                calls,
+            ),
+            "carreras.nombre": per_call_ms(
+                lambda: db.execute(
+                    select(DBCarrera.carrera_id).where(
+                        DBCarrera.nombre == f"Carrera {rng.randrange(args.carreras)}"
+                    )
+                ).all(),
+                calls,
+            ),
+            "materias.(carrera_id, nombre)": per_call_ms(
+                lambda: db.execute(
+                    select(DBMateria.materia_id).where(
+                        DBMateria.carrera_id == rng.randrange(args.carreras) + 1,
+                        DBMateria.nombre == f"Materia {rng.randrange(args.materias)}",
+                    )
+                ).all(),
+                calls,
+            ),
+        }
+    return results
+
+
+def measure_catalog(engine: Engine, args: argparse.Namespace, calls: int) -> float:
+    """Resuelve sin cache una carrera y 8 materias, la mitad nuevas, por llamada."""
+    SessionLocal = session_factory(engine)
+    start = time.perf_counter()
+    for n in range(calls):
+        with SessionLocal() as db:
+            carrera_ids = CarreraRepository(
+                db, cache=LRUCache(0)
+            ).read_or_create_carrera_ids([f"Carrera {n % args.carreras}"])
+            carrera_id = next(iter(carrera_ids.values()))
+            MateriaRepository(db, cache=LRUCache(0)).read_or_create_materia_ids(
+                [(carrera_id, f"Materia {m}") for m in range(4)]
+                + [(carrera_id, f"Nueva {n}-{m}") for m in range(4)]
+            )
+            db.commit()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--carreras", type=int, default=200)
+    parser.add_argument("--materias", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'lookup.db')}"
+        config = Config(ALEMBIC_INI)
+        config.set_main_option("sqlalchemy.url", url)
+        command.upgrade(config, "0001")
+        engine = create_engine(url)
+
+        start = time.perf_counter()
+        seed(engine, args.leads, args.carreras, args.materias)
+        print(f"seed: {args.leads} leads in {time.perf_counter() - start:.1f} s")
+
+        before = measure(engine, args, args.calls)
+        start = time.perf_counter()
+        command.upgrade(config, "head")
+        print(f"migration 0001 -> 0002: {time.perf_counter() - start:.1f} s")
+        after = measure(engine, args, args.calls)
+
+        for column in before:
+            print(
+                f"{column:>30}: {before[column]:8.3f} ms -> {after[column]:7.3f} ms"
+                f"  ({before[column] / after[column]:.0f}x)"
+            )
+        print(
+            f"{'catalog upsert':>30}: "
+            f"{measure_catalog(engine, args, args.calls):.3f} ms/lead"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compara los dos modelos de lectura de GET /leads (LEAD_READ_MODEL) sobre una página con
+todos los leads de un archivo SQLite sembrado con benchmarks.datagen (por defecto 10000
+leads con 1-3 cursados y 2-8 inscripciones por cursado):
+
+- orm: LeadRepository.read_all_db_leads (entidades DBLead con selectinload) y
+  serialize_leads.
+- rows: LeadRowRepository.read_all_lead_rows (una consulta Core agrupada en LeadRow) y
+  serialize_lead_rows.
+
+Cada ronda usa una sesión nueva, para que el identity map no ahorre la hidratación. Se
+informa la mediana de la lectura y de la serialización, leads/seg de ambas juntas, y la
+memoria que ocupan los objetos leídos (retenida mientras se serializan y pico durante la
+lectura, medidas con tracemalloc en una ronda aparte) escalada a 10000 leads.
+
+Uso: python -m benchmarks.bench_read_model [--leads N] [--repeat R]
+[--json resultados.json]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import gc
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Sequence
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.helpers.repositories import LeadRepository, LeadRowRepository
+from app.helpers.serialization import serialize_lead_rows, serialize_leads
+
+from .common import file_engine, session_factory
+from .datagen import generate_leads, seed_database
+from .results import write_results
+
+MODELS: dict[str, tuple[Callable[[Session, int], Sequence], Callable]] = {
+    "orm": (
+        lambda db, leads: LeadRepository(db).read_all_db_leads(limit=leads, offset=0),
+        serialize_leads,
+    ),
+    "rows": (
+        lambda db, leads: LeadRowRepository(db).read_all_lead_rows(
+            limit=leads, offset=0
+        ),
+        serialize_lead_rows,
+    ),
+}
+
+
+def measure_time(
+    SessionLocal: sessionmaker, model: str, leads: int, repeat: int
+) -> dict:
+    read, serialize = MODELS[model]
+    reads, serializations = [], []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            page = read(db, leads)
+            read_end = time.perf_counter()
+            serialize(page)
+            serializations.append(time.perf_counter() - read_end)
+            reads.append(read_end - start)
+        assert len(page) == leads
+        del page
+    read_s, serialize_s = statistics.median(reads), statistics.median(serializations)
+    return {
+        "read_ms": round(read_s * 1000, 1),
+        "serialize_ms": round(serialize_s * 1000, 1),
+        "leads_per_sec": round(leads / (read_s + serialize_s)),
+    }
+
+
+def measure_memory(SessionLocal: sessionmaker, model: str, leads: int) -> dict:
+    read, _ = MODELS[model]
+    scale = 10_000 / leads / 2**20
+    with SessionLocal() as db:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            # Lo retenido incluye lo que la sesión guarda de cada entidad
+            page = read(db, leads)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del page
+    return {
+        "retained_per_10k_mb": round((current - base) * scale, 1),
+        "peak_per_10k_mb": round((peak - base) * scale, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Archivo de resultados (- para stdout)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        engine = file_engine(os.path.join(directory, "read_model.db"))
+        seed_database(engine, generate_leads(args.leads))
+        SessionLocal = session_factory(engine)
+        for model in MODELS:
+            result = measure_time(SessionLocal, model, args.leads, args.repeat)
+            result.update(measure_memory(SessionLocal, model, args.leads))
+            results[model] = result
+            print(
+                f"{model:>4}: read {result['read_ms']:8.1f} ms, "
+                f"serialize {result['serialize_ms']:7.1f} ms, "
+                f"{result['leads_per_sec']:7d} leads/s, "
+                f"{result['retained_per_10k_mb']:6.1f} MB retained "
+                f"({result['peak_per_10k_mb']:6.1f} MB peak) per 10k leads"
+            )
+        engine.dispose()
+
+    orm, rows = results["orm"], results["rows"]
+    print(
+        f"rows vs orm: {rows['leads_per_sec'] / orm['leads_per_sec']:.1f}x leads/s, "
+        f"{orm['retained_per_10k_mb'] / rows['retained_per_10k_mb']:.1f}x less "
+        "retained memory"
+    )
+    if args.json:
+        write_results(
+            args.json,
+            "read_model",
+            {"leads": args.leads, "repeat": args.repeat},
+            results,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Microbenchmarks de cada método de los repositorios de app/helpers/repositories.py,
+sobre un archivo SQLite sembrado con benchmarks.datagen (por defecto 10000 leads con
+1-3 cursados y 2-8 inscripciones por cursado).
+
+Cada caso se ejecuta --repeat rondas de --number llamadas (las lecturas completas de
+tablas, una llamada por ronda); se informa la mediana y el mínimo por llamada, y las
+sentencias SQL por llamada. Las escrituras que no confirman la transacción se miden
+junto con su commit. Se ejecutan después de las lecturas, porque agregan filas.
+
+Uso: python -m benchmarks.bench_repositories [--leads N] [--repeat R] [--number K]
+[--only PREFIJO] [--json resultados.json]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.db.models import DBCursado, DBLead
+from app.db.schemas import LeadFilters
+from app.helpers.catalog_cache import LRUCache
+from app.helpers.idempotency import build_idempotency_record
+from app.helpers.repositories import (
+    CarreraRepository,
+    CursadoRepository,
+    IdempotencyRepository,
+    InscripcionMateriaRepository,
+    LeadRepository,
+    LeadRowRepository,
+    MateriaRepository,
+    StatsRepository,
+    normalize_email,
+)
+
+from .common import count_statements, file_engine, session_factory
+from .datagen import generate_leads, seed_database
+from .results import write_results
+
+# Casos que leen tablas completas: una llamada por ronda
+FULL_SCANS = (
+    "CursadoRepository.read_cursado",
+    "InscripcionMateriaRepository.read_inscripcion_materia",
+    "StatsRepository.read_carrera_stats",
+    "StatsRepository.read_materia_stats",
+    "StatsRepository.read_year_stats",
+    "LeadRepository.stream_lead_rows",
+)
+
+
+def read_cases(db: Session, leads: int) -> dict[str, Callable[[], object]]:
+    rng = random.Random(1)
+    lead_ids = lambda: rng.randint(1, leads)  # noqa: E731
+    leads_repo = LeadRepository(db)
+    carreras = CarreraRepository(db)
+    materias = MateriaRepository(db)
+    stats = StatsRepository(db)
+    idempotency = IdempotencyRepository(db)
+    carrera_id = carreras.read_or_create_carrera_ids(["Carrera 7"])["Carrera 7"]
+    db.add(build_idempotency_record("bench-key", "0" * 64, 1))
+    db.commit()
+
+    def first_batch() -> object:
+        return next(iter(leads_repo.stream_lead_rows(1000)))
+
+    def uncached_carrera_ids() -> object:
+        repo = CarreraRepository(db, cache=LRUCache(100))
+        return repo.read_or_create_carrera_ids(f"Carrera {c}" for c in range(10))
+
+    def uncached_materia_ids() -> object:
+        repo = MateriaRepository(db, cache=LRUCache(100))
+        return repo.read_or_create_materia_ids(
+            (carrera_id, f"Materia 7-{m}") for m in range(10)
+        )
+
+    return {
+        "LeadRepository.read_all_db_leads": lambda: leads_repo.read_all_db_leads(
+            limit=100, offset=0
+        ),
+        "LeadRepository.read_all_db_leads (after_lead_id)": lambda: (
+            leads_repo.read_all_db_leads(
+                limit=100, offset=0, after_lead_id=lead_ids() // 2
+            )
+        ),
+        "LeadRepository.read_all_db_leads (carrera)": lambda: (
+            leads_repo.read_all_db_leads(
+                limit=100, offset=0, filters=LeadFilters(carrera="Carrera 7")
+            )
+        ),
+        "LeadRowRepository.read_all_lead_rows": lambda: (
+            LeadRowRepository(db).read_all_lead_rows(limit=100, offset=0)
+        ),
+        "LeadRepository.read_all_db_lead_summaries": lambda: (
+            leads_repo.read_all_db_lead_summaries(limit=100, offset=0)
+        ),
+        "LeadRepository.read_db_lead": lambda: leads_repo.read_db_lead(lead_ids()),
+        "LeadRepository.find_duplicates": lambda: leads_repo.find_duplicates(
+            {normalize_email(f"lead{lead_ids()}@example.com")},
+            {str(1000000 + lead_ids())},
+        ),
+        "LeadRepository.stream_lead_rows": first_batch,
+        "CarreraRepository.read_or_create_carrera_ids (cache)": lambda: (
+            carreras.read_or_create_carrera_ids(f"Carrera {c}" for c in range(10))
+        ),
+        "CarreraRepository.read_or_create_carrera_ids": uncached_carrera_ids,
+        "MateriaRepository.read_or_create_materia_ids (cache)": lambda: (
+            materias.read_or_create_materia_ids(
+                (carrera_id, f"Materia 7-{m}") for m in range(10)
+            )
+        ),
+        "MateriaRepository.read_or_create_materia_ids": uncached_materia_ids,
+        "IdempotencyRepository.read_record": lambda: idempotency.read_record(
+            "bench-key"
+        ),
+        "CursadoRepository.read_cursado": lambda: CursadoRepository(db).read_cursado(),
+        "InscripcionMateriaRepository.read_inscripcion_materia": lambda: (
+            InscripcionMateriaRepository(db).read_inscripcion_materia()
+        ),
+        "StatsRepository.read_carrera_stats": lambda: stats.read_carrera_stats(False),
+        "StatsRepository.read_materia_stats": lambda: stats.read_materia_stats(False),
+        "StatsRepository.read_year_stats": lambda: stats.read_year_stats(False),
+        "StatsRepository.read_carrera_stats (summary)": lambda: (
+            stats.read_carrera_stats(True)
+        ),
+    }
+
+
+def write_cases(db: Session, leads: int) -> dict[str, Callable[[], object]]:
+    numbers = itertools.count(leads + 1)
+    # Años fuera del rango de datagen, para que cada cursado nuevo tenga otra clave
+    años = itertools.count(3000)
+    inserted_cursados: list[dict] = []
+    carrera_id = CarreraRepository(db).read_or_create_carrera_ids(["Carrera 7"])[
+        "Carrera 7"
+    ]
+    materia_id = MateriaRepository(db).read_or_create_materia_ids(
+        [(carrera_id, "Materia 7-3")]
+    )[(carrera_id, "Materia 7-3")]
+    db.commit()
+
+    def new_lead() -> DBLead:
+        n = next(numbers)
+        return DBLead(
+            nombre=f"Nombre{n}",
+            apellido=f"Apellido{n}",
+            email=f"lead{n}@example.com",
+            tel=str(1000000 + n),
+        )
+
+    def bulk_create_db_leads() -> object:
+        LeadRepository(db).bulk_create_db_leads([new_lead() for _ in range(100)])
+        db.commit()
+
+    def cursado_rows() -> list[dict]:
+        año = next(años)
+        return [
+            {"año_cursado": año, "carrera_id": carrera_id, "lead_id": lead_id}
+            for lead_id in range(1, 101)
+        ]
+
+    def bulk_insert_cursados() -> object:
+        rows = cursado_rows()
+        CursadoRepository(db).bulk_insert_cursados(rows)
+        db.commit()
+        inserted_cursados.append(rows)
+
+    def bulk_insert_inscripciones() -> object:
+        # Sobre cursados ya insertados, para respetar la FK
+        if inserted_cursados:
+            rows = inserted_cursados.pop()
+        else:
+            rows = cursado_rows()
+            CursadoRepository(db).bulk_insert_cursados(rows)
+        InscripcionMateriaRepository(db).bulk_insert_inscripciones(
+            [{**row, "materia_id": materia_id, "veces_cursada": 1} for row in rows]
+        )
+        db.commit()
+
+    def create_cursado() -> object:
+        return CursadoRepository(db).create_cursado(
+            DBCursado(año_cursado=next(años), carrera_id=carrera_id, lead_id=1)
+        )
+
+    def increment_summary() -> object:
+        StatsRepository(db).increment_summary(
+            [(carrera_id, 2024)], [(carrera_id, materia_id, 2024, 1)]
+        )
+        db.commit()
+
+    def create_idempotency_record() -> object:
+        repo = IdempotencyRepository(db)
+        repo.create_record(
+            build_idempotency_record(f"key-{next(numbers)}", "0" * 64, 1)
+        )
+        db.commit()
+
+    return {
+        "LeadRepository.create_db_lead": lambda: LeadRepository(db).create_db_lead(
+            new_lead()
+        ),
+        "LeadRepository.bulk_create_db_leads (100)": bulk_create_db_leads,
+        "CursadoRepository.create_cursado": create_cursado,
+        "CursadoRepository.bulk_insert_cursados (100)": bulk_insert_cursados,
+        "InscripcionMateriaRepository.bulk_insert_inscripciones (100)": (
+            bulk_insert_inscripciones
+        ),
+        "StatsRepository.increment_summary": increment_summary,
+        "IdempotencyRepository.create_record": create_idempotency_record,
+    }
+
+
+def measure(
+    engine: Engine, operation: Callable[[], object], number: int, repeat: int
+) -> dict:
+    operation()
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        rounds.append((time.perf_counter() - start) / number)
+    with count_statements(engine) as counter:
+        operation()
+    return {
+        "median_us": round(statistics.median(rounds) * 1e6, 1),
+        "min_us": round(min(rounds) * 1e6, 1),
+        "statements": counter.count,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--only", default="", help="Sólo los casos con este prefijo")
+    parser.add_argument("--json", help="Archivo de resultados (- para stdout)")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        engine = file_engine(os.path.join(directory, "repositories.db"))
+        start = time.perf_counter()
+        seed_database(engine, generate_leads(args.leads))
+        print(f"seed: {args.leads} leads in {time.perf_counter() - start:.1f} s")
+
+        with session_factory(engine)() as db:
+            # Las lecturas antes que las escrituras, sobre la base recién sembrada
+            for cases in (read_cases, write_cases):
+                for name, operation in cases(db, args.leads).items():
+                    if not name.startswith(args.only):
+                        continue
+                    number = 1 if name in FULL_SCANS else args.number
+                    results[name] = measure(engine, operation, number, args.repeat)
+                    result = results[name]
+                    print(
+                        f"{name:>62}: {result['median_us']:11.1f} us "
+                        f"(min {result['min_us']:11.1f}), "
+                        f"{result['statements']} statements"
+                    )
+                    # No acumular en el identity map los objetos leídos o creados
+                    db.expunge_all()
+        engine.dispose()
+
+    if args.json:
+        write_results(
+            args.json,
+            "repositories",
+            {"leads": args.leads, "repeat": args.repeat, "number": args.number},
+            results,
+        )
+
+
+if __name__ == "__main__":
+    main()
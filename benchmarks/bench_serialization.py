@@ -0,0 +1,84 @@
+"""
+Compara el costo de serializar 1000 leads (con cursados e inscripciones) como respuesta
+de GET /leads:
+
+- default: lo que hace FastAPI con un response_model y JSONResponse: valida el grafo
+  ORM contra List[Lead], lo pasa por jsonable_encoder y lo codifica con json.dumps.
+- orjson_response: igual, pero codificado con ORJSONResponse.
+- serialize_leads: una validación y dump_json de pydantic, directo a bytes.
+
+Los leads se cargan una vez desde una base SQLite en memoria; se mide sólo la
+serialización.
+
+Uso: python -m benchmarks.bench_serialization [--leads N] [--repeat R]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.db.schemas import Lead
+from app.helpers.repositories import LeadRepository
+from app.helpers.serialization import serialize_leads
+from app.helpers.services import LeadService
+
+from .common import make_lead, memory_engine, session_factory
+
+RESPONSE_ADAPTER = TypeAdapter(List[Lead])
+
+
+def default_response(leads) -> bytes:
+    content = RESPONSE_ADAPTER.validate_python(leads, from_attributes=True)
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def orjson_response(leads) -> bytes:
+    content = RESPONSE_ADAPTER.validate_python(leads, from_attributes=True)
+    return ORJSONResponse(jsonable_encoder(content)).body
+
+
+def best_ms(fn: Callable[[list], bytes], leads: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(leads)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    engine = memory_engine()
+    SessionLocal = session_factory(engine)
+    with SessionLocal() as db:
+        LeadService(db).create_leads_bulk(
+            [make_lead(n).model_dump() for n in range(args.leads)], batch_size=1000
+        )
+    with SessionLocal() as db:
+        leads = LeadRepository(db).read_all_db_leads(limit=args.leads, offset=0)
+        assert default_response(leads) == serialize_leads(leads)
+
+        baseline = None
+        for name, fn in (
+            ("default", default_response),
+            ("orjson_response", orjson_response),
+            ("serialize_leads", serialize_leads),
+        ):
+            ms = best_ms(fn, leads, args.repeat) * 1000 / len(leads)
+            baseline = baseline or ms
+            print(f"{name:>16}: {ms:7.2f} ms per 1k leads  ({baseline / ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compara las consultas de /stats con GROUP BY sobre cursados e inscripciones contra las
+tablas de resumen, sobre una base SQLite con N leads (un cursado y 4 inscripciones por
+lead, como bench_lead_filters). También mide el costo de mantener el resumen en
+LeadService.create_lead.
+
+Uso: python -m benchmarks.bench_stats [--leads N] [--creates C]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+
+from app.config import settings
+from app.helpers.services import LeadService, StatsService
+
+from .bench_lead_filters import seed
+from .common import make_lead, session_factory
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1_000_000)
+    parser.add_argument("--creates", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'stats.db')}"
+        config = Config(ALEMBIC_INI)
+        config.set_main_option("sqlalchemy.url", url)
+        command.upgrade(config, "head")
+        engine = create_engine(url)
+        SessionLocal = session_factory(engine)
+
+        start = time.perf_counter()
+        seed(engine, args.leads)
+        with SessionLocal() as db:
+            StatsService(db).rebuild_summary()
+        print(
+            f"seed + rebuild: {args.leads} leads in {time.perf_counter() - start:.1f} s"
+        )
+
+        for dimension in ("carreras", "materias", "years"):
+            timings = {}
+            for summary in (False, True):
+                settings.stats_summary = summary
+                with SessionLocal() as db:
+                    start = time.perf_counter()
+                    for _ in range(args.repeat):
+                        rows = StatsService(db).read_stats(dimension)
+                    timings[summary] = (time.perf_counter() - start) / args.repeat
+            print(
+                f"{dimension:>9} ({len(rows)} rows): group by "
+                f"{timings[False] * 1000:9.1f} ms -> summary "
+                f"{timings[True] * 1000:7.1f} ms  ({timings[False] / timings[True]:.0f}x)"
+            )
+
+        for summary in (False, True):
+            settings.stats_summary = summary
+            start = time.perf_counter()
+            with SessionLocal() as db:
+                service = LeadService(db)
+                for n in range(args.creates):
+                    service.create_lead(
+                        make_lead(args.leads + n, cursados=1, materias=4)
+                    )
+            elapsed = (time.perf_counter() - start) / args.creates * 1000
+            print(f"create_lead, stats_summary={summary}: {elapsed:.2f} ms/lead")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compara GET /leads?view=full contra GET /leads?view=summary con páginas grandes,
+recorriendo con cursor una base SQLite en archivo con N leads (3 cursados x 8
+inscripciones cada uno).
+
+Uso: python -m benchmarks.bench_summary_view [--leads N] [--limit L]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from app.db.connection import get_db
+from app.helpers.services import LeadService
+from app.main import app
+
+from .common import count_statements, file_engine, make_lead, session_factory
+
+
+def walk(client: TestClient, view: str, limit: int) -> tuple[int, int]:
+    """Recorre todas las páginas; devuelve la cantidad de leads y de bytes leídos."""
+    leads = transferred = 0
+    params = {"limit": limit, "view": view}
+    while True:
+        response = client.get("/leads/", params=params)
+        assert response.status_code == 200
+        leads += len(response.json())
+        transferred += len(response.content)
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            return leads, transferred
+        params = {**params, "cursor": next_cursor}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = file_engine(os.path.join(directory, "summary.db"))
+        SessionLocal = session_factory(engine)
+        with SessionLocal() as db:
+            LeadService(db).create_leads_bulk(
+                [make_lead(n).model_dump() for n in range(args.leads)],
+                batch_size=1000,
+            )
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+
+        rates = {}
+        for view in ("full", "summary"):
+            with count_statements(engine) as statements:
+                start = time.perf_counter()
+                leads, transferred = walk(client, view, args.limit)
+                elapsed = time.perf_counter() - start
+            assert leads == args.leads
+            rates[view] = leads / elapsed
+            print(
+                f"{view:>8}: {rates[view]:9.0f} leads/s  "
+                f"{transferred / leads:6.0f} bytes/lead  "
+                f"{statements.count} statements"
+            )
+        print(f"summary/full: {rates['summary'] / rates['full']:.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Escalado del throughput con la cantidad de workers de python -m app.serve: para cada
+valor de --workers levanta el servidor sobre un archivo SQLite sembrado con
+benchmarks.datagen y ejecuta el escenario de benchmarks.load_mixed (por defecto sólo
+lecturas: en SQLite las escrituras de varios procesos se serializan en el lock del
+archivo).
+
+Informa requests/seg, p50/p99 y la eficiencia respecto de un worker (requests/seg con N
+workers sobre N veces los de uno). El generador de carga corre en un solo proceso de
+esta misma máquina y ocupa un núcleo, así que la escala es representativa mientras
+haya más núcleos que workers.
+
+Uso: python -m benchmarks.bench_workers [--workers 1,2,4] [--clients 64]
+[--requests 5000] [--leads 5000] [--write-ratio 0] [--json resultados.json]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+
+from .common import file_engine
+from .datagen import generate_leads, seed_database
+from .load_mixed import load
+from .results import write_results
+
+
+def default_workers() -> str:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return ",".join(map(str, counts))
+
+
+def start_workers(path: str, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.serve",
+            "--workers",
+            str(workers),
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--timeout-keep-alive",
+            "120",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    # El socket acepta conexiones en cuanto arranca el primer worker: se espera a que
+    # todos completen el lifespan
+    started = 0
+    for line in server.stderr:
+        started += "Application startup complete" in line
+        if started == workers:
+            # Se sigue leyendo para que el pipe no se llene y bloquee al servidor
+            threading.Thread(target=server.stderr.read, daemon=True).start()
+            return server
+    server.wait()
+    raise RuntimeError(f"app.serve exited, is port {port} in use?")
+
+
+def stop(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGTERM)
+    server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default=default_workers())
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--leads", type=int, default=5000)
+    parser.add_argument("--write-ratio", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--json", help="Archivo de resultados (- para stdout)")
+    args = parser.parse_args()
+    counts = [int(count) for count in args.workers.split(",")]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "workers.db")
+        engine = file_engine(path)
+        seed_database(engine, generate_leads(args.leads))
+        engine.dispose()
+        for workers in counts:
+            server = start_workers(path, args.port, workers)
+            try:
+                result = asyncio.run(
+                    load(
+                        f"http://127.0.0.1:{args.port}",
+                        args.clients,
+                        args.requests,
+                        args.leads,
+                        args.write_ratio,
+                        args.timeout,
+                    )
+                )["all"]
+            finally:
+                stop(server)
+            single = results.get("workers=1", result)["requests_per_sec"]
+            result["efficiency"] = round(
+                result["requests_per_sec"] / (workers * single), 2
+            )
+            results[f"workers={workers}"] = result
+            print(
+                f"{workers:3d} workers: {result['requests_per_sec']:8.1f} req/s, "
+                f"p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, "
+                f"efficiency {result['efficiency']:.2f}, {result['errors']} errors"
+            )
+
+    if args.json:
+        params = {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("json", "port", "timeout")
+        }
+        write_results(args.json, "workers", params, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Utilidades compartidas por los benchmarks."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import Engine, StaticPool, create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import Base
+from app.db.schemas import LeadCreate
+
+
+def memory_engine() -> Engine:
+    """Crea un engine SQLite en memoria con el esquema ya construido."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def file_engine(path: str) -> Engine:
+    """
+    Crea un engine SQLite sobre un archivo con el esquema ya construido. A diferencia
+    de la base en memoria, cada commit paga la escritura a disco, como en MySQL.
+    """
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def session_factory(engine: Engine) -> sessionmaker[Session]:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class StatementCounter:
+    """Cuenta las sentencias SQL ejecutadas por un engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args) -> None:
+        self.count += 1
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[StatementCounter]:
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def make_lead(n: int, cursados: int = 3, materias: int = 8) -> LeadCreate:
+    """Arma un LeadCreate sintético con el fan-out indicado."""
+    return LeadCreate(
+        nombre=f"Nombre{n}",
+        apellido=f"Apellido{n}",
+        email=f"lead{n}@example.com",
+        direccion="Calle 123",
+        tel=1000000 + n,
+        cursados=[
+            {
+                "carrera": {"nombre": f"Carrera {c}"},
+                "año_cursado": 2020 + c,
+                "universidad": "Universidad",
+                "inscripciones": [
+                    {"materia": {"nombre": f"Materia {c}-{m}"}, "veces_cursada": 1}
+                    for m in range(materias)
+                ],
+            }
+            for c in range(cursados)
+        ],
+    )
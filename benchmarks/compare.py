@@ -0,0 +1,90 @@
+"""
+Compara dos archivos de resultados de benchmarks.results (por ejemplo del commit base y
+del actual) y lista la variación de cada métrica. Termina con código 1 si alguna
+métrica empeoró más que el umbral.
+
+Uso: python -m benchmarks.compare base.json actual.json [--threshold 0.1]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import orjson
+
+
+def direction(metric: str) -> int:
+    """1 si un valor mayor es mejor, -1 si es peor y 0 si la métrica no se evalúa."""
+    if metric.endswith("_per_sec"):
+        return 1
+    # Más sentencias por operación es la señal de un N+1
+    if metric.endswith(("_ms", "_us", "_s", "_mb")) or metric == "statements":
+        return -1
+    return 0
+
+
+def compare(base: dict, current: dict, threshold: float) -> list[dict]:
+    """
+    Compara las métricas comunes de dos documentos de resultados.
+
+    Args:
+        base (dict): Los resultados de referencia.
+        current (dict): Los resultados a evaluar.
+        threshold (float): Variación relativa a partir de la cual una métrica que
+            empeora es una regresión.
+
+    Returns:
+        list[dict]: Caso, métrica, ambos valores, variación relativa y si es una
+            regresión, para cada métrica presente en los dos documentos.
+    """
+    rows = []
+    for case, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            previous = base["results"].get(case, {}).get(metric)
+            if not isinstance(value, (int, float)) or not previous:
+                continue
+            change = (value - previous) / previous
+            rows.append(
+                {
+                    "case": case,
+                    "metric": metric,
+                    "base": previous,
+                    "current": value,
+                    "change": change,
+                    "regression": direction(metric) * change < -threshold,
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    base = orjson.loads(Path(args.base).read_bytes())
+    current = orjson.loads(Path(args.current).read_bytes())
+    if base["suite"] != current["suite"]:
+        sys.exit(f"different suites: {base['suite']} != {current['suite']}")
+    if base["params"] != current["params"]:
+        print(f"warning: different params {base['params']} != {current['params']}")
+
+    rows = compare(base, current, args.threshold)
+    print(
+        f"{base['suite']}: {base['environment']['commit']} -> "
+        f"{current['environment']['commit']}"
+    )
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['case']:>40} {row['metric']:>16}: {row['base']:12.3f} -> "
+            f"{row['current']:12.3f} ({row['change']:+7.1%}){flag}"
+        )
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Generador de datos sintéticos para los benchmarks: leads con una cantidad aleatoria de
+cursados e inscripciones dentro de los rangos pedidos, sobre un catálogo fijo de
+carreras y materias, reproducible a partir de una semilla.
+
+Uso: python -m benchmarks.datagen [--leads N] [--cursados 1-3] [--materias 2-8]
+[--seed S] > leads.ndjson
+(el NDJSON resultante se puede cargar con POST /leads/bulk)
+"""
+
+import argparse
+import random
+import sys
+from typing import Iterator
+
+import orjson
+from sqlalchemy import Engine
+
+from app.db.schemas import LeadCreate
+from app.helpers.services import LeadService
+
+from .common import session_factory
+
+UNIVERSIDADES = ("UBA", "UTN", "UNLP", "UNC", "UNR")
+
+
+def parse_range(value: str) -> tuple[int, int]:
+    """Interpreta "N" o "MIN-MAX" como un rango inclusivo."""
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def generate_leads(
+    count: int,
+    cursados: tuple[int, int] = (1, 3),
+    materias: tuple[int, int] = (2, 8),
+    carreras: int = 50,
+    materias_por_carrera: int = 40,
+    seed: int = 0,
+    start: int = 0,
+) -> Iterator[LeadCreate]:
+    """
+    Genera leads sintéticos.
+
+    Args:
+        count (int): Cantidad de leads.
+        cursados (tuple[int, int]): Mínimo y máximo de cursados por lead.
+        materias (tuple[int, int]): Mínimo y máximo de inscripciones por cursado.
+        carreras (int): Tamaño del catálogo de carreras.
+        materias_por_carrera (int): Materias del catálogo en cada carrera.
+        seed (int): Semilla del generador, para repetir exactamente los mismos datos.
+        start (int): Número del primer lead, para generar leads nuevos con nombres,
+            emails y teléfonos distintos a los de una carga anterior.
+
+    Returns:
+        Iterator[LeadCreate]: Los leads, con nombre, email y teléfono únicos.
+    """
+    rng = random.Random(seed)
+    for n in range(start, start + count):
+        elegidas = rng.sample(range(carreras), min(rng.randint(*cursados), carreras))
+        yield LeadCreate(
+            nombre=f"Nombre{n}",
+            apellido=f"Apellido{n}",
+            email=f"lead{n}@example.com",
+            direccion=f"Calle {n}",
+            tel=1000000 + n,
+            cursados=[
+                {
+                    "carrera": {"nombre": f"Carrera {c}"},
+                    "año_cursado": rng.randint(2000, 2025),
+                    "universidad": rng.choice(UNIVERSIDADES),
+                    "inscripciones": [
+                        {
+                            "materia": {"nombre": f"Materia {c}-{m}"},
+                            "veces_cursada": rng.randint(1, 3),
+                        }
+                        for m in rng.sample(
+                            range(materias_por_carrera),
+                            min(rng.randint(*materias), materias_por_carrera),
+                        )
+                    ],
+                }
+                for c in elegidas
+            ],
+        )
+
+
+def seed_database(
+    engine: Engine, leads: Iterator[LeadCreate], batch_size: int = 1000
+) -> int:
+    """
+    Carga los leads con el camino de POST /leads/bulk.
+
+    Args:
+        engine (Engine): El engine de la base, con el esquema ya creado.
+        leads (Iterator[LeadCreate]): Los leads a cargar.
+        batch_size (int): Cantidad de leads por lote. Default 1000
+
+    Returns:
+        int: La cantidad de leads creados.
+    """
+    SessionLocal = session_factory(engine)
+    created = 0
+    batch = []
+    with SessionLocal() as db:
+        service = LeadService(db)
+        for lead in leads:
+            batch.append(lead)
+            if len(batch) == batch_size:
+                results = service.create_leads_bulk(batch, batch_size)
+                created += sum(result.lead_id is not None for result in results)
+                batch = []
+        if batch:
+            results = service.create_leads_bulk(batch, batch_size)
+            created += sum(result.lead_id is not None for result in results)
+    return created
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--cursados", type=parse_range, default=(1, 3))
+    parser.add_argument("--materias", type=parse_range, default=(2, 8))
+    parser.add_argument("--carreras", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for lead in generate_leads(
+        args.leads, args.cursados, args.materias, args.carreras, seed=args.seed
+    ):
+        sys.stdout.buffer.write(
+            orjson.dumps(lead.model_dump(), option=orjson.OPT_APPEND_NEWLINE)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Prueba de carga del stack sincrónico contra el asíncrono (ASYNC_DB): levanta uvicorn en
+cada modo sobre la misma base SQLite sembrada y mide latencia p50/p99 y requests/seg con
+N clientes concurrentes haciendo GET /leads/{lead_id} y GET /leads.
+
+Uso: python -m benchmarks.load_async [--clients 500] [--requests 5000] [--leads 2000]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.helpers.services import LeadService
+
+from .common import file_engine, make_lead, session_factory
+
+
+def seed(path: str, leads: int) -> None:
+    SessionLocal = session_factory(file_engine(path))
+    with SessionLocal() as db:
+        LeadService(db).create_leads_bulk(
+            [make_lead(n, 2, 4).model_dump() for n in range(leads)], 1000
+        )
+
+
+def start_server(path: str, port: int, async_db: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{path}",
+        "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{path}",
+        "ASYNC_DB": str(async_db).lower(),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--timeout-keep-alive",
+            "120",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited, is port {port} in use?")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def load(
+    port: int, clients: int, requests: int, leads: int, timeout: float
+) -> dict:
+    latencies = []
+    errors = 0
+    pending = iter(range(requests))
+    limits = httpx.Limits(max_connections=clients)
+
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=timeout
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for n in pending:
+                path = f"/leads/{random.randint(1, leads)}" if n % 5 else "/leads/"
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--leads", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--mode", choices=("sync", "async", "both"), default="both")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "load.db")
+        seed(path, args.leads)
+        modes = {"sync": (False,), "async": (True,), "both": (False, True)}
+        for async_db in modes[args.mode]:
+            server = start_server(path, args.port, async_db)
+            try:
+                result = asyncio.run(
+                    load(
+                        args.port, args.clients, args.requests, args.leads, args.timeout
+                    )
+                )
+            finally:
+                server.terminate()
+                server.wait()
+            mode = "async" if async_db else "sync"
+            print(json.dumps({"mode": mode, "clients": args.clients, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Escenario de carga HTTP con lecturas y escrituras mezcladas: N clientes concurrentes
+envían GET /leads/{lead_id}, GET /leads (vista completa, summary y filtrada por carrera)
+y POST /leads, con la proporción de escrituras de --write-ratio.
+
+Sin --url levanta uvicorn (sync o async, como benchmarks.load_async) sobre un archivo
+SQLite sembrado con benchmarks.datagen. Con --url usa un servidor ya levantado, por
+ejemplo el de docker-compose sobre MySQL (http://127.0.0.1:8000); --leads debe ser
+entonces la cantidad de leads ya cargados, para elegir IDs existentes.
+
+Informa requests/seg y latencia p50/p95/p99 por operación y en total; con --json
+escribe los resultados en el formato de benchmarks.results.
+
+Uso: python -m benchmarks.load_mixed [--write-ratio 0.1] [--clients 50]
+[--requests 5000] [--leads 5000] [--mode sync|async] [--url URL] [--json archivo]
+(requiere las mismas variables de entorno que la aplicación, como los tests)
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from .common import file_engine
+from .datagen import generate_leads, seed_database
+from .load_async import start_server
+from .results import write_results
+
+# Proporción de cada lectura dentro de las lecturas
+READS = {
+    "GET /leads/{lead_id}": 0.5,
+    "GET /leads": 0.2,
+    "GET /leads?view=summary": 0.15,
+    "GET /leads?carrera": 0.15,
+}
+
+
+def read_request(operation: str, rng: random.Random, leads: int) -> tuple[str, dict]:
+    if operation == "GET /leads/{lead_id}":
+        return f"/leads/{rng.randint(1, leads)}", {}
+    if operation == "GET /leads":
+        return "/leads/", {"limit": 20, "offset": rng.randrange(0, leads, 20)}
+    if operation == "GET /leads?view=summary":
+        return "/leads/", {"view": "summary", "limit": 100}
+    return "/leads/", {"carrera": f"Carrera {rng.randrange(50)}", "limit": 20}
+
+
+async def load(
+    base_url: str,
+    clients: int,
+    requests: int,
+    leads: int,
+    write_ratio: float,
+    timeout: float,
+) -> dict[str, dict]:
+    rng = random.Random(0)
+    operations = [
+        (
+            "POST /leads"
+            if rng.random() < write_ratio
+            else rng.choices(list(READS), weights=list(READS.values()))[0]
+        )
+        for _ in range(requests)
+    ]
+    # Leads nuevos con emails y teléfonos que no chocan con los sembrados ni con los de
+    # otra ejecución contra el mismo servidor
+    new_leads = generate_leads(
+        operations.count("POST /leads"), seed=1, start=leads + rng.randrange(10**9)
+    )
+    bodies = [lead.model_dump() for lead in new_leads]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    pending = iter(operations)
+    limits = httpx.Limits(max_connections=clients)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+
+        async def worker() -> None:
+            for operation in pending:
+                start = time.perf_counter()
+                try:
+                    if operation == "POST /leads":
+                        response = await client.post("/leads/", json=bodies.pop())
+                    else:
+                        path, params = read_request(operation, rng, leads)
+                        response = await client.get(path, params=params)
+                except httpx.TransportError:
+                    errors[operation] += 1
+                    continue
+                latencies[operation].append(time.perf_counter() - start)
+                errors[operation] += response.status_code >= 400
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    results = {
+        operation: summarize(samples, errors[operation], elapsed)
+        for operation, samples in sorted(latencies.items())
+    }
+    results["all"] = summarize(
+        [sample for samples in latencies.values() for sample in samples],
+        sum(errors.values()),
+        elapsed,
+    )
+    return results
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+    quantile = lambda q: round(quantiles[q] * 1000, 2) if quantiles else None  # noqa
+    return {
+        "requests": len(latencies),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": quantile(49),
+        "p95_ms": quantile(94),
+        "p99_ms": quantile(98),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--leads", type=int, default=5000)
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--url", help="Servidor ya levantado, en lugar de uvicorn")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--json", help="Archivo de resultados (- para stdout)")
+    args = parser.parse_args()
+
+    def run(base_url: str) -> dict[str, dict]:
+        return asyncio.run(
+            load(
+                base_url,
+                args.clients,
+                args.requests,
+                args.leads,
+                args.write_ratio,
+                args.timeout,
+            )
+        )
+
+    if args.url:
+        results = run(args.url)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "load.db")
+            engine = file_engine(path)
+            seed_database(engine, generate_leads(args.leads))
+            engine.dispose()
+            server = start_server(path, args.port, args.mode == "async")
+            try:
+                results = run(f"http://127.0.0.1:{args.port}")
+            finally:
+                server.terminate()
+                server.wait()
+
+    for operation, result in results.items():
+        print(
+            f"{operation:>24}: {result['requests']:6d} req, "
+            f"{result['requests_per_sec']:8.1f} req/s, p50 {result['p50_ms']} ms, "
+            f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms, "
+            f"{result['errors']} errors"
+        )
+    if args.json:
+        params = {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("json", "port", "timeout")
+        }
+        write_results(args.json, "load_mixed", params, results)
+
+
+if __name__ == "__main__":
+    main()
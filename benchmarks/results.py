@@ -0,0 +1,75 @@
+"""
+Resultados de los benchmarks en JSON, para compararlos entre commits con
+benchmarks.compare.
+
+Cada archivo tiene el nombre de la suite, los parámetros con que se ejecutó, el commit,
+versiones y plataforma, y un objeto "results" con una entrada por caso. Cada entrada
+tiene sus métricas numéricas. Las que terminan en _ms o _us son tiempos, las que
+terminan en _mb memoria y "statements" es la cantidad de sentencias SQL (en todos los
+casos menor es mejor). Las que terminan en _per_sec son throughput (mayor es mejor).
+"""
+
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+import sqlalchemy
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """Commit, fecha y versiones con que se ejecutó el benchmark."""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def write_results(
+    path: str | None, suite: str, params: dict, results: dict[str, dict]
+) -> dict:
+    """
+    Arma el documento de resultados y lo escribe en path, o en la salida estándar si
+    path es None o "-".
+
+    Args:
+        path (str | None): Archivo de salida.
+        suite (str): Nombre del benchmark.
+        params (dict): Parámetros de la ejecución.
+        results (dict[str, dict]): Métricas de cada caso.
+
+    Returns:
+        dict: El documento escrito.
+    """
+    document = {
+        "suite": suite,
+        "params": params,
+        "environment": environment(),
+        "results": results,
+    }
+    body = orjson.dumps(document, option=orjson.OPT_INDENT_2)
+    if path is None or path == "-":
+        sys.stdout.buffer.write(body + b"\n")
+    else:
+        Path(path).write_bytes(body + b"\n")
+    return document
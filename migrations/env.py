@@ -0,0 +1,64 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.db.models import Base
+
+"""Entorno de Alembic. Migra la base de la aplicación, salvo que se indique otra URL con -x url=... o en sqlalchemy.url."""
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    url = context.get_x_argument(as_dictionary=True).get(
+        "url", config.get_main_option("sqlalchemy.url")
+    )
+    if url:
+        return url
+    # Se importa sólo si hace falta: requiere las variables de entorno de la aplicación
+    from app.db import connection
+
+    return connection.database_url()
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Los índices FULLTEXT sólo existen en MySQL y la reflexión no los describe igual
+    # que el modelo, así que se excluyen de la comparación de autogenerate
+    return not (type_ == "index" and name and name.startswith("ft_"))
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        # SQLite no soporta ALTER TABLE para constraints: render_as_batch recrea la tabla
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,102 @@
+"""Esquema inicial, tal como lo creaba Base.metadata.create_all.
+
+Una base existente creada con create_all se adopta sin modificarla con:
+alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:31:01.366515
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "carreras",
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.Column("nombre", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("carrera_id"),
+    )
+    op.create_index("ix_carreras_carrera_id", "carreras", ["carrera_id"])
+
+    op.create_table(
+        "leads",
+        sa.Column("lead_id", sa.Integer(), nullable=False),
+        sa.Column("nombre", sa.String(length=50), nullable=False),
+        sa.Column("apellido", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=50), nullable=True),
+        sa.Column("direccion", sa.String(length=100), nullable=True),
+        sa.Column("tel", sa.String(length=50), nullable=True),
+        sa.PrimaryKeyConstraint("lead_id"),
+    )
+    op.create_index("ix_leads_lead_id", "leads", ["lead_id"])
+
+    op.create_table(
+        "cursados",
+        sa.Column("año_cursado", sa.Integer(), nullable=False),
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.Column("lead_id", sa.Integer(), nullable=False),
+        sa.Column("universidad", sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(["carrera_id"], ["carreras.carrera_id"]),
+        sa.ForeignKeyConstraint(["lead_id"], ["leads.lead_id"]),
+        sa.PrimaryKeyConstraint("año_cursado", "carrera_id", "lead_id"),
+    )
+    op.create_index("ix_cursados_año_cursado", "cursados", ["año_cursado"])
+    op.create_index("ix_cursados_carrera_id", "cursados", ["carrera_id"])
+    op.create_index("ix_cursados_lead_id", "cursados", ["lead_id"])
+
+    op.create_table(
+        "materias",
+        sa.Column("materia_id", sa.Integer(), nullable=False),
+        sa.Column("nombre", sa.String(length=50), nullable=False),
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["carrera_id"], ["carreras.carrera_id"]),
+        sa.PrimaryKeyConstraint("materia_id"),
+    )
+    op.create_index("ix_materias_materia_id", "materias", ["materia_id"])
+
+    op.create_table(
+        "inscripcion_materia",
+        sa.Column("año_cursado", sa.Integer(), nullable=False),
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.Column("lead_id", sa.Integer(), nullable=False),
+        sa.Column("materia_id", sa.Integer(), nullable=False),
+        sa.Column("veces_cursada", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["año_cursado", "carrera_id", "lead_id"],
+            ["cursados.año_cursado", "cursados.carrera_id", "cursados.lead_id"],
+        ),
+        sa.ForeignKeyConstraint(["materia_id"], ["materias.materia_id"]),
+        sa.PrimaryKeyConstraint("año_cursado", "carrera_id", "lead_id", "materia_id"),
+    )
+    op.create_index(
+        "ix_inscripcion_materia_año_cursado", "inscripcion_materia", ["año_cursado"]
+    )
+    op.create_index(
+        "ix_inscripcion_materia_carrera_id", "inscripcion_materia", ["carrera_id"]
+    )
+    op.create_index(
+        "ix_inscripcion_materia_lead_id", "inscripcion_materia", ["lead_id"]
+    )
+    op.create_index(
+        "ix_inscripcion_materia_materia_id", "inscripcion_materia", ["materia_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inscripcion_materia")
+    op.drop_table("materias")
+    op.drop_table("cursados")
+    op.drop_table("leads")
+    op.drop_table("carreras")
@@ -0,0 +1,92 @@
+"""Índices y constraints únicos de las columnas de búsqueda.
+
+Agrega un índice en leads.email y constraints únicos en carreras.nombre y
+materias.(carrera_id, nombre). En MySQL, los nombres de carreras y materias pasan
+antes a una collation binaria, para que los constraints comparen como Python y el cache
+del catálogo. Si ya hay carreras o materias duplicadas, la migración falla listándolas:
+unificarlas requiere reasignar cursados e inscripciones, que forman parte de sus claves
+primarias, y eso se decide caso por caso.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:40:12.104211
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ("carreras", "materias")
+
+
+def alter_catalog_nombres(type_: sa.types.TypeEngine) -> None:
+    if op.get_bind().dialect.name != "mysql":
+        return
+    for table in CATALOG_TABLES:
+        op.alter_column(
+            table,
+            "nombre",
+            existing_type=sa.String(length=50),
+            type_=type_,
+            existing_nullable=False,
+        )
+
+
+def check_duplicates(table: str, columns: list[str]) -> None:
+    grouped = ", ".join(columns)
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"SELECT {grouped}, COUNT(*) FROM {table} "
+                f"GROUP BY {grouped} HAVING COUNT(*) > 1"
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"Duplicate rows in {table} ({grouped}) must be merged before "
+            f"upgrading: {[tuple(row) for row in duplicates]}"
+        )
+
+
+def upgrade() -> None:
+    # Sin collation binaria "Engineering" y "engineering" serían la misma fila, pero
+    # claves distintas para la aplicación
+    alter_catalog_nombres(
+        mysql.VARCHAR(length=50, charset="utf8mb4", collation="utf8mb4_0900_bin")
+    )
+    check_duplicates("carreras", ["nombre"])
+    check_duplicates("materias", ["carrera_id", "nombre"])
+
+    op.create_index("ix_leads_email", "leads", ["email"])
+    with op.batch_alter_table("carreras") as batch_op:
+        batch_op.create_unique_constraint("uq_carreras_nombre", ["nombre"])
+    with op.batch_alter_table("materias") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_materias_carrera_id_nombre", ["carrera_id", "nombre"]
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        # MySQL usa el constraint único como índice de la FK a carreras y no permite
+        # borrarlo sin otro índice que lo reemplace
+        op.create_index("ix_materias_carrera_id", "materias", ["carrera_id"])
+    with op.batch_alter_table("materias") as batch_op:
+        batch_op.drop_constraint("uq_materias_carrera_id_nombre", type_="unique")
+    with op.batch_alter_table("carreras") as batch_op:
+        batch_op.drop_constraint("uq_carreras_nombre", type_="unique")
+    # Sin collation explícita la columna vuelve a la de la tabla
+    alter_catalog_nombres(sa.String(length=50))
+    op.drop_index("ix_leads_email", table_name="leads")
@@ -0,0 +1,41 @@
+"""Índices de los filtros de GET /leads.
+
+Agrega índices en leads.apellido, materias.nombre y cursados.universidad y, en MySQL,
+un índice FULLTEXT sobre leads.(nombre, apellido) para la búsqueda por texto.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:02:47.528093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_leads_apellido", "leads", ["apellido"])
+    op.create_index("ix_materias_nombre", "materias", ["nombre"])
+    op.create_index("ix_cursados_universidad", "cursados", ["universidad"])
+    if op.get_bind().dialect.name == "mysql":
+        op.create_index(
+            "ft_leads_nombre_apellido",
+            "leads",
+            ["nombre", "apellido"],
+            mysql_prefix="FULLTEXT",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        op.drop_index("ft_leads_nombre_apellido", table_name="leads")
+    op.drop_index("ix_cursados_universidad", table_name="cursados")
+    op.drop_index("ix_materias_nombre", table_name="materias")
+    op.drop_index("ix_leads_apellido", table_name="leads")
@@ -0,0 +1,89 @@
+"""Tablas de resumen de las estadísticas.
+
+Crea resumen_cursados (cursados por carrera y año) y resumen_inscripciones
+(inscripciones y suma de veces_cursada por carrera, materia y año) y las completa con
+los datos existentes. Con STATS_SUMMARY activado, LeadService las actualiza en la misma
+transacción que crea cada lead.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:15:36.402718
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    resumen_cursados = op.create_table(
+        "resumen_cursados",
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.Column("año_cursado", sa.Integer(), nullable=False),
+        sa.Column("cursados", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["carrera_id"], ["carreras.carrera_id"]),
+        sa.PrimaryKeyConstraint("carrera_id", "año_cursado"),
+    )
+    resumen_inscripciones = op.create_table(
+        "resumen_inscripciones",
+        sa.Column("carrera_id", sa.Integer(), nullable=False),
+        sa.Column("materia_id", sa.Integer(), nullable=False),
+        sa.Column("año_cursado", sa.Integer(), nullable=False),
+        sa.Column("inscripciones", sa.Integer(), nullable=False),
+        sa.Column("veces_cursada_total", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["carrera_id"], ["carreras.carrera_id"]),
+        sa.ForeignKeyConstraint(["materia_id"], ["materias.materia_id"]),
+        sa.PrimaryKeyConstraint("carrera_id", "materia_id", "año_cursado"),
+    )
+
+    cursados = sa.table("cursados", sa.column("carrera_id"), sa.column("año_cursado"))
+    inscripciones = sa.table(
+        "inscripcion_materia",
+        sa.column("carrera_id"),
+        sa.column("materia_id"),
+        sa.column("año_cursado"),
+        sa.column("veces_cursada"),
+    )
+    op.execute(
+        resumen_cursados.insert().from_select(
+            ["carrera_id", "año_cursado", "cursados"],
+            sa.select(
+                cursados.c.carrera_id, cursados.c.año_cursado, sa.func.count()
+            ).group_by(cursados.c.carrera_id, cursados.c.año_cursado),
+        )
+    )
+    op.execute(
+        resumen_inscripciones.insert().from_select(
+            [
+                "carrera_id",
+                "materia_id",
+                "año_cursado",
+                "inscripciones",
+                "veces_cursada_total",
+            ],
+            sa.select(
+                inscripciones.c.carrera_id,
+                inscripciones.c.materia_id,
+                inscripciones.c.año_cursado,
+                sa.func.count(),
+                sa.func.sum(inscripciones.c.veces_cursada),
+            ).group_by(
+                inscripciones.c.carrera_id,
+                inscripciones.c.materia_id,
+                inscripciones.c.año_cursado,
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("resumen_inscripciones")
+    op.drop_table("resumen_cursados")
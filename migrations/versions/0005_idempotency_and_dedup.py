@@ -0,0 +1,46 @@
+"""Idempotency keys y búsqueda de leads duplicados.
+
+Crea idempotency_keys, donde se guarda la respuesta de cada POST /leads con un header
+Idempotency-Key, y agrega índices en leads.tel y en lower(trim(leads.email)) para
+detectar duplicados sin recorrer la tabla.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:03:19.815240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("idempotency_key", sa.String(length=255), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("response_body", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("idempotency_key"),
+    )
+    op.create_index("ix_leads_tel", "leads", ["tel"])
+    op.create_index(
+        "ix_leads_email_normalizado",
+        "leads",
+        [sa.func.lower(sa.func.trim(sa.column("email")))],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leads_email_normalizado", table_name="leads")
+    op.drop_index("ix_leads_tel", table_name="leads")
+    op.drop_table("idempotency_keys")